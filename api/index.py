@@ -1,14 +1,23 @@
 """FastAPI web server for OT Asset Inventory - Vercel deployment."""
 
+import contextlib
 import csv
+import functools
 import io
+import itertools
+import os
+import queue
+import threading
 import uuid
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi import Depends, FastAPI, File, UploadFile, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+import orjson
 import sqlite3
 
 # Schema
@@ -38,30 +47,272 @@ CREATE TABLE IF NOT EXISTS relationships (
 );
 
 CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
-CREATE INDEX IF NOT EXISTS idx_assets_criticality ON assets(criticality);
-CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_asset_id);
-CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_asset_id);
+CREATE INDEX IF NOT EXISTS idx_assets_crit_type ON assets(criticality, type);
+
+-- Covering for endpoint + type lookups in either direction, so the
+-- traversal CTEs never touch the relationships table itself
+CREATE INDEX IF NOT EXISTS idx_rel_src_type_tgt ON relationships(source_asset_id, relationship_type, target_asset_id);
+CREATE INDEX IF NOT EXISTS idx_rel_tgt_type_src ON relationships(target_asset_id, relationship_type, source_asset_id);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_assets_criticality;
+DROP INDEX IF EXISTS idx_rel_src_type;
+DROP INDEX IF EXISTS idx_rel_tgt_type;
+"""
+
+# Vercel keeps /tmp for the lifetime of a warm container; elsewhere use a
+# named shared-cache in-memory database
+DB_URI = (
+    "file:/tmp/ot_inventory.db" if os.environ.get("VERCEL")
+    else "file:ot_inventory?mode=memory&cache=shared"
+)
+
+# Connection tuning; the data is disposable so durability is traded for speed
+PRAGMA_SQL = """
+PRAGMA synchronous = OFF;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+"""
+
+# Insert statements shared by the loaders; one literal per table keeps
+# SQLite's prepared-statement cache warm
+INSERT_ASSET_SQL = """
+INSERT OR REPLACE INTO assets (id, name, type, manufacturer, model, ip_address, process_area_id, criticality, owner, in_cmms, documented, security_policy_applied, notes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_RELATIONSHIP_SQL = """
+INSERT OR REPLACE INTO relationships (id, source_asset_id, target_asset_id, relationship_type, verified)
+VALUES (?, ?, ?, ?, 1)
+"""
+
+# Rows per executemany() call when importing CSV uploads
+CSV_BATCH_SIZE = 1000
+
+# CSV values treated as true for boolean columns
+_TRUTHY = {"true": 1, "yes": 1, "1": 1}
+
+# Failure impact in one statement: the asset itself (with a redundancy flag),
+# what it feeds directly, and what depends on it
+IMPACT_SQL = """
+SELECT 'asset', id, name, type, criticality,
+       EXISTS (
+           SELECT 1 FROM relationships
+           WHERE (source_asset_id = ? OR target_asset_id = ?) AND relationship_type = 'redundant_with'
+       )
+FROM assets WHERE id = ?
+UNION ALL
+SELECT 'direct', a.id, a.name, a.type, a.criticality, r.relationship_type
+FROM relationships r JOIN assets a ON r.target_asset_id = a.id WHERE r.source_asset_id = ?
+UNION ALL
+SELECT 'cascade', a.id, a.name, a.type, a.criticality, NULL
+FROM relationships r JOIN assets a ON r.source_asset_id = a.id
+WHERE r.target_asset_id = ? AND r.relationship_type = 'depends_on'
 """
 
-# Global in-memory database for serverless (persists within warm instance)
+# Deepest hop returned by the upstream/downstream traversals
+TRAVERSAL_MAX_DEPTH = 6
+
+# Whole-closure traversals; each asset is reported once at its shallowest depth
+UPSTREAM_SQL = """
+WITH RECURSIVE up(id, relationship_type, depth) AS (
+    SELECT source_asset_id, relationship_type, 1 FROM relationships WHERE target_asset_id = ?
+    UNION
+    SELECT r.source_asset_id, r.relationship_type, up.depth + 1
+    FROM relationships r JOIN up ON r.target_asset_id = up.id
+    WHERE up.depth < ?
+)
+SELECT a.id, a.name, a.type, a.criticality, up.relationship_type, MIN(up.depth) AS depth
+FROM up JOIN assets a ON a.id = up.id
+WHERE up.id != ?
+GROUP BY a.id
+ORDER BY depth, a.id
+"""
+
+DOWNSTREAM_SQL = """
+WITH RECURSIVE down(id, relationship_type, depth) AS (
+    SELECT target_asset_id, relationship_type, 1 FROM relationships WHERE source_asset_id = ?
+    UNION
+    SELECT r.target_asset_id, r.relationship_type, down.depth + 1
+    FROM relationships r JOIN down ON r.source_asset_id = down.id
+    WHERE down.depth < ?
+)
+SELECT a.id, a.name, a.type, a.criticality, down.relationship_type, MIN(down.depth) AS depth
+FROM down JOIN assets a ON a.id = down.id
+WHERE down.id != ?
+GROUP BY a.id
+ORDER BY depth, a.id
+"""
+
+# Web UI, read once per cold start (main.py sits next to static/, api/index.py one level down)
+HOME_HTML_PATH = Path(__file__).resolve().parent / "static" / "index.html"
+if not HOME_HTML_PATH.exists():
+    HOME_HTML_PATH = Path(__file__).resolve().parent.parent / "static" / "index.html"
+_HOME_HTML = HOME_HTML_PATH.read_bytes()
+HOME_CACHE_CONTROL = "public, max-age=3600"
+
+# Read-only connections available to GET endpoints; writes use the single _db
+READ_POOL_SIZE = 4
+
+# Global database connections for serverless (persist within warm instance)
 _db: sqlite3.Connection = None
+_read_pool: queue.Queue = None
+_read_pool_lock = threading.Lock()
+
+# Bumped whenever a write ends, committed or not, so cached read results go
+# stale. Caching is only sound because readers never overlap a write (see
+# _ReadWriteLock), so no cached result can hold uncommitted data
+_data_version = 0
+
+
+class _ReadWriteLock:
+    """Admit any number of readers at once, or a single writer alone.
+
+    Shared-cache connections fail with "table is locked" instead of waiting
+    when a reader and the writer touch the same table, so requests take this
+    lock rather than relying on SQLite's busy handling. Waiting writers hold
+    off new readers so uploads are not starved.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            self._cond.wait_for(lambda: not self._writer and not self._readers)
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+_rw_lock = _ReadWriteLock()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a tuned connection to the shared database."""
+    db = sqlite3.connect(DB_URI, uri=True, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    if "mode=memory" not in DB_URI:
+        db.execute("PRAGMA journal_mode = WAL")
+    db.executescript(PRAGMA_SQL)
+    return db
 
 
 def get_db() -> sqlite3.Connection:
-    """Get or create database connection."""
+    """Get or create the writer connection."""
     global _db
     if _db is None:
-        _db = sqlite3.connect(":memory:", check_same_thread=False)
-        _db.row_factory = sqlite3.Row
+        _db = _connect()
         _db.executescript(SCHEMA_SQL)
         _db.commit()
     return _db
 
 
+def read_db() -> Iterator[sqlite3.Connection]:
+    """Lend a read-only connection from the pool for the duration of a request."""
+    global _read_pool
+    if _read_pool is None:
+        with _read_pool_lock:
+            if _read_pool is None:
+                get_db()  # Schema must exist before readers attach
+                pool = queue.Queue()
+                for _ in range(READ_POOL_SIZE):
+                    db = _connect()
+                    db.execute("PRAGMA query_only = 1")
+                    pool.put(db)
+                _read_pool = pool
+
+    # Readers never overlap a write transaction, so they only see committed data
+    db = _read_pool.get()
+    try:
+        with _rw_lock.read():
+            yield db
+    finally:
+        _read_pool.put(db)
+
+
+@contextlib.contextmanager
+def write_db() -> Iterator[sqlite3.Connection]:
+    """Hold the writer connection with all readers excluded.
+
+    Cached read results are invalidated when the block exits, including when
+    the write fails and is rolled back.
+    """
+    db = get_db()
+    with _rw_lock.write():
+        try:
+            yield db
+        finally:
+            bump_data_version()
+
+
+def rows_to_dicts(cursor: sqlite3.Cursor) -> list[dict[str, Any]]:
+    """Materialize a cursor as dicts, resolving column names once."""
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def bump_data_version() -> None:
+    """Invalidate cached read results after a write, successful or not."""
+    global _data_version
+    _data_version += 1
+
+
+def cached_until_write(func):
+    """Memoize a read endpoint per query parameters until the next data write."""
+    results: dict[tuple, Any] = {}
+    seen_version = -1
+
+    @functools.wraps(func)
+    def wrapper(**kwargs):
+        nonlocal results, seen_version
+        version = _data_version
+        if version != seen_version:
+            results, seen_version = {}, version
+        bucket = results
+        key = tuple(value for name, value in sorted(kwargs.items()) if name != "db")
+        if key not in bucket:
+            bucket[key] = func(**kwargs)
+        return bucket[key]
+
+    return wrapper
+
+
+class _OrjsonResponse(JSONResponse):
+    """JSON response serialized with orjson (FastAPI's own ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = FastAPI(
     title="OT Asset Inventory",
     description="AI-powered OT asset inventory for audit readiness and impact analysis",
     version="0.1.0",
+    default_response_class=_OrjsonResponse,
 )
 
 app.add_middleware(
@@ -92,210 +343,81 @@ def health_check():
 @app.get("/", response_class=HTMLResponse)
 async def home():
     """Serve the main UI."""
-    return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>OT Asset Inventory</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <style>
-        .loader { border-top-color: #3498db; animation: spin 1s linear infinite; }
-        @keyframes spin { to { transform: rotate(360deg); } }
-    </style>
-</head>
-<body class="bg-gray-900 text-gray-100 min-h-screen">
-    <div class="container mx-auto px-4 py-8 max-w-6xl">
-        <header class="mb-8">
-            <h1 class="text-3xl font-bold text-blue-400">OT Asset Inventory</h1>
-            <p class="text-gray-400 mt-2">Upload assets via CSV, then query for audit readiness and impact analysis</p>
-        </header>
-
-        <!-- Upload Section -->
-        <section class="bg-gray-800 rounded-lg p-6 mb-8">
-            <h2 class="text-xl font-semibold mb-4">1. Upload Asset Data</h2>
-            <div class="flex gap-4 items-start flex-wrap">
-                <div class="flex-1 min-w-64">
-                    <input type="file" id="csvFile" accept=".csv"
-                        class="block w-full text-sm text-gray-400 file:mr-4 file:py-2 file:px-4 file:rounded file:border-0 file:bg-blue-600 file:text-white hover:file:bg-blue-700 cursor-pointer">
-                    <p class="text-xs text-gray-500 mt-2">CSV: id, name, type, manufacturer, model, ip_address, process_area, criticality, owner, in_cmms, documented, security_policy_applied</p>
-                </div>
-                <button onclick="uploadCSV()" class="bg-blue-600 hover:bg-blue-700 px-6 py-2 rounded font-medium">Upload</button>
-                <button onclick="loadSampleData()" class="bg-green-600 hover:bg-green-700 px-6 py-2 rounded font-medium">Load Sample Data</button>
-            </div>
-            <div id="uploadStatus" class="mt-4 text-sm"></div>
-        </section>
-
-        <!-- Query Section -->
-        <section class="bg-gray-800 rounded-lg p-6 mb-8">
-            <h2 class="text-xl font-semibold mb-4">2. Query Assets</h2>
-            <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-4">
-                <button onclick="runQuery('list')" class="bg-gray-700 hover:bg-gray-600 p-3 rounded text-left">
-                    <div class="font-medium">List All Assets</div>
-                    <div class="text-xs text-gray-400">View inventory</div>
-                </button>
-                <button onclick="runQuery('gaps')" class="bg-gray-700 hover:bg-gray-600 p-3 rounded text-left">
-                    <div class="font-medium">Find Gaps</div>
-                    <div class="text-xs text-gray-400">Compliance issues</div>
-                </button>
-                <button onclick="runQuery('spof')" class="bg-gray-700 hover:bg-gray-600 p-3 rounded text-left">
-                    <div class="font-medium">Single Points of Failure</div>
-                    <div class="text-xs text-gray-400">No redundancy</div>
-                </button>
-                <button onclick="runQuery('audit')" class="bg-gray-700 hover:bg-gray-600 p-3 rounded text-left">
-                    <div class="font-medium">Audit Summary</div>
-                    <div class="text-xs text-gray-400">Readiness report</div>
-                </button>
-            </div>
-
-            <div class="flex gap-4 mt-4 flex-wrap">
-                <input type="text" id="assetId" placeholder="Asset ID (e.g., PLC-101)"
-                    class="flex-1 min-w-48 bg-gray-700 border border-gray-600 rounded px-4 py-2 focus:outline-none focus:border-blue-500">
-                <button onclick="runQuery('impact')" class="bg-orange-600 hover:bg-orange-700 px-4 py-2 rounded font-medium">Analyze Impact</button>
-                <button onclick="runQuery('upstream')" class="bg-purple-600 hover:bg-purple-700 px-4 py-2 rounded font-medium">Upstream</button>
-                <button onclick="runQuery('downstream')" class="bg-teal-600 hover:bg-teal-700 px-4 py-2 rounded font-medium">Downstream</button>
-            </div>
-        </section>
-
-        <!-- Results Section -->
-        <section class="bg-gray-800 rounded-lg p-6">
-            <h2 class="text-xl font-semibold mb-4">Results</h2>
-            <div id="loading" class="hidden flex items-center gap-2 mb-4">
-                <div class="loader w-5 h-5 border-2 border-gray-400 rounded-full"></div>
-                <span>Loading...</span>
-            </div>
-            <pre id="results" class="bg-gray-900 p-4 rounded overflow-auto max-h-[500px] text-sm whitespace-pre-wrap">Click "Load Sample Data" to get started, or upload your own CSV.</pre>
-        </section>
-    </div>
-
-    <script>
-        async function uploadCSV() {
-            const fileInput = document.getElementById('csvFile');
-            const status = document.getElementById('uploadStatus');
-
-            if (!fileInput.files[0]) {
-                status.innerHTML = '<span class="text-red-400">Please select a file</span>';
-                return;
-            }
-
-            const formData = new FormData();
-            formData.append('file', fileInput.files[0]);
-
-            status.innerHTML = '<span class="text-blue-400">Uploading...</span>';
-
-            try {
-                const response = await fetch('/upload-csv', { method: 'POST', body: formData });
-                const data = await response.json();
-                if (response.ok) {
-                    status.innerHTML = '<span class="text-green-400">✓ Uploaded ' + data.assets_imported + ' assets</span>';
-                    runQuery('list');
-                } else {
-                    status.innerHTML = '<span class="text-red-400">Error: ' + data.detail + '</span>';
-                }
-            } catch (err) {
-                status.innerHTML = '<span class="text-red-400">Error: ' + err.message + '</span>';
-            }
-        }
-
-        async function loadSampleData() {
-            const status = document.getElementById('uploadStatus');
-            status.innerHTML = '<span class="text-blue-400">Loading sample data...</span>';
-
-            try {
-                const response = await fetch('/load-sample-data', { method: 'POST' });
-                const data = await response.json();
-                if (response.ok) {
-                    status.innerHTML = '<span class="text-green-400">✓ Loaded ' + data.assets_count + ' assets, ' + data.relationships_count + ' relationships</span>';
-                    runQuery('list');
-                } else {
-                    status.innerHTML = '<span class="text-red-400">Error: ' + data.detail + '</span>';
-                }
-            } catch (err) {
-                status.innerHTML = '<span class="text-red-400">Error: ' + err.message + '</span>';
-            }
-        }
-
-        async function runQuery(type) {
-            const loading = document.getElementById('loading');
-            const results = document.getElementById('results');
-            const assetId = document.getElementById('assetId').value || 'PLC-101';
-
-            loading.classList.remove('hidden');
-            results.textContent = '';
-
-            const urls = {
-                'list': '/assets',
-                'gaps': '/gaps',
-                'spof': '/spof',
-                'audit': '/audit',
-                'impact': '/impact/' + assetId,
-                'upstream': '/upstream/' + assetId,
-                'downstream': '/downstream/' + assetId,
-            };
-
-            try {
-                const response = await fetch(urls[type]);
-                const data = await response.json();
-                results.textContent = JSON.stringify(data, null, 2);
-            } catch (err) {
-                results.textContent = 'Error: ' + err.message;
-            } finally {
-                loading.classList.add('hidden');
-            }
-        }
-    </script>
-</body>
-</html>
-"""
+    return HTMLResponse(_HOME_HTML, headers={"Cache-Control": HOME_CACHE_CONTROL})
 
 
 # ============== API Endpoints ==============
 
 @app.post("/upload-csv")
-async def upload_csv(file: UploadFile = File(...)):
+def upload_csv(file: UploadFile = File(...)):
     """Upload assets from CSV file."""
-    db = get_db()
-
     if not file.filename.endswith('.csv'):
         raise HTTPException(400, "File must be a CSV")
 
-    content = await file.read()
-    text = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(text))
-
+    # Parse straight from the spooled upload instead of buffering it in memory
+    reader = csv.reader(io.TextIOWrapper(file.file, encoding='utf-8', newline=''))
+    header = next(reader, [])
+    idx = {name: i for i, name in enumerate(header)}
+    width = len(header)
+    pad = [None] * width
+
+    # Column positions (None when the column is absent from the upload)
+    i_id, i_asset_id, i_name, i_type, i_manufacturer, i_model, i_ip = (
+        idx.get(c) for c in ('id', 'asset_id', 'name', 'type', 'manufacturer', 'model', 'ip_address')
+    )
+    i_pa, i_pa_id, i_crit, i_owner, i_cmms, i_doc, i_sec, i_notes = (
+        idx.get(c) for c in (
+            'process_area', 'process_area_id', 'criticality', 'owner',
+            'in_cmms', 'documented', 'security_policy_applied', 'notes',
+        )
+    )
+
+    def _col(row, i, default=None):
+        return row[i] if i is not None else default
+
+    def _flag(value):
+        return _TRUTHY.get((value or '').lower(), 0)
+
+    def _rows():
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += pad[len(row):]
+            yield (
+                _col(row, i_id) or _col(row, i_asset_id) or f"ASSET-{uuid.uuid4().hex[:8].upper()}",
+                _col(row, i_name, 'Unknown'),
+                _col(row, i_type, 'Unknown'),
+                _col(row, i_manufacturer),
+                _col(row, i_model),
+                _col(row, i_ip),
+                _col(row, i_pa) or _col(row, i_pa_id),
+                _col(row, i_crit, 'medium'),
+                _col(row, i_owner),
+                _flag(_col(row, i_cmms)),
+                _flag(_col(row, i_doc)),
+                _flag(_col(row, i_sec)),
+                _col(row, i_notes),
+            )
+
+    # One transaction, one prepared statement per batch
     count = 0
-    for row in reader:
-        asset_id = row.get('id') or row.get('asset_id') or f"ASSET-{uuid.uuid4().hex[:8].upper()}"
-        db.execute("""
-            INSERT OR REPLACE INTO assets (id, name, type, manufacturer, model, ip_address, process_area_id, criticality, owner, in_cmms, documented, security_policy_applied, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            asset_id,
-            row.get('name', 'Unknown'),
-            row.get('type', 'Unknown'),
-            row.get('manufacturer'),
-            row.get('model'),
-            row.get('ip_address'),
-            row.get('process_area') or row.get('process_area_id'),
-            row.get('criticality', 'medium'),
-            row.get('owner'),
-            1 if row.get('in_cmms', '').lower() in ('true', 'yes', '1') else 0,
-            1 if row.get('documented', '').lower() in ('true', 'yes', '1') else 0,
-            1 if row.get('security_policy_applied', '').lower() in ('true', 'yes', '1') else 0,
-            row.get('notes'),
-        ))
-        count += 1
-
-    db.commit()
+    rows = _rows()
+    with write_db() as db:
+        with db:
+            while batch := list(itertools.islice(rows, CSV_BATCH_SIZE)):
+                db.executemany(INSERT_ASSET_SQL, batch)
+                count += len(batch)
+
+        # Refresh planner statistics so the compound relationship indexes get used
+        db.execute("ANALYZE")
+
     return {"status": "success", "assets_imported": count}
 
 
 @app.post("/load-sample-data")
 def load_sample_data():
     """Load sample manufacturing data."""
-    db = get_db()
-
     sample_assets = [
         ("PLC-101", "Main Chiller Controller", "PLC", "Allen-Bradley", "ControlLogix 5580", "192.168.10.101", "pa-cooling", "critical", "John Smith", 1, 1, 1),
         ("PLC-201", "Packaging Line Controller", "PLC", "Siemens", "S7-1500", "192.168.20.101", "pa-packaging", "critical", "Mike Johnson", 1, 1, 1),
@@ -314,11 +436,6 @@ def load_sample_data():
         ("SW-010", "Cooling VLAN Switch", "Switch", "Cisco", "IE-3400", "192.168.10.1", "pa-cooling", "high", "IT Dept", 0, 1, 1),
     ]
 
-    for asset in sample_assets:
-        db.execute("""
-            INSERT OR REPLACE INTO assets (id, name, type, manufacturer, model, ip_address, process_area_id, criticality, owner, in_cmms, documented, security_policy_applied)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, asset)
 
     relationships = [
         ("SENS-T101", "PLC-101", "feeds_data_to"),
@@ -337,20 +454,23 @@ def load_sample_data():
         ("ACT-C301", "PLC-101", "depends_on"),
     ]
 
-    for src, tgt, rel_type in relationships:
-        db.execute("""
-            INSERT OR REPLACE INTO relationships (id, source_asset_id, target_asset_id, relationship_type, verified)
-            VALUES (?, ?, ?, ?, 1)
-        """, (f"rel-{src}-{tgt}", src, tgt, rel_type))
+    with write_db() as db:
+        with db:
+            db.executemany(INSERT_ASSET_SQL, [(*asset, None) for asset in sample_assets])
+            db.executemany(
+                INSERT_RELATIONSHIP_SQL,
+                [(f"rel-{src}-{tgt}", src, tgt, rel_type) for src, tgt, rel_type in relationships],
+            )
+
+        # Refresh planner statistics so the compound relationship indexes get used
+        db.execute("ANALYZE")
 
-    db.commit()
     return {"status": "success", "assets_count": len(sample_assets), "relationships_count": len(relationships)}
 
 
 @app.get("/assets")
-def list_assets(type: str = None, criticality: str = None, has_gaps: bool = False):
+def list_assets(type: str = None, criticality: str = None, has_gaps: bool = False, db: sqlite3.Connection = Depends(read_db)):
     """List assets."""
-    db = get_db()
     query = "SELECT * FROM assets WHERE 1=1"
     params = []
 
@@ -365,105 +485,106 @@ def list_assets(type: str = None, criticality: str = None, has_gaps: bool = Fals
 
     query += " ORDER BY criticality DESC, name"
 
-    cursor = db.execute(query, params)
-    return [dict(row) for row in cursor.fetchall()]
+    return rows_to_dicts(db.execute(query, params))
 
 
 @app.get("/assets/{asset_id}")
-def get_asset(asset_id: str):
+def get_asset(asset_id: str, db: sqlite3.Connection = Depends(read_db)):
     """Get asset details."""
-    db = get_db()
     cursor = db.execute("SELECT * FROM assets WHERE id = ?", [asset_id])
     row = cursor.fetchone()
     if not row:
         raise HTTPException(404, f"Asset {asset_id} not found")
     asset = dict(row)
 
-    cursor = db.execute("SELECT * FROM relationships WHERE source_asset_id = ?", [asset_id])
-    asset["outgoing"] = [dict(r) for r in cursor.fetchall()]
-
-    cursor = db.execute("SELECT * FROM relationships WHERE target_asset_id = ?", [asset_id])
-    asset["incoming"] = [dict(r) for r in cursor.fetchall()]
+    # Both relationship directions in one statement, tagged with the bucket name
+    cursor = db.execute("""
+        SELECT 'outgoing', * FROM relationships WHERE source_asset_id = ?
+        UNION ALL
+        SELECT 'incoming', * FROM relationships WHERE target_asset_id = ?
+    """, [asset_id, asset_id])
+    columns = [d[0] for d in cursor.description[1:]]
+    asset["outgoing"], asset["incoming"] = [], []
+    for direction, *values in cursor:
+        asset[direction].append(dict(zip(columns, values)))
 
     return asset
 
 
 @app.get("/gaps")
-def find_gaps():
+@cached_until_write
+def find_gaps(db: sqlite3.Connection = Depends(read_db)):
     """Find compliance gaps."""
-    db = get_db()
-    gaps = {}
-
-    cursor = db.execute("SELECT id, name, type, criticality FROM assets WHERE owner IS NULL ORDER BY criticality DESC")
-    gaps["no_owner"] = [dict(r) for r in cursor.fetchall()]
-
-    cursor = db.execute("SELECT id, name, type, criticality FROM assets WHERE NOT in_cmms ORDER BY criticality DESC")
-    gaps["not_in_cmms"] = [dict(r) for r in cursor.fetchall()]
-
-    cursor = db.execute("SELECT id, name, type, criticality FROM assets WHERE NOT documented ORDER BY criticality DESC")
-    gaps["undocumented"] = [dict(r) for r in cursor.fetchall()]
+    gaps = {"no_owner": [], "not_in_cmms": [], "undocumented": [], "no_security_policy": []}
 
-    cursor = db.execute("SELECT id, name, type, criticality FROM assets WHERE NOT security_policy_applied ORDER BY criticality DESC")
-    gaps["no_security_policy"] = [dict(r) for r in cursor.fetchall()]
+    # One scan over assets with any gap, bucketed in Python
+    cursor = db.execute("""
+        SELECT id, name, type, criticality, owner, in_cmms, documented, security_policy_applied
+        FROM assets
+        WHERE owner IS NULL OR NOT in_cmms OR NOT documented OR NOT security_policy_applied
+        ORDER BY criticality DESC
+    """)
+    for asset_id, name, asset_type, criticality, owner, in_cmms, documented, has_security in cursor:
+        asset = {"id": asset_id, "name": name, "type": asset_type, "criticality": criticality}
+        if owner is None:
+            gaps["no_owner"].append(asset)
+        if in_cmms == 0:
+            gaps["not_in_cmms"].append(asset)
+        if documented == 0:
+            gaps["undocumented"].append(asset)
+        if has_security == 0:
+            gaps["no_security_policy"].append(asset)
 
     return {"gaps": gaps, "summary": {k: len(v) for k, v in gaps.items()}}
 
 
 @app.get("/spof")
-def find_spof():
+@cached_until_write
+def find_spof(db: sqlite3.Connection = Depends(read_db)):
     """Find single points of failure."""
-    db = get_db()
-    spofs = []
-
-    cursor = db.execute("SELECT * FROM assets WHERE criticality IN ('critical', 'high')")
-    assets = cursor.fetchall()
-
-    for asset in assets:
-        asset_id = asset["id"]
 
-        cursor = db.execute("""
-            SELECT COUNT(*) as cnt FROM relationships
-            WHERE (source_asset_id = ? OR target_asset_id = ?) AND relationship_type = 'redundant_with'
-        """, [asset_id, asset_id])
-        if cursor.fetchone()["cnt"] > 0:
-            continue
-
-        cursor = db.execute("SELECT COUNT(*) as cnt FROM relationships WHERE target_asset_id = ? AND relationship_type = 'depends_on'", [asset_id])
-        dependent_count = cursor.fetchone()["cnt"]
-
-        cursor = db.execute("SELECT COUNT(*) as cnt FROM relationships WHERE source_asset_id = ?", [asset_id])
-        downstream_count = cursor.fetchone()["cnt"]
-
-        if dependent_count > 0 or downstream_count > 2:
-            spofs.append({
-                "id": asset["id"], "name": asset["name"], "type": asset["type"],
-                "criticality": asset["criticality"], "dependent_count": dependent_count,
-                "downstream_count": downstream_count,
-                "risk": "HIGH" if asset["criticality"] == "critical" else "MEDIUM",
-            })
+    # Per-asset relationship counts in one pass; redundant assets are excluded
+    cursor = db.execute("""
+        SELECT a.id, a.name, a.type, a.criticality,
+               SUM(CASE WHEN r.relationship_type = 'redundant_with' THEN 1 ELSE 0 END) AS redundant_count,
+               SUM(CASE WHEN r.target_asset_id = a.id AND r.relationship_type = 'depends_on' THEN 1 ELSE 0 END) AS dependent_count,
+               SUM(CASE WHEN r.source_asset_id = a.id THEN 1 ELSE 0 END) AS downstream_count
+        FROM assets a
+        LEFT JOIN relationships r ON r.source_asset_id = a.id OR r.target_asset_id = a.id
+        WHERE a.criticality IN ('critical', 'high')
+        GROUP BY a.id
+        HAVING redundant_count = 0 AND (dependent_count > 0 OR downstream_count > 2)
+        ORDER BY a.rowid
+    """)
+    spofs = [{
+        "id": row["id"], "name": row["name"], "type": row["type"],
+        "criticality": row["criticality"], "dependent_count": row["dependent_count"],
+        "downstream_count": row["downstream_count"],
+        "risk": "HIGH" if row["criticality"] == "critical" else "MEDIUM",
+    } for row in cursor.fetchall()]
 
     return sorted(spofs, key=lambda x: (x["criticality"] != "critical", -x["dependent_count"]))
 
 
 @app.get("/audit")
-def audit_summary():
+@cached_until_write
+def audit_summary(db: sqlite3.Connection = Depends(read_db)):
     """Audit readiness summary."""
-    db = get_db()
-
-    cursor = db.execute("SELECT COUNT(*) as total FROM assets")
-    total = cursor.fetchone()["total"]
-
-    if total == 0:
-        return {"error": "No assets. Load sample data or upload CSV."}
 
+    # Total and compliance counts come from the same scan
     cursor = db.execute("""
-        SELECT SUM(CASE WHEN owner IS NOT NULL THEN 1 ELSE 0 END) as has_owner,
+        SELECT COUNT(*) as total,
+               SUM(CASE WHEN owner IS NOT NULL THEN 1 ELSE 0 END) as has_owner,
                SUM(CASE WHEN in_cmms THEN 1 ELSE 0 END) as in_cmms,
                SUM(CASE WHEN documented THEN 1 ELSE 0 END) as documented,
                SUM(CASE WHEN security_policy_applied THEN 1 ELSE 0 END) as has_security
         FROM assets
     """)
     stats = cursor.fetchone()
+    total = stats["total"]
+
+    if total == 0:
+        return {"error": "No assets. Load sample data or upload CSV."}
 
     cursor = db.execute("SELECT type, COUNT(*) as count FROM assets GROUP BY type")
     by_type = {r["type"]: r["count"] for r in cursor.fetchall()}
@@ -490,39 +611,26 @@ def audit_summary():
 
 
 @app.get("/impact/{asset_id}")
-def analyze_impact(asset_id: str):
+def analyze_impact(asset_id: str, db: sqlite3.Connection = Depends(read_db)):
     """Analyze failure impact."""
-    db = get_db()
-
-    cursor = db.execute("SELECT * FROM assets WHERE id = ?", [asset_id])
-    asset = cursor.fetchone()
-    if not asset:
+    asset, has_redundancy = None, False
+    directly_affected, cascade = [], []
+    for kind, item_id, name, item_type, criticality, extra in db.execute(IMPACT_SQL, [asset_id] * 5):
+        if kind == "asset":
+            asset = {"id": item_id, "name": name, "type": item_type, "criticality": criticality}
+            has_redundancy = bool(extra)
+        elif kind == "direct":
+            directly_affected.append({"id": item_id, "name": name, "type": item_type, "criticality": criticality, "relationship_type": extra})
+        else:
+            cascade.append({"id": item_id, "name": name, "type": item_type, "criticality": criticality})
+    if asset is None:
         raise HTTPException(404, f"Asset {asset_id} not found")
 
-    cursor = db.execute("""
-        SELECT a.id, a.name, a.type, a.criticality, r.relationship_type
-        FROM relationships r JOIN assets a ON r.target_asset_id = a.id WHERE r.source_asset_id = ?
-    """, [asset_id])
-    directly_affected = [dict(r) for r in cursor.fetchall()]
-
-    cursor = db.execute("""
-        SELECT a.id, a.name, a.type, a.criticality
-        FROM relationships r JOIN assets a ON r.source_asset_id = a.id
-        WHERE r.target_asset_id = ? AND r.relationship_type = 'depends_on'
-    """, [asset_id])
-    cascade = [dict(r) for r in cursor.fetchall()]
-
-    cursor = db.execute("""
-        SELECT COUNT(*) as cnt FROM relationships
-        WHERE (source_asset_id = ? OR target_asset_id = ?) AND relationship_type = 'redundant_with'
-    """, [asset_id, asset_id])
-    has_redundancy = cursor.fetchone()["cnt"] > 0
-
     all_affected = directly_affected + cascade
     crit_count = len([a for a in all_affected if a.get("criticality") == "critical"])
 
     return {
-        "asset": {"id": asset["id"], "name": asset["name"], "type": asset["type"], "criticality": asset["criticality"]},
+        "asset": asset,
         "directly_affected": directly_affected,
         "cascade_effects": cascade,
         "total_affected": len(all_affected),
@@ -533,48 +641,14 @@ def analyze_impact(asset_id: str):
 
 
 @app.get("/upstream/{asset_id}")
-def get_upstream(asset_id: str):
+def get_upstream(asset_id: str, db: sqlite3.Connection = Depends(read_db)):
     """Get upstream assets."""
-    db = get_db()
-    visited, result, queue = set(), [], [(asset_id, 0)]
-
-    while queue:
-        current_id, depth = queue.pop(0)
-        if current_id in visited or depth > 5:
-            continue
-        visited.add(current_id)
-
-        cursor = db.execute("""
-            SELECT a.id, a.name, a.type, a.criticality, r.relationship_type
-            FROM relationships r JOIN assets a ON r.source_asset_id = a.id WHERE r.target_asset_id = ?
-        """, [current_id])
-        for row in cursor.fetchall():
-            if row["id"] not in visited:
-                result.append({**dict(row), "depth": depth + 1})
-                queue.append((row["id"], depth + 1))
-
+    result = rows_to_dicts(db.execute(UPSTREAM_SQL, [asset_id, TRAVERSAL_MAX_DEPTH, asset_id]))
     return {"asset_id": asset_id, "upstream": result, "count": len(result)}
 
 
 @app.get("/downstream/{asset_id}")
-def get_downstream(asset_id: str):
+def get_downstream(asset_id: str, db: sqlite3.Connection = Depends(read_db)):
     """Get downstream assets."""
-    db = get_db()
-    visited, result, queue = set(), [], [(asset_id, 0)]
-
-    while queue:
-        current_id, depth = queue.pop(0)
-        if current_id in visited or depth > 5:
-            continue
-        visited.add(current_id)
-
-        cursor = db.execute("""
-            SELECT a.id, a.name, a.type, a.criticality, r.relationship_type
-            FROM relationships r JOIN assets a ON r.target_asset_id = a.id WHERE r.source_asset_id = ?
-        """, [current_id])
-        for row in cursor.fetchall():
-            if row["id"] not in visited:
-                result.append({**dict(row), "depth": depth + 1})
-                queue.append((row["id"], depth + 1))
-
+    result = rows_to_dicts(db.execute(DOWNSTREAM_SQL, [asset_id, TRAVERSAL_MAX_DEPTH, asset_id]))
     return {"asset_id": asset_id, "downstream": result, "count": len(result)}
@@ -1,7 +1,6 @@
 """Entry point for running the OT Asset Inventory MCP server."""
 
-import asyncio
-from .server import main
+from .server import run
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
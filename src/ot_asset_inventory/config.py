@@ -12,6 +12,8 @@ class Config:
     db_path: Path
     log_level: str
     seed_sample_data: bool
+    db_concurrency: int = 8  # Tool calls allowed to run database work at once
+    read_pool_size: int = 4  # Read-only connections kept open for concurrent queries
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -23,6 +25,8 @@ class Config:
             db_path=Path(os.getenv("OT_INVENTORY_DB_PATH", str(default_db_path))),
             log_level=os.getenv("OT_INVENTORY_LOG_LEVEL", "INFO"),
             seed_sample_data=os.getenv("OT_INVENTORY_SEED_DATA", "true").lower() == "true",
+            db_concurrency=int(os.getenv("OT_INVENTORY_DB_CONCURRENCY", "8")),
+            read_pool_size=int(os.getenv("OT_INVENTORY_READ_POOL_SIZE", "4")),
         )
 
 
@@ -1,34 +1,134 @@
 """Database connection management for OT Asset Inventory."""
 
+import asyncio
+import sqlite3
 from pathlib import Path
 from typing import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
 import aiosqlite
 
 
+# Connection-level tuning; WAL is only applied to on-disk databases
+PRAGMA_SQL = """
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+"""
+
+# Oldest SQLite with every feature the schema and tools use: the FTS5 trigram
+# tokenizer (3.34) and RETURNING (3.35)
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Read-only connections kept alongside the writer for on-disk databases
+READ_POOL_SIZE = 4
+
+# Prepared statements sqlite3 keeps per connection, keyed by SQL text. The
+# default (128) is smaller than the set of distinct statements the tools
+# build (e.g. one per list_assets filter combination), so raise it to keep
+# hot statements from being re-prepared
+STATEMENT_CACHE_SIZE = 512
+
+
 class DatabaseManager:
-    """Manages async SQLite database connections."""
+    """Manages async SQLite database connections.
+
+    A single read-write connection handles schema setup, seeding and all
+    writes. On-disk databases additionally get a small pool of read-only
+    connections, so concurrent reads are not serialized behind the writer's
+    worker thread.
+    """
 
-    def __init__(self, db_path: str | Path):
+    def __init__(self, db_path: str | Path, read_pool_size: int = READ_POOL_SIZE):
         self.db_path = Path(db_path)
+        self.read_pool_size = read_pool_size
         self._connection: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._read_pool_lock = asyncio.Lock()
 
     async def connect(self) -> aiosqlite.Connection:
         """Establish database connection."""
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required, "
+                f"but Python is linked against SQLite {sqlite3.sqlite_version}"
+            )
+
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._connection = await aiosqlite.connect(self.db_path)
+        self._connection = await aiosqlite.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+        )
         self._connection.row_factory = aiosqlite.Row
 
         # Enable foreign keys
         await self._connection.execute("PRAGMA foreign_keys = ON")
 
+        if not self.in_memory:
+            # Only takes effect on a new file, and must precede the switch to WAL
+            await self._connection.execute("PRAGMA page_size = 8192")
+            await self._connection.execute("PRAGMA journal_mode = WAL")
+        await self._connection.executescript(PRAGMA_SQL)
+
         return self._connection
 
+    @property
+    def in_memory(self) -> bool:
+        """Whether this manager points at an in-memory database."""
+        return str(self.db_path) == ":memory:"
+
+    async def _open_reader(self) -> aiosqlite.Connection:
+        """Open a read-only connection sharing the writer's WAL."""
+        reader = await aiosqlite.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        reader.row_factory = aiosqlite.Row
+        await reader.execute("PRAGMA query_only = 1")
+        await reader.executescript(PRAGMA_SQL)
+        return reader
+
+    async def _ensure_read_pool(self) -> asyncio.Queue[aiosqlite.Connection]:
+        """Open the read pool on first use, once the writer has created the file."""
+        async with self._read_pool_lock:
+            if self._read_pool is None:
+                pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+                for _ in range(self.read_pool_size):
+                    reader = await self._open_reader()
+                    self._readers.append(reader)
+                    pool.put_nowait(reader)
+                self._read_pool = pool
+            return self._read_pool
+
+    @asynccontextmanager
+    async def acquire_read(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Check out a read-only connection for the duration of the block.
+
+        In-memory databases are private to their connection, so they (and
+        managers configured without a pool) fall back to the writer.
+        """
+        if self.in_memory or self.read_pool_size < 1:
+            yield self.connection
+            return
+
+        pool = await self._ensure_read_pool()
+        reader = await pool.get()
+        try:
+            yield reader
+        finally:
+            pool.put_nowait(reader)
+
     async def disconnect(self) -> None:
-        """Close database connection."""
+        """Close database connections."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._read_pool = None
+
         if self._connection:
             await self._connection.close()
             self._connection = None
@@ -68,3 +168,12 @@ def set_db_manager(manager: DatabaseManager) -> None:
 async def get_db() -> aiosqlite.Connection:
     """Get the database connection."""
     return get_db_manager().connection
+
+
+def read_db() -> AbstractAsyncContextManager[aiosqlite.Connection]:
+    """Check out a read-only connection from the global manager's read pool.
+
+    Use for read-only queries that run alongside others (e.g. under
+    asyncio.gather), so each branch gets its own connection and worker thread.
+    """
+    return get_db_manager().acquire_read()
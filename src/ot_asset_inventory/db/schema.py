@@ -45,23 +45,29 @@ CREATE TABLE IF NOT EXISTS compliance_frameworks (
 
 -- Main assets table
 CREATE TABLE IF NOT EXISTS assets (
+    -- Summary columns first: SQLite decodes a record left to right, so the
+    -- columns read by list views sit ahead of the long tail
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
     type TEXT NOT NULL CHECK (type IN ('PLC', 'HMI', 'Sensor', 'Actuator', 'RTU', 'Gateway', 'Switch', 'Server', 'Workstation')),
     manufacturer TEXT,
     model TEXT,
+    criticality TEXT CHECK (criticality IN ('critical', 'high', 'medium', 'low')),
+    process_area_id TEXT REFERENCES process_areas(id),
+    ip_address TEXT,
+    owner TEXT,
+    site_id TEXT REFERENCES sites(id),
+
+    -- Hardware details
     serial_number TEXT,
     firmware_version TEXT,
 
     -- Location
-    site_id TEXT REFERENCES sites(id),
     building TEXT,
     area TEXT,
     zone TEXT,
-    process_area_id TEXT REFERENCES process_areas(id),
 
     -- Network information
-    ip_address TEXT,
     mac_address TEXT,
     vlan INTEGER,
     protocols TEXT,  -- JSON array
@@ -71,7 +77,6 @@ CREATE TABLE IF NOT EXISTS assets (
     function TEXT,
 
     -- Ownership
-    owner TEXT,
     maintainer TEXT,
     last_verified DATE,
 
@@ -80,9 +85,6 @@ CREATE TABLE IF NOT EXISTS assets (
     documented BOOLEAN DEFAULT 0,
     security_policy_applied BOOLEAN DEFAULT 0,
 
-    -- Risk assessment
-    criticality TEXT CHECK (criticality IN ('critical', 'high', 'medium', 'low')),
-
     -- Metadata
     notes TEXT,
     tags TEXT,  -- JSON array
@@ -90,6 +92,40 @@ CREATE TABLE IF NOT EXISTS assets (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Protocols and tags normalized out of the assets JSON columns so they can be
+-- filtered in SQL; kept in sync by the triggers below
+CREATE TABLE IF NOT EXISTS asset_protocols (
+    asset_id TEXT NOT NULL REFERENCES assets(id) ON DELETE CASCADE,
+    protocol TEXT NOT NULL,
+    PRIMARY KEY (asset_id, protocol)
+);
+
+CREATE TABLE IF NOT EXISTS asset_tags (
+    asset_id TEXT NOT NULL REFERENCES assets(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (asset_id, tag)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_lists_insert
+AFTER INSERT ON assets
+BEGIN
+    INSERT OR IGNORE INTO asset_protocols (asset_id, protocol)
+    SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.protocols) THEN NEW.protocols ELSE '[]' END);
+    INSERT OR IGNORE INTO asset_tags (asset_id, tag)
+    SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_lists_update
+AFTER UPDATE OF protocols, tags ON assets
+BEGIN
+    DELETE FROM asset_protocols WHERE asset_id = NEW.id;
+    DELETE FROM asset_tags WHERE asset_id = NEW.id;
+    INSERT OR IGNORE INTO asset_protocols (asset_id, protocol)
+    SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.protocols) THEN NEW.protocols ELSE '[]' END);
+    INSERT OR IGNORE INTO asset_tags (asset_id, tag)
+    SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END);
+END;
+
 -- Relationships between assets
 CREATE TABLE IF NOT EXISTS relationships (
     id TEXT PRIMARY KEY,
@@ -108,6 +144,45 @@ CREATE TABLE IF NOT EXISTS relationships (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Transitive closure of relationships, per relationship type (shortest hop count)
+CREATE TABLE IF NOT EXISTS relationship_closure (
+    ancestor TEXT NOT NULL,
+    descendant TEXT NOT NULL,
+    relationship_type TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor, descendant, relationship_type)
+);
+
+-- Closure lookups by descendant ("what reaches X"); part of the schema rather
+-- than INDEX_SQL because the trigger below probes it on every insert
+CREATE INDEX IF NOT EXISTS idx_closure_desc ON relationship_closure(descendant, relationship_type);
+
+-- Extend the closure through each new edge: every ancestor of the source
+-- now reaches every descendant of the target. There is deliberately no delete
+-- or update trigger (removing an edge cannot be undone incrementally), so
+-- relationship rows must never be deleted or re-pointed to other assets
+-- without calling rebuild_relationship_closure afterwards
+CREATE TRIGGER IF NOT EXISTS trg_relationship_closure_insert
+AFTER INSERT ON relationships
+BEGIN
+    INSERT INTO relationship_closure (ancestor, descendant, relationship_type, depth)
+    SELECT up.ancestor, down.descendant, NEW.relationship_type, up.depth + 1 + down.depth
+    FROM (
+        SELECT NEW.source_asset_id AS ancestor, 0 AS depth
+        UNION ALL
+        SELECT ancestor, depth FROM relationship_closure
+        WHERE descendant = NEW.source_asset_id AND relationship_type = NEW.relationship_type
+    ) AS up, (
+        SELECT NEW.target_asset_id AS descendant, 0 AS depth
+        UNION ALL
+        SELECT descendant, depth FROM relationship_closure
+        WHERE ancestor = NEW.target_asset_id AND relationship_type = NEW.relationship_type
+    ) AS down
+    WHERE up.ancestor != down.descendant
+    ON CONFLICT (ancestor, descendant, relationship_type)
+    DO UPDATE SET depth = MIN(depth, excluded.depth);
+END;
+
 -- Review flags for human validation
 CREATE TABLE IF NOT EXISTS review_flags (
     id TEXT PRIMARY KEY,
@@ -139,21 +214,210 @@ CREATE TABLE IF NOT EXISTS audit_log (
 );
 """
 
+# Per-asset link counts read by SPOF analysis, kept in sync with relationships
+# by the triggers below. An asset counts as redundant when it has a
+# redundant_with link to another asset, or another asset backs_up it
+_LINK_STATS_DELTA = """
+    INSERT INTO asset_link_stats (asset_id, downstream_count, redundancy_count)
+    SELECT * FROM (
+        SELECT {row}.source_asset_id, {sign}1,
+               {sign}({row}.relationship_type = 'redundant_with'
+                      AND {row}.source_asset_id != {row}.target_asset_id)
+        UNION ALL
+        SELECT {row}.target_asset_id, 0,
+               {sign}({row}.relationship_type = 'backs_up'
+                      OR ({row}.relationship_type = 'redundant_with'
+                          AND {row}.source_asset_id != {row}.target_asset_id))
+    ) WHERE true
+    ON CONFLICT (asset_id) DO UPDATE SET
+        downstream_count = downstream_count + excluded.downstream_count,
+        redundancy_count = redundancy_count + excluded.redundancy_count;
+"""
+
+LINK_STATS_SQL = """
+CREATE TABLE IF NOT EXISTS asset_link_stats (
+    asset_id TEXT PRIMARY KEY,
+    downstream_count INTEGER NOT NULL DEFAULT 0,
+    redundancy_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_link_stats_insert
+AFTER INSERT ON relationships
+BEGIN{added}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_link_stats_delete
+AFTER DELETE ON relationships
+BEGIN{removed}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_link_stats_update
+AFTER UPDATE OF source_asset_id, target_asset_id, relationship_type ON relationships
+BEGIN{removed}{added}END;
+""".format(
+    added=_LINK_STATS_DELTA.format(row="NEW", sign=""),
+    removed=_LINK_STATS_DELTA.format(row="OLD", sign="-"),
+)
+
+# Per-type relationship counts read by get_relationship_types, kept in sync
+# with relationships by the triggers below. Types whose last relationship is
+# removed keep a zero row
+_TYPE_COUNTS_DELTA = """
+    INSERT INTO relationship_type_counts (relationship_type, count, verified_count, inferred_count)
+    VALUES ({row}.relationship_type, {sign}1,
+            {sign}(CASE WHEN {row}.verified THEN 1 ELSE 0 END),
+            {sign}(CASE WHEN {row}.inferred THEN 1 ELSE 0 END))
+    ON CONFLICT (relationship_type) DO UPDATE SET
+        count = count + excluded.count,
+        verified_count = verified_count + excluded.verified_count,
+        inferred_count = inferred_count + excluded.inferred_count;
+"""
+
+TYPE_COUNTS_SQL = """
+CREATE TABLE IF NOT EXISTS relationship_type_counts (
+    relationship_type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    verified_count INTEGER NOT NULL DEFAULT 0,
+    inferred_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_relationship_type_counts_insert
+AFTER INSERT ON relationships
+BEGIN{added}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_relationship_type_counts_delete
+AFTER DELETE ON relationships
+BEGIN{removed}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_relationship_type_counts_update
+AFTER UPDATE OF relationship_type, verified, inferred ON relationships
+BEGIN{removed}{added}END;
+""".format(
+    added=_TYPE_COUNTS_DELTA.format(row="NEW", sign=""),
+    removed=_TYPE_COUNTS_DELTA.format(row="OLD", sign="-"),
+)
+
+# Review flag counts read by get_review_summary: all flags by status, and open
+# flags by severity and by type. Kept in sync with review_flags by the
+# triggers below. NULL keys are stored as '' (not a valid status or severity)
+# so they can take part in the primary key
+_FLAG_COUNTS_DELTA = """
+    INSERT INTO review_flag_counts (kind, key, count)
+    SELECT * FROM (
+        SELECT 'status', IFNULL({row}.status, ''), {sign}1
+        UNION ALL
+        SELECT 'open_severity', IFNULL({row}.severity, ''), {sign}1 WHERE {row}.status = 'open'
+        UNION ALL
+        SELECT 'open_type', {row}.flag_type, {sign}1 WHERE {row}.status = 'open'
+    ) WHERE true
+    ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count;
+"""
+
+FLAG_COUNTS_SQL = """
+CREATE TABLE IF NOT EXISTS review_flag_counts (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_review_flag_counts_insert
+AFTER INSERT ON review_flags
+BEGIN{added}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_flag_counts_delete
+AFTER DELETE ON review_flags
+BEGIN{removed}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_flag_counts_update
+AFTER UPDATE OF status, severity, flag_type ON review_flags
+BEGIN{removed}{added}END;
+""".format(
+    added=_FLAG_COUNTS_DELTA.format(row="NEW", sign=""),
+    removed=_FLAG_COUNTS_DELTA.format(row="OLD", sign="-"),
+)
+
+# Full-text index over the searchable asset columns, read by search_assets.
+# External-content table: rows live in assets and the triggers below keep the
+# index in step. The trigram tokenizer keeps the substring semantics of the
+# LIKE '%term%' search it replaces
+SEARCH_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+    id, name, manufacturer, model, notes, function, owner, ip_address,
+    tokenize='trigram', content='assets', content_rowid='rowid'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_assets_fts_insert
+AFTER INSERT ON assets
+BEGIN
+    INSERT INTO assets_fts (rowid, id, name, manufacturer, model, notes, function, owner, ip_address)
+    VALUES (NEW.rowid, NEW.id, NEW.name, NEW.manufacturer, NEW.model, NEW.notes, NEW.function,
+            NEW.owner, NEW.ip_address);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_assets_fts_delete
+AFTER DELETE ON assets
+BEGIN
+    INSERT INTO assets_fts (assets_fts, rowid, id, name, manufacturer, model, notes, function, owner, ip_address)
+    VALUES ('delete', OLD.rowid, OLD.id, OLD.name, OLD.manufacturer, OLD.model, OLD.notes, OLD.function,
+            OLD.owner, OLD.ip_address);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_assets_fts_update
+AFTER UPDATE OF id, name, manufacturer, model, notes, function, owner, ip_address ON assets
+BEGIN
+    INSERT INTO assets_fts (assets_fts, rowid, id, name, manufacturer, model, notes, function, owner, ip_address)
+    VALUES ('delete', OLD.rowid, OLD.id, OLD.name, OLD.manufacturer, OLD.model, OLD.notes, OLD.function,
+            OLD.owner, OLD.ip_address);
+    INSERT INTO assets_fts (rowid, id, name, manufacturer, model, notes, function, owner, ip_address)
+    VALUES (NEW.rowid, NEW.id, NEW.name, NEW.manufacturer, NEW.model, NEW.notes, NEW.function,
+            NEW.owner, NEW.ip_address);
+END;
+"""
+
 INDEX_SQL = """
 -- Asset queries
 CREATE INDEX IF NOT EXISTS idx_assets_type ON assets(type);
 CREATE INDEX IF NOT EXISTS idx_assets_process_area ON assets(process_area_id);
-CREATE INDEX IF NOT EXISTS idx_assets_site ON assets(site_id);
-CREATE INDEX IF NOT EXISTS idx_assets_criticality ON assets(criticality);
+CREATE INDEX IF NOT EXISTS idx_assets_site_type ON assets(site_id, type);
+CREATE INDEX IF NOT EXISTS idx_assets_crit_type ON assets(criticality, type);
 CREATE INDEX IF NOT EXISTS idx_assets_owner ON assets(owner);
+CREATE INDEX IF NOT EXISTS idx_assets_last_verified ON assets(last_verified);
+
+-- Assets with any compliance gap, in list_assets order. Partial index: the
+-- WHERE must stay identical to list_assets' has_gaps condition for the
+-- planner to match it
+CREATE INDEX IF NOT EXISTS idx_assets_gaps ON assets(criticality DESC, name)
+WHERE (owner IS NULL OR NOT in_cmms OR NOT documented OR NOT security_policy_applied);
 
--- Relationship queries (critical for graph traversal)
-CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_asset_id);
-CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_asset_id);
-CREATE INDEX IF NOT EXISTS idx_relationships_type ON relationships(relationship_type);
+-- One partial index per boolean gap, for find_gaps calls that ask for a
+-- single gap type. no_owner is already served by idx_assets_owner
+CREATE INDEX IF NOT EXISTS idx_assets_not_in_cmms ON assets(criticality DESC, name)
+WHERE NOT in_cmms;
+CREATE INDEX IF NOT EXISTS idx_assets_undocumented ON assets(criticality DESC, name)
+WHERE NOT documented;
+CREATE INDEX IF NOT EXISTS idx_assets_no_security_policy ON assets(criticality DESC, name)
+WHERE NOT security_policy_applied;
+
+-- Protocol / tag filters
+CREATE INDEX IF NOT EXISTS idx_asset_protocols_protocol ON asset_protocols(protocol);
+CREATE INDEX IF NOT EXISTS idx_asset_tags_tag ON asset_tags(tag);
+
+-- Relationship queries (critical for graph traversal); covering for
+-- endpoint + type lookups in either direction
+CREATE INDEX IF NOT EXISTS idx_rel_src_type_tgt ON relationships(source_asset_id, relationship_type, target_asset_id);
+CREATE INDEX IF NOT EXISTS idx_rel_tgt_type_src ON relationships(target_asset_id, relationship_type, source_asset_id);
+-- Type-only filters, and covering for get_relationship_types' grouped counts
+CREATE INDEX IF NOT EXISTS idx_rel_type ON relationships(relationship_type, verified, inferred);
 
 -- Review flags
-CREATE INDEX IF NOT EXISTS idx_review_flags_status ON review_flags(status);
+CREATE INDEX IF NOT EXISTS idx_review_flags_status_asset ON review_flags(status, asset_id);
+-- list_review_flags' filter and sort order. The severity CASE must stay
+-- identical to the ORDER BY there for the planner to walk the index in order
+CREATE INDEX IF NOT EXISTS idx_review_flags_list ON review_flags(
+    status,
+    (CASE severity WHEN 'critical' THEN 1 WHEN 'high' THEN 2 WHEN 'medium' THEN 3 WHEN 'low' THEN 4 END),
+    flagged_at DESC
+);
+CREATE INDEX IF NOT EXISTS idx_review_flags_status_flagged ON review_flags(status, flagged_at);
 CREATE INDEX IF NOT EXISTS idx_review_flags_asset ON review_flags(asset_id);
 
 -- Process areas
@@ -161,20 +425,169 @@ CREATE INDEX IF NOT EXISTS idx_process_areas_site ON process_areas(site_id);
 
 -- Sites
 CREATE INDEX IF NOT EXISTS idx_sites_environment ON sites(environment_id);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_assets_site;
+DROP INDEX IF EXISTS idx_assets_criticality;
+DROP INDEX IF EXISTS idx_relationships_source;
+DROP INDEX IF EXISTS idx_relationships_target;
+DROP INDEX IF EXISTS idx_relationships_type;
+DROP INDEX IF EXISTS idx_review_flags_status;
+DROP INDEX IF EXISTS idx_review_flags_status_severity;
+"""
+
+
+# Repopulate asset_protocols / asset_tags from the assets JSON columns
+ASSET_LISTS_REBUILD_SQL = """
+DELETE FROM asset_protocols;
+DELETE FROM asset_tags;
+INSERT OR IGNORE INTO asset_protocols (asset_id, protocol)
+SELECT a.id, j.value FROM assets a, json_each(a.protocols) j WHERE json_valid(a.protocols);
+INSERT OR IGNORE INTO asset_tags (asset_id, tag)
+SELECT a.id, j.value FROM assets a, json_each(a.tags) j WHERE json_valid(a.tags);
+"""
+
+# Rebuild the closure from scratch with a bounded breadth-first walk
+CLOSURE_REBUILD_SQL = """
+DELETE FROM relationship_closure;
+INSERT INTO relationship_closure (ancestor, descendant, relationship_type, depth)
+WITH RECURSIVE walk(ancestor, descendant, relationship_type, depth) AS (
+    SELECT source_asset_id, target_asset_id, relationship_type, 1 FROM relationships
+    UNION
+    SELECT w.ancestor, r.target_asset_id, w.relationship_type, w.depth + 1
+    FROM walk w
+    JOIN relationships r
+        ON r.source_asset_id = w.descendant AND r.relationship_type = w.relationship_type
+    WHERE w.depth < (SELECT COUNT(*) FROM assets)
+)
+SELECT ancestor, descendant, relationship_type, MIN(depth)
+FROM walk
+WHERE ancestor != descendant
+GROUP BY ancestor, descendant, relationship_type;
+"""
+
+
+# Recount asset_link_stats from the relationships table
+LINK_STATS_REBUILD_SQL = """
+DELETE FROM asset_link_stats;
+INSERT INTO asset_link_stats (asset_id, downstream_count, redundancy_count)
+SELECT asset_id, SUM(downstream), SUM(redundancy)
+FROM (
+    SELECT source_asset_id AS asset_id, 1 AS downstream,
+           relationship_type = 'redundant_with' AND source_asset_id != target_asset_id AS redundancy
+    FROM relationships
+    UNION ALL
+    SELECT target_asset_id, 0,
+           relationship_type = 'backs_up'
+           OR (relationship_type = 'redundant_with' AND source_asset_id != target_asset_id)
+    FROM relationships
+)
+GROUP BY asset_id;
+"""
+
+
+# Recount relationship_type_counts from the relationships table
+TYPE_COUNTS_REBUILD_SQL = """
+DELETE FROM relationship_type_counts;
+INSERT INTO relationship_type_counts (relationship_type, count, verified_count, inferred_count)
+SELECT relationship_type, COUNT(*),
+       SUM(CASE WHEN verified THEN 1 ELSE 0 END),
+       SUM(CASE WHEN inferred THEN 1 ELSE 0 END)
+FROM relationships
+GROUP BY relationship_type;
+"""
+
+
+# Recount review_flag_counts from the review_flags table
+FLAG_COUNTS_REBUILD_SQL = """
+DELETE FROM review_flag_counts;
+INSERT INTO review_flag_counts (kind, key, count)
+SELECT 'status', IFNULL(status, ''), COUNT(*) FROM review_flags GROUP BY 2
+UNION ALL
+SELECT 'open_severity', IFNULL(severity, ''), COUNT(*) FROM review_flags WHERE status = 'open' GROUP BY 2
+UNION ALL
+SELECT 'open_type', flag_type, COUNT(*) FROM review_flags WHERE status = 'open' GROUP BY 2;
 """
 
 
 async def create_tables(db: aiosqlite.Connection) -> None:
-    """Create all database tables."""
+    """Create all database tables.
+
+    Secondary indexes are left to create_indexes() so that an initial seed
+    does not pay index maintenance on every inserted row.
+    """
     await db.executescript(SCHEMA_SQL)
+    await db.executescript(LINK_STATS_SQL)
+    await db.executescript(TYPE_COUNTS_SQL)
+    await db.executescript(FLAG_COUNTS_SQL)
+    await db.executescript(SEARCH_SQL)
+
+    # Backfill derived tables for databases created before they existed
+    if await _needs_backfill(db, "relationships", "relationship_closure"):
+        await rebuild_relationship_closure(db)
+    if await _needs_backfill(db, "relationships", "asset_link_stats"):
+        await rebuild_link_stats(db)
+    if await _needs_backfill(db, "relationships", "relationship_type_counts"):
+        await rebuild_relationship_type_counts(db)
+    if await _needs_backfill(db, "review_flags", "review_flag_counts"):
+        await rebuild_review_flag_counts(db)
+    if await _needs_backfill(db, "assets", "asset_protocols", "asset_tags"):
+        await rebuild_asset_lists(db)
+    # assets_fts reads through to assets, so check its per-row shadow table
+    if await _needs_backfill(db, "assets", "assets_fts_docsize"):
+        await rebuild_search_index(db)
+
+    await db.commit()
+
+
+async def create_indexes(db: aiosqlite.Connection) -> None:
+    """Create secondary indexes (idempotent); run after any initial seeding."""
     await db.executescript(INDEX_SQL)
     await db.commit()
 
 
+async def rebuild_relationship_closure(db: aiosqlite.Connection) -> None:
+    """Recompute relationship_closure from the relationships table."""
+    await db.executescript(CLOSURE_REBUILD_SQL)
+
+
+async def rebuild_link_stats(db: aiosqlite.Connection) -> None:
+    """Recompute asset_link_stats from the relationships table."""
+    await db.executescript(LINK_STATS_REBUILD_SQL)
+
+
+async def rebuild_relationship_type_counts(db: aiosqlite.Connection) -> None:
+    """Recompute relationship_type_counts from the relationships table."""
+    await db.executescript(TYPE_COUNTS_REBUILD_SQL)
+
+
+async def rebuild_review_flag_counts(db: aiosqlite.Connection) -> None:
+    """Recompute review_flag_counts from the review_flags table."""
+    await db.executescript(FLAG_COUNTS_REBUILD_SQL)
+
+
+async def rebuild_asset_lists(db: aiosqlite.Connection) -> None:
+    """Recompute asset_protocols and asset_tags from the assets table."""
+    await db.executescript(ASSET_LISTS_REBUILD_SQL)
+
+
+async def rebuild_search_index(db: aiosqlite.Connection) -> None:
+    """Recompute the assets_fts full-text index from the assets table."""
+    await db.execute("INSERT INTO assets_fts (assets_fts) VALUES ('rebuild')")
+
+
+async def _needs_backfill(db: aiosqlite.Connection, source: str, *derived: str) -> bool:
+    """Whether the source table has rows while every derived table is empty."""
+    checks = " AND ".join(f"NOT EXISTS (SELECT 1 FROM {table})" for table in derived)
+    async with db.execute(f"SELECT EXISTS (SELECT 1 FROM {source}) AND {checks}") as cursor:
+        return bool((await cursor.fetchone())[0])
+
+
 async def drop_tables(db: aiosqlite.Connection) -> None:
     """Drop all database tables (use with caution)."""
     tables = [
-        "audit_log", "review_flags", "relationships", "assets",
+        "audit_log", "review_flag_counts", "review_flags", "relationship_closure", "asset_link_stats",
+        "relationship_type_counts", "relationships", "asset_protocols", "asset_tags", "assets_fts", "assets",
         "compliance_frameworks", "process_areas", "sites", "environments"
     ]
     for table in tables:
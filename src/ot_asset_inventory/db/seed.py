@@ -1,15 +1,83 @@
 """Sample data seeding for OT Asset Inventory."""
 
-import json
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
-import uuid
 
 import aiosqlite
-
-
-async def seed_sample_data(db: aiosqlite.Connection, data_path: Path | None = None) -> None:
-    """Load sample data into the database if empty."""
+import orjson
+
+
+# Seed statements, one literal per table so executemany() prepares each once.
+# Plain INSERT: seeding only runs against an empty database. Timestamps are
+# bound explicitly (one value per load) so the CURRENT_TIMESTAMP column
+# defaults are not evaluated per row
+_ENVIRONMENTS_INSERT_SQL = """
+INSERT INTO environments (id, name, type, description, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SITES_INSERT_SQL = """
+INSERT INTO sites (id, environment_id, name, address, timezone, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_PROCESS_AREAS_INSERT_SQL = """
+INSERT INTO process_areas (id, site_id, name, description, function, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Assets are unpacked from one JSON array bind by json_each, so the whole
+# batch goes through a single statement instead of 27 binds per row.
+# json_extract rather than ->> keeps this working on SQLite before 3.38
+_ASSETS_INSERT_SQL = """
+INSERT INTO assets (
+    id, name, type, manufacturer, model, serial_number, firmware_version,
+    site_id, building, area, zone, process_area_id,
+    ip_address, mac_address, vlan, protocols,
+    environment_type, function,
+    owner, maintainer, last_verified,
+    in_cmms, documented, security_policy_applied,
+    criticality, notes, tags, created_at, updated_at
+)
+SELECT
+    json_extract(value, '$.id'), json_extract(value, '$.name'), json_extract(value, '$.type'),
+    json_extract(value, '$.manufacturer'), json_extract(value, '$.model'), json_extract(value, '$.serial_number'),
+    json_extract(value, '$.firmware_version'),
+    json_extract(value, '$.site_id'), json_extract(value, '$.building'), json_extract(value, '$.area'), json_extract(value, '$.zone'),
+    json_extract(value, '$.process_area_id'),
+    json_extract(value, '$.ip_address'), json_extract(value, '$.mac_address'), json_extract(value, '$.vlan'),
+    coalesce(json_extract(value, '$.protocols'), '[]'),
+    json_extract(value, '$.environment_type'), json_extract(value, '$.function'),
+    json_extract(value, '$.owner'), json_extract(value, '$.maintainer'), json_extract(value, '$.last_verified'),
+    json_extract(value, '$.in_cmms') IS TRUE, json_extract(value, '$.documented') IS TRUE,
+    json_extract(value, '$.security_policy_applied') IS TRUE,
+    json_extract(value, '$.criticality'), json_extract(value, '$.notes'),
+    coalesce(json_extract(value, '$.tags'), '[]'), :ts, :ts
+FROM json_each(:assets)
+"""
+
+_RELATIONSHIPS_INSERT_SQL = """
+INSERT INTO relationships (
+    id, source_asset_id, target_asset_id, relationship_type,
+    inferred, verified, description, created_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+async def seed_sample_data(
+    db: aiosqlite.Connection,
+    data_path: Path | None = None,
+    if_not_exists: bool = False,
+) -> None:
+    """Load sample data into the database if empty.
+
+    Args:
+        db: Open database connection
+        data_path: Sample data JSON file (defaults to data/sample_data.json)
+        if_not_exists: Skip rows that already exist instead of failing, for
+            databases that hold reference data (environments, sites) but no assets
+    """
     # Check if data already exists
     async with db.execute("SELECT COUNT(*) FROM assets") as cursor:
         row = await cursor.fetchone()
@@ -23,143 +91,142 @@ async def seed_sample_data(db: aiosqlite.Connection, data_path: Path | None = No
     if not data_path.exists():
         return
 
-    with open(data_path) as f:
-        data = json.load(f)
+    data = orjson.loads(data_path.read_bytes())
+    # Same format as SQLite's CURRENT_TIMESTAMP
+    ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    # Bulk-load mode: the database is empty and the sample data is trusted, so
+    # keep the rollback journal in memory, skip fsyncs and per-row CHECK
+    # evaluation while seeding, and restore the connection's settings afterwards
+    async with db.execute("PRAGMA journal_mode") as cursor:
+        journal_mode = (await cursor.fetchone())[0]
+    async with db.execute("PRAGMA synchronous") as cursor:
+        synchronous = (await cursor.fetchone())[0]
+    async with db.execute("PRAGMA ignore_check_constraints") as cursor:
+        ignore_check_constraints = (await cursor.fetchone())[0]
+    await db.executescript(
+        "PRAGMA journal_mode = MEMORY; PRAGMA synchronous = OFF; "
+        "PRAGMA ignore_check_constraints = ON;"
+    )
+
+    try:
+        # One transaction for the whole load; each helper is a single executemany()
+        await db.execute("BEGIN")
+        await _seed_environments(db, data.get("environments", []), ts, if_not_exists)
+        await _seed_sites(db, data.get("sites", []), ts, if_not_exists)
+        await _seed_process_areas(db, data.get("process_areas", []), ts, if_not_exists)
+        await _seed_assets(db, data.get("assets", []), ts, if_not_exists)
+        await _seed_relationships(db, data.get("relationships", []), ts, if_not_exists)
+
+        await db.commit()
+    except BaseException:
+        # A half-loaded database would be skipped as "already seeded" next time
+        await db.rollback()
+        raise
+    finally:
+        await db.executescript(
+            f"PRAGMA journal_mode = {journal_mode}; PRAGMA synchronous = {synchronous}; "
+            f"PRAGMA ignore_check_constraints = {ignore_check_constraints};"
+        )
 
-    await _seed_environments(db, data.get("environments", []))
-    await _seed_sites(db, data.get("sites", []))
-    await _seed_process_areas(db, data.get("process_areas", []))
-    await _seed_assets(db, data.get("assets", []))
-    await _seed_relationships(db, data.get("relationships", []))
 
-    await db.commit()
+def _statement(sql: str, if_not_exists: bool) -> str:
+    """Return a seed INSERT, tolerating existing rows when requested."""
+    return sql.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1) if if_not_exists else sql
 
 
-async def _seed_environments(db: aiosqlite.Connection, environments: list[dict[str, Any]]) -> None:
+async def _seed_environments(
+    db: aiosqlite.Connection, environments: list[dict[str, Any]], ts: str, if_not_exists: bool
+) -> None:
     """Seed environment data."""
-    for env in environments:
-        await db.execute(
-            """
-            INSERT OR IGNORE INTO environments (id, name, type, description)
-            VALUES (?, ?, ?, ?)
-            """,
-            (env["id"], env["name"], env["type"], env.get("description")),
-        )
-
-
-async def _seed_sites(db: aiosqlite.Connection, sites: list[dict[str, Any]]) -> None:
+    await db.executemany(
+        _statement(_ENVIRONMENTS_INSERT_SQL, if_not_exists),
+        [
+            (env["id"], env["name"], env["type"], env.get("description"), ts, ts)
+            for env in environments
+        ],
+    )
+
+
+async def _seed_sites(
+    db: aiosqlite.Connection, sites: list[dict[str, Any]], ts: str, if_not_exists: bool
+) -> None:
     """Seed site data."""
-    for site in sites:
-        await db.execute(
-            """
-            INSERT OR IGNORE INTO sites (id, environment_id, name, address, timezone)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+    await db.executemany(
+        _statement(_SITES_INSERT_SQL, if_not_exists),
+        [
             (
                 site["id"],
                 site["environment_id"],
                 site["name"],
                 site.get("address"),
                 site.get("timezone"),
-            ),
-        )
+                ts,
+            )
+            for site in sites
+        ],
+    )
 
 
-async def _seed_process_areas(db: aiosqlite.Connection, process_areas: list[dict[str, Any]]) -> None:
+async def _seed_process_areas(
+    db: aiosqlite.Connection, process_areas: list[dict[str, Any]], ts: str, if_not_exists: bool
+) -> None:
     """Seed process area data."""
-    for pa in process_areas:
-        await db.execute(
-            """
-            INSERT OR IGNORE INTO process_areas (id, site_id, name, description, function)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+    await db.executemany(
+        _statement(_PROCESS_AREAS_INSERT_SQL, if_not_exists),
+        [
             (
                 pa["id"],
                 pa["site_id"],
                 pa["name"],
                 pa.get("description"),
                 pa.get("function"),
-            ),
-        )
+                ts,
+            )
+            for pa in process_areas
+        ],
+    )
 
 
-async def _seed_assets(db: aiosqlite.Connection, assets: list[dict[str, Any]]) -> None:
+async def _seed_assets(
+    db: aiosqlite.Connection, assets: list[dict[str, Any]], ts: str, if_not_exists: bool
+) -> None:
     """Seed asset data."""
-    for asset in assets:
-        # Convert lists to JSON strings
-        protocols = json.dumps(asset.get("protocols", []))
-        tags = json.dumps(asset.get("tags", []))
-
-        await db.execute(
-            """
-            INSERT OR IGNORE INTO assets (
-                id, name, type, manufacturer, model, serial_number, firmware_version,
-                site_id, building, area, zone, process_area_id,
-                ip_address, mac_address, vlan, protocols,
-                environment_type, function,
-                owner, maintainer, last_verified,
-                in_cmms, documented, security_policy_applied,
-                criticality, notes, tags
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                asset["id"],
-                asset["name"],
-                asset["type"],
-                asset.get("manufacturer"),
-                asset.get("model"),
-                asset.get("serial_number"),
-                asset.get("firmware_version"),
-                asset.get("site_id"),
-                asset.get("building"),
-                asset.get("area"),
-                asset.get("zone"),
-                asset.get("process_area_id"),
-                asset.get("ip_address"),
-                asset.get("mac_address"),
-                asset.get("vlan"),
-                protocols,
-                asset.get("environment_type"),
-                asset.get("function"),
-                asset.get("owner"),
-                asset.get("maintainer"),
-                asset.get("last_verified"),
-                1 if asset.get("in_cmms") else 0,
-                1 if asset.get("documented") else 0,
-                1 if asset.get("security_policy_applied") else 0,
-                asset.get("criticality"),
-                asset.get("notes"),
-                tags,
-            ),
-        )
+    # Lists are stored as JSON strings; json_each hands them through as-is
+    await db.execute(
+        _statement(_ASSETS_INSERT_SQL, if_not_exists),
+        {"assets": orjson.dumps(assets).decode(), "ts": ts},
+    )
 
 
-async def _seed_relationships(db: aiosqlite.Connection, relationships: list[dict[str, Any]]) -> None:
+async def _seed_relationships(
+    db: aiosqlite.Connection, relationships: list[dict[str, Any]], ts: str, if_not_exists: bool
+) -> None:
     """Seed relationship data."""
-    for rel in relationships:
-        rel_id = rel.get("id") or str(uuid.uuid4())
-        await db.execute(
-            """
-            INSERT OR IGNORE INTO relationships (
-                id, source_asset_id, target_asset_id, relationship_type,
-                inferred, verified, description
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+    await db.executemany(
+        _statement(_RELATIONSHIPS_INSERT_SQL, if_not_exists),
+        [
             (
-                rel_id,
+                rel.get("id") or f"seed-rel-{i}",  # Stable ids; no urandom per row
                 rel["source_asset_id"],
                 rel["target_asset_id"],
                 rel["relationship_type"],
                 1 if rel.get("inferred") else 0,
                 1 if rel.get("verified") else 0,
                 rel.get("description"),
-            ),
-        )
+                ts,
+            )
+            for i, rel in enumerate(relationships)
+        ],
+    )
 
 
 async def clear_all_data(db: aiosqlite.Connection) -> None:
     """Clear all data from the database (for testing)."""
-    tables = ["audit_log", "review_flags", "relationships", "assets",
+    # Deleting review_flags and relationships fires the triggers that maintain
+    # the count tables, so each of those is cleared after its source
+    tables = ["audit_log", "review_flags", "review_flag_counts", "relationships", "relationship_closure",
+              "asset_link_stats", "relationship_type_counts", "asset_protocols", "asset_tags", "assets",
               "compliance_frameworks", "process_areas", "sites", "environments"]
     for table in tables:
         await db.execute(f"DELETE FROM {table}")
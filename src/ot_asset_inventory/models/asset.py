@@ -1,12 +1,15 @@
 """Asset data model for OT Asset Inventory."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import date, datetime
 from typing import Any
-import json
 
+import orjson
 
-@dataclass
+from .rows import project
+
+
+@dataclass(slots=True)
 class Asset:
     """Represents an OT asset in the inventory."""
 
@@ -58,42 +61,37 @@ class Asset:
 
     @classmethod
     def from_row(cls, row: Any) -> "Asset":
-        """Create Asset from database row."""
-        data = dict(row)
-
-        # Parse JSON fields
-        if data.get("protocols"):
-            try:
-                data["protocols"] = json.loads(data["protocols"])
-            except (json.JSONDecodeError, TypeError):
-                data["protocols"] = []
-        else:
-            data["protocols"] = []
-
-        if data.get("tags"):
-            try:
-                data["tags"] = json.loads(data["tags"])
-            except (json.JSONDecodeError, TypeError):
-                data["tags"] = []
-        else:
-            data["tags"] = []
-
-        # Convert boolean fields
-        data["in_cmms"] = bool(data.get("in_cmms", False))
-        data["documented"] = bool(data.get("documented", False))
-        data["security_policy_applied"] = bool(data.get("security_policy_applied", False))
-
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """Create Asset from a database row (columns are matched by name)."""
+        v = project(cls, row)
+        return cls(
+            v[0], v[1], v[2],
+            v[3], v[4], v[5], v[6],
+            v[7], v[8], v[9], v[10], v[11],
+            v[12], v[13], v[14], parse_json_list(v[15]),
+            v[16], v[17],
+            v[18], v[19], v[20],
+            bool(v[21]), bool(v[22]), bool(v[23]),
+            v[24],
+            v[25], parse_json_list(v[26]), v[27], v[28],
+        )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert Asset to dictionary."""
-        result = {}
-        for field_name in self.__dataclass_fields__:
-            value = getattr(self, field_name)
-            if isinstance(value, (date, datetime)):
-                value = value.isoformat()
-            result[field_name] = value
-        return result
+        # Only the date-typed fields need an ISO conversion; rows loaded from
+        # SQLite carry them as strings already
+        return {
+            name: (
+                value.isoformat()
+                if name in _DATE_FIELDS and isinstance(value, date)
+                else value
+            )
+            for name in ASSET_COLUMNS
+            for value in (getattr(self, name),)
+        }
+
+    def to_json(self) -> bytes:
+        """Serialize the asset to JSON bytes (dates and datetimes as ISO 8601)."""
+        return orjson.dumps(self)
 
     def to_summary(self) -> dict[str, Any]:
         """Return a summary view of the asset."""
@@ -108,3 +106,23 @@ class Asset:
             "ip_address": self.ip_address,
             "owner": self.owner,
         }
+
+
+# Asset fields in declaration order (from_row matches table columns by name)
+ASSET_COLUMNS = tuple(f.name for f in fields(Asset))
+
+# Fields typed as date/datetime, the only ones to_dict() may need to convert
+_DATE_FIELDS = frozenset({"last_verified", "created_at", "updated_at"})
+
+# Stored value of an empty protocols/tags list; decoded without calling orjson
+_EMPTY_JSON = "[]"
+
+
+def parse_json_list(value: str | None) -> list[str]:
+    """Decode a JSON array column, treating NULL or malformed values as empty."""
+    if not value or value == _EMPTY_JSON:
+        return []
+    try:
+        return orjson.loads(value)
+    except (orjson.JSONDecodeError, TypeError):
+        return []
@@ -4,8 +4,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from .rows import project
 
-@dataclass
+
+@dataclass(slots=True)
 class Environment:
     """Represents a top-level environment (e.g., facility type)."""
 
@@ -18,9 +20,8 @@ class Environment:
 
     @classmethod
     def from_row(cls, row: Any) -> "Environment":
-        """Create Environment from database row."""
-        data = dict(row)
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """Create Environment from a database row (columns are matched by name)."""
+        return cls(*project(cls, row))
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -33,7 +34,7 @@ class Environment:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class Site:
     """Represents a physical site within an environment."""
 
@@ -46,9 +47,8 @@ class Site:
 
     @classmethod
     def from_row(cls, row: Any) -> "Site":
-        """Create Site from database row."""
-        data = dict(row)
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """Create Site from a database row (columns are matched by name)."""
+        return cls(*project(cls, row))
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -61,7 +61,7 @@ class Site:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessArea:
     """Represents a process area within a site."""
 
@@ -74,9 +74,8 @@ class ProcessArea:
 
     @classmethod
     def from_row(cls, row: Any) -> "ProcessArea":
-        """Create ProcessArea from database row."""
-        data = dict(row)
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """Create ProcessArea from a database row (columns are matched by name)."""
+        return cls(*project(cls, row))
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -4,8 +4,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from .rows import project
 
-@dataclass
+
+@dataclass(slots=True)
 class Relationship:
     """Represents a relationship between two assets."""
 
@@ -23,14 +25,9 @@ class Relationship:
 
     @classmethod
     def from_row(cls, row: Any) -> "Relationship":
-        """Create Relationship from database row."""
-        data = dict(row)
-
-        # Convert boolean fields
-        data["inferred"] = bool(data.get("inferred", False))
-        data["verified"] = bool(data.get("verified", False))
-
-        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        """Create Relationship from a database row (columns are matched by name)."""
+        v = project(cls, row)
+        return cls(v[0], v[1], v[2], v[3], bool(v[4]), bool(v[5]), v[6], v[7], v[8], v[9])
 
     def to_dict(self) -> dict[str, Any]:
         """Convert Relationship to dictionary."""
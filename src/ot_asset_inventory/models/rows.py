@@ -0,0 +1,24 @@
+"""Row decoding helpers shared by the data models."""
+
+from dataclasses import fields
+from typing import Any
+
+# Field positions per (model, column layout); a layout is the row's key tuple
+_INDEX_CACHE: dict[tuple[type, tuple[str, ...]], tuple[int | None, ...]] = {}
+
+
+def column_indexes(model: type, row: Any) -> tuple[int | None, ...]:
+    """Return the row position of each model field (None if absent), cached per layout."""
+    keys = tuple(row.keys())
+    cache_key = (model, keys)
+    indexes = _INDEX_CACHE.get(cache_key)
+    if indexes is None:
+        positions = {name: i for i, name in enumerate(keys)}
+        indexes = tuple(positions.get(f.name) for f in fields(model))
+        _INDEX_CACHE[cache_key] = indexes
+    return indexes
+
+
+def project(model: type, row: Any) -> list[Any]:
+    """Return row values in the model's field order; absent columns read as None."""
+    return [None if i is None else row[i] for i in column_indexes(model, row)]
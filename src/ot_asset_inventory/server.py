@@ -5,500 +5,845 @@ queries for audit readiness, gap analysis, and impact/risk assessment.
 """
 
 import asyncio
-import json
+import functools
+import logging
+import textwrap
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, fields
 from typing import Any
 
+import aiosqlite
+import orjson
+from jsonschema import Draft202012Validator, ValidationError
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
 from .config import get_config
 from .db.connection import DatabaseManager, set_db_manager
-from .db.schema import create_tables
+from .db.schema import create_indexes, create_tables
 from .db.seed import seed_sample_data
 
 # Import tool functions
 from .tools import assets, relationships, analysis, compliance, environment, review
+from .utils.graph import MAX_TRAVERSAL_DEPTH
 
 
+logger = logging.getLogger(__name__)
+
 # Create the MCP server
 server = Server("ot-asset-inventory")
 
+# Bounds how many tool calls run database work at once, so a burst of parallel
+# calls queues here instead of piling onto the connection's worker thread
+_db_semaphore = asyncio.Semaphore(get_config().db_concurrency)
 
-# Tool definitions
-TOOLS = [
-    # Priority 1: Core Asset Tools
-    Tool(
-        name="list_assets",
-        description="""List OT assets with optional filtering. Use this to find assets by type, location, criticality, or compliance status.
+
+# Tool definitions, built once (see _build_tools)
+@functools.cache
+def _build_tools() -> tuple[Tool, ...]:
+    """Build the tool definitions, with descriptions dedented and stripped."""
+    tools = [
+        # Priority 1: Core Asset Tools
+        Tool(
+            name="list_assets",
+            description="""List OT assets with optional filtering. Use this to find assets by type, location, criticality, or compliance status.
 
 Examples:
 - "What PLCs do we have?" -> list_assets(asset_type="PLC")
 - "Show critical assets in the cooling system" -> list_assets(process_area="Cooling System", criticality="critical")
 - "Which assets have compliance gaps?" -> list_assets(has_gaps=true)""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_type": {
-                    "type": "string",
-                    "description": "Filter by asset type (PLC, HMI, Sensor, Actuator, RTU, Gateway, Switch, Server)",
-                    "enum": ["PLC", "HMI", "Sensor", "Actuator", "RTU", "Gateway", "Switch", "Server", "Workstation"],
-                },
-                "process_area": {
-                    "type": "string",
-                    "description": "Filter by process area name or ID",
-                },
-                "site": {
-                    "type": "string",
-                    "description": "Filter by site name or ID",
-                },
-                "criticality": {
-                    "type": "string",
-                    "description": "Filter by criticality level",
-                    "enum": ["critical", "high", "medium", "low"],
-                },
-                "owner": {
-                    "type": "string",
-                    "description": "Filter by owner name",
-                },
-                "has_gaps": {
-                    "type": "boolean",
-                    "description": "Only return assets with compliance gaps (missing owner, CMMS, docs, or security policy)",
-                },
-                "limit": {
-                    "type": "integer",
-                    "description": "Maximum results to return (default 50, max 100)",
-                    "default": 50,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_type": {
+                        "type": "string",
+                        "description": "Filter by asset type (PLC, HMI, Sensor, Actuator, RTU, Gateway, Switch, Server)",
+                        "enum": ["PLC", "HMI", "Sensor", "Actuator", "RTU", "Gateway", "Switch", "Server", "Workstation"],
+                    },
+                    "process_area": {
+                        "type": "string",
+                        "description": "Filter by process area name or ID",
+                    },
+                    "site": {
+                        "type": "string",
+                        "description": "Filter by site name or ID",
+                    },
+                    "criticality": {
+                        "type": "string",
+                        "description": "Filter by criticality level",
+                        "enum": ["critical", "high", "medium", "low"],
+                    },
+                    "owner": {
+                        "type": "string",
+                        "description": "Filter by owner name",
+                    },
+                    "has_gaps": {
+                        "type": "boolean",
+                        "description": "Only return assets with compliance gaps (missing owner, CMMS, docs, or security policy)",
+                    },
+                    "protocol": {
+                        "type": "string",
+                        "description": "Filter by communication protocol (e.g. Modbus TCP, EtherNet/IP)",
+                    },
+                    "tag": {
+                        "type": "string",
+                        "description": "Filter by asset tag",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum results to return (default 50, max 100)",
+                        "default": 50,
+                    },
                 },
             },
-        },
-    ),
-    Tool(
-        name="get_asset",
-        description="""Get detailed information about a specific asset including its relationships, compliance status, and any open review flags.
+        ),
+        Tool(
+            name="get_asset",
+            description="""Get detailed information about a specific asset including its relationships, compliance status, and any open review flags.
 
 Example: get_asset(asset_id="PLC-101")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {
-                    "type": "string",
-                    "description": "The unique identifier of the asset (e.g., PLC-101)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {
+                        "type": "string",
+                        "description": "The unique identifier of the asset (e.g., PLC-101)",
+                    },
                 },
+                "required": ["asset_id"],
             },
-            "required": ["asset_id"],
-        },
-    ),
-    Tool(
-        name="search_assets",
-        description="""Search assets by text query across multiple fields (name, manufacturer, model, notes, function).
+        ),
+        Tool(
+            name="search_assets",
+            description="""Search assets by text query across multiple fields (name, manufacturer, model, notes, function).
 
 Example: "Find anything related to chiller" -> search_assets(query="chiller")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search text",
-                },
-                "limit": {
-                    "type": "integer",
-                    "description": "Maximum results (default 20)",
-                    "default": 20,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search text",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum results (default 20)",
+                        "default": 20,
+                    },
                 },
+                "required": ["query"],
             },
-            "required": ["query"],
-        },
-    ),
+        ),
 
-    # Priority 2: Relationship Tools
-    Tool(
-        name="get_upstream",
-        description="""Get all assets upstream of the specified asset - i.e., assets that feed data into it.
+        # Priority 2: Relationship Tools
+        Tool(
+            name="get_upstream",
+            description="""Get all assets upstream of the specified asset - i.e., assets that feed data into it.
 
 Example: "What feeds data to PLC-101?" -> get_upstream(asset_id="PLC-101")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {
-                    "type": "string",
-                    "description": "Starting asset ID",
-                },
-                "relationship_types": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Filter by relationship types (e.g., feeds_data_to, monitors)",
-                },
-                "max_depth": {
-                    "type": "integer",
-                    "description": "Maximum traversal depth (default 5)",
-                    "default": 5,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {
+                        "type": "string",
+                        "description": "Starting asset ID",
+                    },
+                    "relationship_types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Filter by relationship types (e.g., feeds_data_to, monitors)",
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Maximum traversal depth (default 5)",
+                        "default": 5,
+                        "maximum": MAX_TRAVERSAL_DEPTH,
+                    },
                 },
+                "required": ["asset_id"],
             },
-            "required": ["asset_id"],
-        },
-    ),
-    Tool(
-        name="get_downstream",
-        description="""Get all assets downstream of the specified asset - i.e., assets that it feeds data to or controls.
+        ),
+        Tool(
+            name="get_downstream",
+            description="""Get all assets downstream of the specified asset - i.e., assets that it feeds data to or controls.
 
 Example: "What does PLC-101 control?" -> get_downstream(asset_id="PLC-101")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {
-                    "type": "string",
-                    "description": "Starting asset ID",
-                },
-                "relationship_types": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Filter by relationship types (e.g., controls, feeds_data_to)",
-                },
-                "max_depth": {
-                    "type": "integer",
-                    "description": "Maximum traversal depth (default 5)",
-                    "default": 5,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {
+                        "type": "string",
+                        "description": "Starting asset ID",
+                    },
+                    "relationship_types": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Filter by relationship types (e.g., controls, feeds_data_to)",
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Maximum traversal depth (default 5)",
+                        "default": 5,
+                        "maximum": MAX_TRAVERSAL_DEPTH,
+                    },
                 },
+                "required": ["asset_id"],
             },
-            "required": ["asset_id"],
-        },
-    ),
-    Tool(
-        name="get_dependencies",
-        description="""Get complete dependency map for an asset - both what it depends on and what depends on it.
+        ),
+        Tool(
+            name="get_dependencies",
+            description="""Get complete dependency map for an asset - both what it depends on and what depends on it.
 
 Example: "Show all dependencies for PLC-101" -> get_dependencies(asset_id="PLC-101")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {
-                    "type": "string",
-                    "description": "Asset to analyze",
-                },
-                "max_depth": {
-                    "type": "integer",
-                    "description": "Maximum traversal depth",
-                    "default": 5,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {
+                        "type": "string",
+                        "description": "Asset to analyze",
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Maximum traversal depth",
+                        "default": 5,
+                        "maximum": MAX_TRAVERSAL_DEPTH,
+                    },
                 },
+                "required": ["asset_id"],
             },
-            "required": ["asset_id"],
-        },
-    ),
+        ),
 
-    # Priority 2: Impact Analysis Tools
-    Tool(
-        name="analyze_impact",
-        description="""Analyze the impact if an asset fails. Shows directly affected assets, cascade effects, affected process areas, and safety implications.
+        # Priority 2: Impact Analysis Tools
+        Tool(
+            name="analyze_impact",
+            description="""Analyze the impact if an asset fails. Shows directly affected assets, cascade effects, affected process areas, and safety implications.
 
 Example: "If PLC-101 goes down, what's affected?" -> analyze_impact(asset_id="PLC-101")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {
-                    "type": "string",
-                    "description": "Asset to analyze",
-                },
-                "failure_type": {
-                    "type": "string",
-                    "description": "Type of failure (complete, degraded, intermittent)",
-                    "enum": ["complete", "degraded", "intermittent"],
-                    "default": "complete",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {
+                        "type": "string",
+                        "description": "Asset to analyze",
+                    },
+                    "failure_type": {
+                        "type": "string",
+                        "description": "Type of failure (complete, degraded, intermittent)",
+                        "enum": ["complete", "degraded", "intermittent"],
+                        "default": "complete",
+                    },
                 },
+                "required": ["asset_id"],
             },
-            "required": ["asset_id"],
-        },
-    ),
-    Tool(
-        name="find_single_points_of_failure",
-        description="""Identify assets that are single points of failure - assets with no redundancy where failure would cause significant impact.
+        ),
+        Tool(
+            name="find_single_points_of_failure",
+            description="""Identify assets that are single points of failure - assets with no redundancy where failure would cause significant impact.
 
 Example: "What are our single points of failure?" -> find_single_points_of_failure()""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "process_area": {
-                    "type": "string",
-                    "description": "Limit to specific process area",
-                },
-                "criticality_threshold": {
-                    "type": "string",
-                    "description": "Minimum criticality to consider",
-                    "enum": ["critical", "high", "medium", "low"],
-                    "default": "high",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "process_area": {
+                        "type": "string",
+                        "description": "Limit to specific process area",
+                    },
+                    "criticality_threshold": {
+                        "type": "string",
+                        "description": "Minimum criticality to consider",
+                        "enum": ["critical", "high", "medium", "low"],
+                        "default": "high",
+                    },
                 },
             },
-        },
-    ),
+        ),
 
-    # Priority 3: Compliance Tools
-    Tool(
-        name="find_gaps",
-        description="""Find assets with compliance or documentation gaps (missing owner, not in CMMS, undocumented, no security policy, unverified).
+        # Priority 3: Compliance Tools
+        Tool(
+            name="find_gaps",
+            description="""Find assets with compliance or documentation gaps (missing owner, not in CMMS, undocumented, no security policy, unverified).
 
 Example: "What assets are missing documentation?" -> find_gaps(gap_types=["undocumented"])
 Example: "What critical assets don't have an owner?" -> find_gaps(gap_types=["no_owner"], criticality="critical")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "gap_types": {
-                    "type": "array",
-                    "items": {
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "gap_types": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["no_owner", "not_in_cmms", "undocumented", "no_security_policy", "unverified"],
+                        },
+                        "description": "Types of gaps to find (default: all)",
+                    },
+                    "process_area": {
                         "type": "string",
-                        "enum": ["no_owner", "not_in_cmms", "undocumented", "no_security_policy", "unverified"],
+                        "description": "Filter to specific process area",
+                    },
+                    "criticality": {
+                        "type": "string",
+                        "description": "Filter by criticality",
+                        "enum": ["critical", "high", "medium", "low"],
                     },
-                    "description": "Types of gaps to find (default: all)",
-                },
-                "process_area": {
-                    "type": "string",
-                    "description": "Filter to specific process area",
-                },
-                "criticality": {
-                    "type": "string",
-                    "description": "Filter by criticality",
-                    "enum": ["critical", "high", "medium", "low"],
                 },
             },
-        },
-    ),
-    Tool(
-        name="audit_summary",
-        description="""Generate audit readiness summary with compliance statistics, gap counts, and recommendations.
+        ),
+        Tool(
+            name="audit_summary",
+            description="""Generate audit readiness summary with compliance statistics, gap counts, and recommendations.
 
 Example: "What's our audit readiness?" -> audit_summary()""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "process_area": {
-                    "type": "string",
-                    "description": "Filter to specific process area",
-                },
-                "include_recommendations": {
-                    "type": "boolean",
-                    "description": "Include actionable recommendations",
-                    "default": True,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "process_area": {
+                        "type": "string",
+                        "description": "Filter to specific process area",
+                    },
+                    "include_recommendations": {
+                        "type": "boolean",
+                        "description": "Include actionable recommendations",
+                        "default": True,
+                    },
                 },
             },
-        },
-    ),
+        ),
 
-    # Priority 4: Environment Tools
-    Tool(
-        name="list_process_areas",
-        description="""List all process areas with asset counts and criticality breakdown.
+        # Priority 4: Environment Tools
+        Tool(
+            name="list_process_areas",
+            description="""List all process areas with asset counts and criticality breakdown.
 
 Example: "What process areas do we have?" -> list_process_areas()""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "site_id": {
-                    "type": "string",
-                    "description": "Filter to specific site",
-                },
-                "include_asset_counts": {
-                    "type": "boolean",
-                    "description": "Include asset counts",
-                    "default": True,
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "site_id": {
+                        "type": "string",
+                        "description": "Filter to specific site",
+                    },
+                    "include_asset_counts": {
+                        "type": "boolean",
+                        "description": "Include asset counts",
+                        "default": True,
+                    },
                 },
             },
-        },
-    ),
-    Tool(
-        name="get_process_area",
-        description="""Get detailed information about a specific process area including all its assets.
+        ),
+        Tool(
+            name="get_process_area",
+            description="""Get detailed information about a specific process area including all its assets.
 
 Example: "Tell me about the cooling system" -> get_process_area(process_area_id="pa-cooling-system")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "process_area_id": {
-                    "type": "string",
-                    "description": "Process area ID",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "process_area_id": {
+                        "type": "string",
+                        "description": "Process area ID",
+                    },
                 },
+                "required": ["process_area_id"],
             },
-            "required": ["process_area_id"],
-        },
-    ),
+        ),
 
-    # Priority 5: Review Tools
-    Tool(
-        name="suggest_relationship",
-        description="""Suggest a new relationship between assets for human review. Use when you infer a relationship that should be verified.
+        # Priority 5: Review Tools
+        Tool(
+            name="suggest_relationship",
+            description="""Suggest a new relationship between assets for human review. Use when you infer a relationship that should be verified.
 
 Example: suggest_relationship(source_asset_id="SENS-T103", target_asset_id="PLC-101", relationship_type="feeds_data_to", reasoning="Sensor appears to provide temperature data based on naming convention")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "source_asset_id": {"type": "string"},
-                "target_asset_id": {"type": "string"},
-                "relationship_type": {
-                    "type": "string",
-                    "enum": ["feeds_data_to", "controls", "monitors", "safety_interlock_for", "depends_on", "redundant_with"],
-                },
-                "reasoning": {
-                    "type": "string",
-                    "description": "Explanation for why this relationship is suggested",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source_asset_id": {"type": "string"},
+                    "target_asset_id": {"type": "string"},
+                    "relationship_type": {
+                        "type": "string",
+                        "enum": ["feeds_data_to", "controls", "monitors", "safety_interlock_for", "depends_on", "redundant_with"],
+                    },
+                    "reasoning": {
+                        "type": "string",
+                        "description": "Explanation for why this relationship is suggested",
+                    },
                 },
+                "required": ["source_asset_id", "target_asset_id", "relationship_type", "reasoning"],
             },
-            "required": ["source_asset_id", "target_asset_id", "relationship_type", "reasoning"],
-        },
-    ),
-    Tool(
-        name="flag_for_review",
-        description="""Flag an asset for human attention when you identify a potential issue.
+        ),
+        Tool(
+            name="flag_for_review",
+            description="""Flag an asset for human attention when you identify a potential issue.
 
 Example: flag_for_review(asset_id="PLC-301", flag_type="ownership_unknown", description="Critical asset without assigned owner", severity="high")""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "asset_id": {"type": "string"},
-                "flag_type": {
-                    "type": "string",
-                    "enum": ["missing_data", "needs_verification", "potential_issue", "compliance_gap", "ownership_unknown"],
-                },
-                "description": {"type": "string"},
-                "severity": {
-                    "type": "string",
-                    "enum": ["critical", "high", "medium", "low"],
-                    "default": "medium",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asset_id": {"type": "string"},
+                    "flag_type": {
+                        "type": "string",
+                        "enum": ["missing_data", "needs_verification", "potential_issue", "compliance_gap", "ownership_unknown"],
+                    },
+                    "description": {"type": "string"},
+                    "severity": {
+                        "type": "string",
+                        "enum": ["critical", "high", "medium", "low"],
+                        "default": "medium",
+                    },
                 },
+                "required": ["asset_id", "flag_type", "description"],
             },
-            "required": ["asset_id", "flag_type", "description"],
-        },
-    ),
-    Tool(
-        name="list_review_flags",
-        description="""List open review flags that need human attention.""",
-        inputSchema={
-            "type": "object",
-            "properties": {
-                "status": {
-                    "type": "string",
-                    "enum": ["open", "in_review", "resolved", "dismissed"],
-                    "default": "open",
-                },
-                "severity": {
-                    "type": "string",
-                    "enum": ["critical", "high", "medium", "low"],
+        ),
+        Tool(
+            name="list_review_flags",
+            description="""List open review flags that need human attention.""",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "status": {
+                        "type": "string",
+                        "enum": ["open", "in_review", "resolved", "dismissed"],
+                        "default": "open",
+                    },
+                    "severity": {
+                        "type": "string",
+                        "enum": ["critical", "high", "medium", "low"],
+                    },
                 },
             },
-        },
-    ),
-]
+        ),
+    ]
+    for tool in tools:
+        tool.description = textwrap.dedent(tool.description or "").strip()
+    return tuple(tools)
+
+
+TOOLS = _build_tools()
+
+
+# Argument validators compiled once per tool, rather than per call
+VALIDATORS: dict[str, Draft202012Validator] = {
+    tool.name: Draft202012Validator(tool.inputSchema) for tool in TOOLS
+}
 
 
 @server.list_tools()
-async def list_tools() -> list[Tool]:
-    """Return the list of available tools."""
+async def list_tools() -> tuple[Tool, ...]:
+    """Return the list of available tools (the same tuple on every request)."""
     return TOOLS
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls from Claude."""
+# Tool arguments, one dataclass per tool. Defaults mirror the inputSchema
+# defaults; required arguments have none.
+@dataclass(slots=True)
+class ListAssetsArgs:
+    asset_type: str | None = None
+    process_area: str | None = None
+    site: str | None = None
+    criticality: str | None = None
+    owner: str | None = None
+    has_gaps: bool | None = None
+    protocol: str | None = None
+    tag: str | None = None
+    limit: int = 50
+
+
+@dataclass(slots=True)
+class AssetIdArgs:
+    asset_id: str
+
+
+@dataclass(slots=True)
+class SearchAssetsArgs:
+    query: str
+    limit: int = 20
+
+
+@dataclass(slots=True)
+class TraversalArgs:
+    asset_id: str
+    relationship_types: list[str] | None = None
+    max_depth: int = 5
+
+
+@dataclass(slots=True)
+class DependenciesArgs:
+    asset_id: str
+    max_depth: int = 5
+
+
+@dataclass(slots=True)
+class AnalyzeImpactArgs:
+    asset_id: str
+    failure_type: str = "complete"
+
+
+@dataclass(slots=True)
+class FindSpofArgs:
+    process_area: str | None = None
+    criticality_threshold: str = "high"
+
+
+@dataclass(slots=True)
+class FindGapsArgs:
+    gap_types: list[str] | None = None
+    process_area: str | None = None
+    criticality: str | None = None
+
+
+@dataclass(slots=True)
+class AuditSummaryArgs:
+    process_area: str | None = None
+    include_recommendations: bool = True
+
+
+@dataclass(slots=True)
+class ListProcessAreasArgs:
+    site_id: str | None = None
+    include_asset_counts: bool = True
+
+
+@dataclass(slots=True)
+class ProcessAreaIdArgs:
+    process_area_id: str
+
+
+@dataclass(slots=True)
+class SuggestRelationshipArgs:
+    source_asset_id: str
+    target_asset_id: str
+    relationship_type: str
+    reasoning: str
+
+
+@dataclass(slots=True)
+class FlagForReviewArgs:
+    asset_id: str
+    flag_type: str
+    description: str
+    severity: str = "medium"
+
+
+@dataclass(slots=True)
+class ListReviewFlagsArgs:
+    status: str = "open"
+    severity: str | None = None
+
+
+# Tool dispatch table, built once at import: tool name -> (handler, arguments type)
+DISPATCH: dict[str, tuple[Callable[..., Awaitable[Any]], type]] = {
+    # Priority 1: Core Asset Tools
+    "list_assets": (assets.list_assets, ListAssetsArgs),
+    "get_asset": (assets.get_asset, AssetIdArgs),
+    "search_assets": (assets.search_assets, SearchAssetsArgs),
 
+    # Priority 2: Relationship Tools
+    "get_upstream": (relationships.get_upstream, TraversalArgs),
+    "get_downstream": (relationships.get_downstream, TraversalArgs),
+    "get_dependencies": (relationships.get_dependencies, DependenciesArgs),
+
+    # Priority 2: Impact Analysis Tools
+    "analyze_impact": (analysis.analyze_impact, AnalyzeImpactArgs),
+    "find_single_points_of_failure": (analysis.find_single_points_of_failure, FindSpofArgs),
+
+    # Priority 3: Compliance Tools
+    "find_gaps": (compliance.find_gaps, FindGapsArgs),
+    "audit_summary": (compliance.audit_summary, AuditSummaryArgs),
+
+    # Priority 4: Environment Tools
+    "list_process_areas": (environment.list_process_areas, ListProcessAreasArgs),
+    "get_process_area": (environment.get_process_area, ProcessAreaIdArgs),
+
+    # Priority 5: Review Tools
+    "suggest_relationship": (review.suggest_relationship, SuggestRelationshipArgs),
+    "flag_for_review": (review.flag_for_review, FlagForReviewArgs),
+    "list_review_flags": (review.list_review_flags, ListReviewFlagsArgs),
+}
+
+# Read-only graph tools whose results are memoized across calls. Entries are
+# keyed on the resolved arguments and dropped after any review-tool write, or
+# after the TTL for writes made outside this server
+MEMOIZED_TOOLS = frozenset({
+    "get_upstream",
+    "get_downstream",
+    "get_dependencies",
+    "analyze_impact",
+    "find_single_points_of_failure",
+})
+WRITE_TOOLS = frozenset({"suggest_relationship", "flag_for_review"})
+TRAVERSAL_CACHE_TTL = 60.0
+TRAVERSAL_CACHE_SIZE = 256
+
+_traversal_cache: dict[tuple[str, bytes], tuple[int, float, Any]] = {}
+# Per-key [lock, callers using it]; an entry is removed by its last user
+_traversal_locks: dict[tuple[str, bytes], list[Any]] = {}
+_write_epoch = 0
+
+
+def _cached_traversal(
+    key: tuple[str, bytes], cache: dict[tuple[str, bytes], tuple[int, float, Any]] = _traversal_cache
+) -> tuple[bool, Any]:
+    """Look up a memoized result that is still current."""
+    entry = cache.get(key)
+    if entry is None:
+        return False, None
+    epoch, stored_at, result = entry
+    if epoch != _write_epoch or time.monotonic() - stored_at > TRAVERSAL_CACHE_TTL:
+        return False, None
+    return True, result
+
+
+def _invalidate_traversals() -> None:
+    """Mark every memoized result stale after a write."""
+    global _write_epoch
+    _write_epoch += 1
+
+
+async def _memo(
+    name: str, kwargs: dict[str, Any], factory: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Return a memoized tool result, computing it at most once per key.
+
+    Args:
+        name: Tool name
+        kwargs: Resolved handler arguments (defaults applied)
+        factory: Produces the result on a cache miss
+
+    Returns:
+        The cached or freshly computed result
+    """
+    key = (name, orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS))
+    hit, result = _cached_traversal(key)
+    if hit:
+        return result
+
+    # One computation per key; concurrent callers wait and reuse it
+    entry = _traversal_locks.setdefault(key, [asyncio.Lock(), 0])
+    entry[1] += 1
     try:
-        result: Any = None
+        async with entry[0]:
+            hit, result = _cached_traversal(key)
+            if hit:
+                return result
+
+            epoch = _write_epoch
+            result = await factory()
+            _traversal_cache.pop(key, None)
+            _traversal_cache[key] = (epoch, time.monotonic(), result)
+            if len(_traversal_cache) > TRAVERSAL_CACHE_SIZE:
+                del _traversal_cache[next(iter(_traversal_cache))]
+            return result
+    finally:
+        # Only the last caller drops the entry, so nobody still queued on this
+        # lock sees a newcomer create a second one, and failures don't leak it
+        entry[1] -= 1
+        if not entry[1] and _traversal_locks.get(key) is entry:
+            del _traversal_locks[key]
+
+
+# Whole-inventory aggregates, cached as their already-serialized content blocks
+# so a repeat call skips both the database and JSON encoding. Same epoch/TTL
+# rules as the traversal memo
+AGGREGATE_TOOLS = frozenset({"audit_summary", "list_process_areas"})
+
+_aggregate_cache: dict[tuple[str, bytes], tuple[int, float, list[TextContent]]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """Everything call_tool needs for one tool, resolved once at import."""
+
+    handler: Callable[..., Awaitable[Any]]
+    args_type: type
+    arg_names: tuple[str, ...]
+    validator: Draft202012Validator
+    memoized: bool
+    aggregate: bool
+    writes: bool
+
+
+def _build_registry() -> dict[str, ToolSpec]:
+    """Join the tool definitions with their handlers and caching policy.
+
+    Raises:
+        RuntimeError: If a tool definition has no handler, or vice versa
+    """
+    defined = {tool.name for tool in TOOLS}
+    if defined != DISPATCH.keys():
+        raise RuntimeError(f"Tool definitions and handlers differ: {sorted(defined ^ DISPATCH.keys())}")
+
+    registry = {}
+    for name, (handler, args_type) in DISPATCH.items():
+        registry[name] = ToolSpec(
+            handler=handler,
+            args_type=args_type,
+            arg_names=tuple(f.name for f in fields(args_type)),
+            validator=VALIDATORS[name],
+            memoized=name in MEMOIZED_TOOLS,
+            aggregate=name in AGGREGATE_TOOLS,
+            writes=name in WRITE_TOOLS,
+        )
+    return registry
 
-        # Priority 1: Core Asset Tools
-        if name == "list_assets":
-            result = await assets.list_assets(
-                asset_type=arguments.get("asset_type"),
-                process_area=arguments.get("process_area"),
-                site=arguments.get("site"),
-                criticality=arguments.get("criticality"),
-                owner=arguments.get("owner"),
-                has_gaps=arguments.get("has_gaps"),
-                limit=arguments.get("limit", 50),
-            )
-        elif name == "get_asset":
-            result = await assets.get_asset(arguments["asset_id"])
-        elif name == "search_assets":
-            result = await assets.search_assets(
-                query=arguments["query"],
-                limit=arguments.get("limit", 20),
-            )
 
-        # Priority 2: Relationship Tools
-        elif name == "get_upstream":
-            result = await relationships.get_upstream(
-                asset_id=arguments["asset_id"],
-                relationship_types=arguments.get("relationship_types"),
-                max_depth=arguments.get("max_depth", 5),
-            )
-        elif name == "get_downstream":
-            result = await relationships.get_downstream(
-                asset_id=arguments["asset_id"],
-                relationship_types=arguments.get("relationship_types"),
-                max_depth=arguments.get("max_depth", 5),
-            )
-        elif name == "get_dependencies":
-            result = await relationships.get_dependencies(
-                asset_id=arguments["asset_id"],
-                max_depth=arguments.get("max_depth", 5),
-            )
+# Tool name -> ToolSpec; call_tool does a single lookup per request
+REGISTRY = _build_registry()
 
-        # Priority 2: Impact Analysis Tools
-        elif name == "analyze_impact":
-            result = await analysis.analyze_impact(
-                asset_id=arguments["asset_id"],
-                failure_type=arguments.get("failure_type", "complete"),
-            )
-        elif name == "find_single_points_of_failure":
-            result = await analysis.find_single_points_of_failure(
-                process_area=arguments.get("process_area"),
-                criticality_threshold=arguments.get("criticality_threshold", "high"),
-            )
 
-        # Priority 3: Compliance Tools
-        elif name == "find_gaps":
-            result = await compliance.find_gaps(
-                gap_types=arguments.get("gap_types"),
-                process_area=arguments.get("process_area"),
-                criticality=arguments.get("criticality"),
-            )
-        elif name == "audit_summary":
-            result = await compliance.audit_summary(
-                process_area=arguments.get("process_area"),
-                include_recommendations=arguments.get("include_recommendations", True),
-            )
+# Tool results are pretty-printed for readability in the client
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
-        # Priority 4: Environment Tools
-        elif name == "list_process_areas":
-            result = await environment.list_process_areas(
-                site_id=arguments.get("site_id"),
-                include_asset_counts=arguments.get("include_asset_counts", True),
-            )
-        elif name == "get_process_area":
-            result = await environment.get_process_area(arguments["process_area_id"])
 
-        # Priority 5: Review Tools
-        elif name == "suggest_relationship":
-            result = await review.suggest_relationship(
-                source_asset_id=arguments["source_asset_id"],
-                target_asset_id=arguments["target_asset_id"],
-                relationship_type=arguments["relationship_type"],
-                reasoning=arguments["reasoning"],
-            )
-        elif name == "flag_for_review":
-            result = await review.flag_for_review(
-                asset_id=arguments["asset_id"],
-                flag_type=arguments["flag_type"],
-                description=arguments["description"],
-                severity=arguments.get("severity", "medium"),
-            )
-        elif name == "list_review_flags":
-            result = await review.list_review_flags(
-                status=arguments.get("status", "open"),
-                severity=arguments.get("severity"),
-            )
+def _json_default(obj: Any) -> Any:
+    """Encode values orjson does not handle natively.
+
+    datetime, date, UUID, Enum and dataclass instances are serialized by
+    orjson itself; anything else falls back to its string form.
+    """
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Decimal, Path and the like: same fallback as the previous default=str
+    return str(obj)
+
+
+def _to_text(result: Any) -> str:
+    """Serialize a tool result to the JSON text returned to the client."""
+    return orjson.dumps(result, default=_json_default, option=_JSON_OPTIONS).decode()
+
+
+# List results longer than this are sent as a header block followed by one
+# compact JSON block per item (NDJSON-style) rather than one indented document
+STREAM_THRESHOLD = 20
+
+
+def _emit(result: Any) -> list[TextContent]:
+    """Build the content blocks for a tool result."""
+    if not isinstance(result, list) or len(result) <= STREAM_THRESHOLD:
+        return [TextContent(type="text", text=_to_text(result))]
+
+    header = {"count": len(result), "format": "ndjson", "items": "one JSON value per following block"}
+    blocks = [TextContent(type="text", text=orjson.dumps(header).decode())]
+    blocks.extend(
+        TextContent(
+            type="text",
+            text=orjson.dumps(item, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode(),
+        )
+        for item in result
+    )
+    return blocks
+
+
+def _error(message: str) -> list[TextContent]:
+    """Build the content block for an error response."""
+    return [TextContent(type="text", text=_to_text({"error": message}))]
+
+
+# Errors that mean the caller's arguments were bad: a schema violation, or
+# arguments the args dataclass will not take. Only argument handling is
+# covered; anything a handler raises is a server fault and gets logged
+_USER_ERRORS = (ValidationError, TypeError)
+
+
+# Arguments are checked against the precompiled VALIDATORS in call_tool, so the
+# SDK's per-call jsonschema.validate() is switched off
+@server.call_tool(validate_input=False)
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle tool calls from Claude."""
+
+    spec = REGISTRY.get(name)
+    if spec is None:
+        return _error(f"Unknown tool: {name}")
+
+    # Reject malformed arguments before any database work
+    names = spec.arg_names
+    try:
+        spec.validator.validate(arguments)
+        args = spec.args_type(**{key: arguments[key] for key in names if key in arguments})
+    except _USER_ERRORS as e:
+        message = e.message if isinstance(e, ValidationError) else str(e)
+        return _error(f"Invalid arguments for {name}: {message}")
+
+    try:
+        kwargs = {key: getattr(args, key) for key in names}
+        handler = spec.handler
+
+        async def run_handler() -> Any:
+            async with _db_semaphore:
+                return await handler(**kwargs)
+
+        if spec.aggregate:
+            key = (name, orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS))
+            hit, blocks = _cached_traversal(key, _aggregate_cache)
+            if hit:
+                return list(blocks)
+            epoch = _write_epoch
+            blocks = _emit(await run_handler())
+            _aggregate_cache.pop(key, None)
+            _aggregate_cache[key] = (epoch, time.monotonic(), blocks)
+            if len(_aggregate_cache) > TRAVERSAL_CACHE_SIZE:
+                del _aggregate_cache[next(iter(_aggregate_cache))]
+            return list(blocks)
+
+        # Memo hits return without taking a semaphore slot
+        if spec.memoized:
+            result = await _memo(name, kwargs, run_handler)
         else:
-            result = {"error": f"Unknown tool: {name}"}
+            result = await run_handler()
+
+        if spec.writes:
+            _invalidate_traversals()
 
-        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        return _emit(result)
 
     except Exception as e:
-        return [TextContent(type="text", text=json.dumps({"error": str(e)}, indent=2))]
+        logger.exception("Tool %s failed", name)
+        return _error(str(e))
+
+
+# Lookup shapes behind the relationship and review flag tools, each expected to
+# seek an index on its table. A full scan here means an index went missing or
+# the planner stopped choosing it; a unary + on a column in the tool's SQL is
+# the escape hatch if it picks a worse index instead
+_INDEXED_LOOKUPS = (
+    ("relationships", "SELECT id FROM relationships WHERE source_asset_id = ? AND relationship_type = ?", 2),
+    ("relationships", "SELECT id FROM relationships WHERE target_asset_id = ? AND relationship_type = ?", 2),
+    ("relationships", "SELECT id FROM relationships WHERE relationship_type = ?", 1),
+    ("review_flags", "SELECT id FROM review_flags WHERE status = ? ORDER BY flagged_at", 1),
+    ("review_flags", "SELECT id FROM review_flags WHERE asset_id = ? AND status = 'open'", 1),
+)
+
+
+async def _check_query_plans(connection: aiosqlite.Connection) -> None:
+    """Log a warning for each hot lookup the planner answers with a full table scan."""
+    for table, query, param_count in _INDEXED_LOOKUPS:
+        async with connection.execute(f"EXPLAIN QUERY PLAN {query}", [None] * param_count) as cursor:
+            details = [row[-1] for row in await cursor.fetchall()]
+        # SQLite before 3.36 reports "SCAN TABLE name", later versions "SCAN name"
+        scans = (f"SCAN {table}", f"SCAN TABLE {table}")
+        if any(detail.startswith(scans) for detail in details):
+            logger.warning("Query plan scans %s: %s -> %s", table, query, "; ".join(details))
+
+
+async def _warmup(connection: aiosqlite.Connection) -> None:
+    """Prepare the hottest queries before the first request arrives.
+
+    Gathers planner statistics for the freshly loaded tables and warns about
+    hot lookups that plan as full scans. It then runs the hot handlers once:
+    a one-row list_assets and a full find_gaps scan, plus the asset and
+    upstream/downstream lookups against an empty id that matches nothing. Their
+    statements land in the statement cache and the table pages in memory.
+    """
+    await connection.execute("ANALYZE")
+    await _check_query_plans(connection)
+    async with connection.execute("SELECT COUNT(*) FROM assets") as cursor:
+        await cursor.fetchone()
+
+    await assets.list_assets(limit=1)
+    await assets.get_asset("")
+    await relationships.get_upstream("")
+    await relationships.get_downstream("")
+    await compliance.find_gaps()
 
 
 async def main():
@@ -506,7 +851,7 @@ async def main():
     config = get_config()
 
     # Initialize database
-    db_manager = DatabaseManager(config.db_path)
+    db_manager = DatabaseManager(config.db_path, read_pool_size=config.read_pool_size)
     await db_manager.connect()
     set_db_manager(db_manager)
 
@@ -517,6 +862,12 @@ async def main():
     if config.seed_sample_data:
         await seed_sample_data(db_manager.connection)
 
+    # Index after seeding so the bulk load skips index maintenance
+    await create_indexes(db_manager.connection)
+
+    # Pay first-query parse and cold-cache costs before serving
+    await _warmup(db_manager.connection)
+
     # Run the server
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
@@ -526,5 +877,15 @@ async def main():
         )
 
 
+def run() -> None:
+    """Run the MCP server, on uvloop's event loop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -1,9 +1,24 @@
 """Impact analysis tools for OT Asset Inventory MCP Server."""
 
+import asyncio
+from collections import Counter, defaultdict, deque
 from typing import Any
 
-from ..db.connection import get_db
+import aiosqlite
+
+from ..db.connection import get_db, read_db
 from ..utils.graph import traverse_downstream, find_dependents, check_redundancy
+from ..utils.sql import placeholders
+
+
+# Criticality levels, most severe first
+CRITICALITY_LEVELS = ("critical", "high", "medium", "low")
+
+# Levels at or above each criticality threshold
+_THRESHOLD_LEVELS = {level: CRITICALITY_LEVELS[: i + 1] for i, level in enumerate(CRITICALITY_LEVELS)}
+
+# How many depends_on hops count towards an asset's dependents in SPOF analysis
+SPOF_DEPENDENT_DEPTH = 3
 
 
 async def analyze_impact(
@@ -38,7 +53,7 @@ async def analyze_impact(
     # Get the failing asset details
     async with db.execute(
         """
-        SELECT a.*, pa.name as process_area_name
+        SELECT a.id, a.name, a.type, a.criticality, a.function, pa.name as process_area_name
         FROM assets a
         LEFT JOIN process_areas pa ON a.process_area_id = pa.id
         WHERE a.id = ?
@@ -58,102 +73,57 @@ async def analyze_impact(
             "function": row["function"],
         }
 
-    # Find directly affected assets (immediate downstream)
-    async with db.execute(
-        """
-        SELECT a.id, a.name, a.type, a.criticality, a.process_area_id,
-               pa.name as process_area_name, r.relationship_type, r.description
-        FROM relationships r
-        JOIN assets a ON r.target_asset_id = a.id
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        WHERE r.source_asset_id = ?
-        """,
-        [asset_id],
-    ) as cursor:
-        rows = await cursor.fetchall()
-        directly_affected = [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "type": row["type"],
-                "criticality": row["criticality"],
-                "process_area": row["process_area_name"],
-                "impact_type": row["relationship_type"],
-                "description": row["description"],
-            }
-            for row in rows
-        ]
+    # The downstream, dependency and redundancy lookups are independent of
+    # each other, so run them concurrently
+    directly_affected, dependents, redundancy = await asyncio.gather(
+        _get_directly_affected(asset_id),
+        find_dependents(asset_id, max_depth=5),
+        check_redundancy(asset_id),
+    )
+
+    # Tally criticality, collect the affected set and the process areas already
+    # known from the failing and direct rows while building the cascade effects,
+    # rather than re-walking the combined list afterwards
+    criticality_counts: Counter[str | None] = Counter()
+    affected_ids = {asset_id}
+    process_areas: set[str] = set()
+    if failing_asset["process_area"] is not None:
+        process_areas.add(failing_asset["process_area"])
+    for affected in directly_affected:
+        criticality_counts[affected["criticality"]] += 1
+        affected_ids.add(affected["id"])
+        if affected["process_area"] is not None:
+            process_areas.add(affected["process_area"])
 
     # Find cascade effects through dependency chain
-    dependents = await find_dependents(asset_id, max_depth=5)
-    cascade_effects = [
-        {
+    cascade_effects = []
+    cascade_only_ids: set[str] = set()
+    for dep in dependents["dependents"]:
+        cascade_effects.append({
             "id": dep["id"],
             "name": dep["name"],
             "type": dep["type"],
             "criticality": dep["criticality"],
             "dependency_depth": dep["depth"],
             "dependency_path": " → ".join(dep["dependency_path"]),
-        }
-        for dep in dependents["dependents"]
-    ]
-
-    # Get process areas affected
-    affected_ids = {asset_id} | {a["id"] for a in directly_affected} | {a["id"] for a in cascade_effects}
-    process_areas: set[str] = set()
-
-    if affected_ids:
-        placeholders = ",".join("?" * len(affected_ids))
-        async with db.execute(
-            f"""
-            SELECT DISTINCT pa.name
-            FROM assets a
-            JOIN process_areas pa ON a.process_area_id = pa.id
-            WHERE a.id IN ({placeholders})
-            """,
-            list(affected_ids),
-        ) as cursor:
-            rows = await cursor.fetchall()
-            process_areas = {row["name"] for row in rows}
+        })
+        criticality_counts[dep["criticality"]] += 1
+        if dep["id"] not in affected_ids:
+            cascade_only_ids.add(dep["id"])
+    affected_ids |= cascade_only_ids
+
+    # Only cascade assets still need their process areas looked up; check
+    # alongside whether the failing asset or any affected asset has a safety role
+    if cascade_only_ids:
+        cascade_areas, safety_affected = await asyncio.gather(
+            _get_process_area_names(list(cascade_only_ids)),
+            _has_safety_interlock(list(affected_ids)),
+        )
+        process_areas |= cascade_areas
+    else:
+        safety_affected = await _has_safety_interlock(list(affected_ids))
 
-    # Check for safety implications
-    safety_affected = False
-    async with db.execute(
-        """
-        SELECT COUNT(*) as count
-        FROM relationships r
-        WHERE r.source_asset_id = ? AND r.relationship_type = 'safety_interlock_for'
-        """,
-        [asset_id],
-    ) as cursor:
-        row = await cursor.fetchone()
-        safety_affected = row["count"] > 0
-
-    # Also check if any affected asset has safety role
-    if not safety_affected and affected_ids:
-        placeholders = ",".join("?" * len(affected_ids))
-        async with db.execute(
-            f"""
-            SELECT COUNT(*) as count FROM relationships
-            WHERE source_asset_id IN ({placeholders})
-            AND relationship_type = 'safety_interlock_for'
-            """,
-            list(affected_ids),
-        ) as cursor:
-            row = await cursor.fetchone()
-            safety_affected = row["count"] > 0
-
-    # Check redundancy
-    redundancy = await check_redundancy(asset_id)
-
-    # Summarize criticality
-    all_affected = directly_affected + cascade_effects
-    criticality_summary = {
-        "critical": len([a for a in all_affected if a.get("criticality") == "critical"]),
-        "high": len([a for a in all_affected if a.get("criticality") == "high"]),
-        "medium": len([a for a in all_affected if a.get("criticality") == "medium"]),
-        "low": len([a for a in all_affected if a.get("criticality") == "low"]),
-    }
+    criticality_summary = {level: criticality_counts[level] for level in CRITICALITY_LEVELS}
 
     # Generate recommendations
     recommendations = []
@@ -175,7 +145,7 @@ async def analyze_impact(
         "directly_affected_count": len(directly_affected),
         "cascade_effects": cascade_effects,
         "cascade_count": len(cascade_effects),
-        "total_affected": len(all_affected),
+        "total_affected": len(directly_affected) + len(cascade_effects),
         "affected_process_areas": list(process_areas),
         "criticality_summary": criticality_summary,
         "safety_implications": safety_affected,
@@ -185,6 +155,63 @@ async def analyze_impact(
     }
 
 
+async def _get_directly_affected(asset_id: str) -> list[dict[str, Any]]:
+    """Get the assets immediately downstream of an asset, with the link type."""
+    async with read_db() as db, db.execute(
+        """
+        SELECT a.id, a.name, a.type, a.criticality, a.process_area_id,
+               pa.name as process_area_name, r.relationship_type, r.description
+        FROM relationships r
+        JOIN assets a ON r.target_asset_id = a.id
+        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+        WHERE r.source_asset_id = ?
+        """,
+        [asset_id],
+    ) as cursor:
+        rows = await cursor.fetchall()
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "type": row["type"],
+                "criticality": row["criticality"],
+                "process_area": row["process_area_name"],
+                "impact_type": row["relationship_type"],
+                "description": row["description"],
+            }
+            for row in rows
+        ]
+
+
+async def _get_process_area_names(asset_ids: list[str]) -> set[str]:
+    """Get the names of the process areas the given assets belong to."""
+    async with read_db() as db, db.execute(
+        f"""
+        SELECT DISTINCT pa.name
+        FROM assets a
+        JOIN process_areas pa ON a.process_area_id = pa.id
+        WHERE a.id IN ({placeholders(len(asset_ids))})
+        """,
+        asset_ids,
+    ) as cursor:
+        rows = await cursor.fetchall()
+        return {row["name"] for row in rows}
+
+
+async def _has_safety_interlock(asset_ids: list[str]) -> bool:
+    """Check whether any of the given assets is a safety interlock for another."""
+    async with read_db() as db, db.execute(
+        f"""
+        SELECT 1 FROM relationships
+        WHERE source_asset_id IN ({placeholders(len(asset_ids))})
+        AND relationship_type = 'safety_interlock_for'
+        LIMIT 1
+        """,
+        asset_ids,
+    ) as cursor:
+        return await cursor.fetchone() is not None
+
+
 async def find_single_points_of_failure(
     process_area: str | None = None,
     criticality_threshold: str = "high",
@@ -204,21 +231,36 @@ async def find_single_points_of_failure(
     Returns:
         List of SPOFs with impact assessment, sorted by risk level
     """
-    db = await get_db()
+    included_levels = _THRESHOLD_LEVELS.get(criticality_threshold, _THRESHOLD_LEVELS["high"])
 
-    criticality_levels = ["critical", "high", "medium", "low"]
-    threshold_index = criticality_levels.index(criticality_threshold) if criticality_threshold in criticality_levels else 1
-    included_levels = criticality_levels[: threshold_index + 1]
-
-    # Build query for assets at or above threshold
+    # Build query for assets at or above threshold. Dependents (assets that
+    # depend_on this one within SPOF_DEPENDENT_DEPTH hops) come from the
+    # trigger-maintained relationship_closure table, and redundancy and direct
+    # downstream link counts from asset_link_stats, so the SPOF test itself is
+    # a filter over precomputed rows
     query = """
         SELECT a.id, a.name, a.type, a.criticality, a.process_area_id,
-               pa.name as process_area_name
+               pa.name as process_area_name,
+               COALESCE(dep.dependent_count, 0) as dependent_count,
+               COALESCE(dep.critical_dependents, 0) as critical_dependents,
+               COALESCE(s.downstream_count, 0) as downstream_count
         FROM assets a
         LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+        LEFT JOIN asset_link_stats s ON s.asset_id = a.id
+        LEFT JOIN (
+            SELECT c.descendant as asset_id,
+                   COUNT(*) as dependent_count,
+                   SUM(d.criticality = 'critical') as critical_dependents
+            FROM relationship_closure c
+            JOIN assets d ON d.id = c.ancestor
+            WHERE c.relationship_type = 'depends_on' AND c.depth <= ?
+            GROUP BY c.descendant
+        ) dep ON dep.asset_id = a.id
         WHERE a.criticality IN ({})
-    """.format(",".join("?" * len(included_levels)))
-    params: list[Any] = list(included_levels)
+        AND COALESCE(s.redundancy_count, 0) = 0
+        AND (COALESCE(dep.dependent_count, 0) > 0 OR COALESCE(s.downstream_count, 0) > 2)
+    """.format(placeholders(len(included_levels)))
+    params: list[Any] = [SPOF_DEPENDENT_DEPTH, *included_levels]
 
     if process_area:
         query += " AND (a.process_area_id = ? OR pa.name LIKE ?)"
@@ -226,55 +268,35 @@ async def find_single_points_of_failure(
 
     spofs = []
 
-    async with db.execute(query, params) as cursor:
+    async with read_db() as db, db.execute(query, params) as cursor:
         rows = await cursor.fetchall()
 
         for row in rows:
-            asset_id = row["id"]
-
-            # Check redundancy
-            redundancy = await check_redundancy(asset_id)
-            if redundancy["has_redundancy"]:
-                continue  # Has redundancy, not a SPOF
-
-            # Find assets that depend on this one
-            dependents = await find_dependents(asset_id, max_depth=3)
-            dependent_count = len(dependents["dependents"])
-
-            # Count direct downstream relationships
-            async with db.execute(
-                "SELECT COUNT(*) as count FROM relationships WHERE source_asset_id = ?",
-                [asset_id],
-            ) as rel_cursor:
-                rel_row = await rel_cursor.fetchone()
-                downstream_count = rel_row["count"]
-
-            # Count critical dependents
-            critical_dependents = len([d for d in dependents["dependents"] if d.get("criticality") == "critical"])
-
-            # Determine if this is a SPOF (dependent count > 0 or multiple downstream)
-            if dependent_count > 0 or downstream_count > 2:
-                # Calculate risk score
-                risk_score = _calculate_spof_risk(
-                    asset_criticality=row["criticality"],
-                    dependent_count=dependent_count,
-                    critical_dependents=critical_dependents,
-                    downstream_count=downstream_count,
-                )
-
-                spofs.append({
-                    "id": row["id"],
-                    "name": row["name"],
-                    "type": row["type"],
-                    "criticality": row["criticality"],
-                    "process_area": row["process_area_name"],
-                    "dependent_count": dependent_count,
-                    "critical_dependents": critical_dependents,
-                    "downstream_count": downstream_count,
-                    "risk_score": risk_score,
-                    "risk_level": _risk_level(risk_score),
-                    "recommendation": _spof_recommendation(row, dependent_count, critical_dependents),
-                })
+            dependent_count = row["dependent_count"]
+            critical_dependents = row["critical_dependents"]
+            downstream_count = row["downstream_count"]
+
+            # Calculate risk score
+            risk_score = _calculate_spof_risk(
+                asset_criticality=row["criticality"],
+                dependent_count=dependent_count,
+                critical_dependents=critical_dependents,
+                downstream_count=downstream_count,
+            )
+
+            spofs.append({
+                "id": row["id"],
+                "name": row["name"],
+                "type": row["type"],
+                "criticality": row["criticality"],
+                "process_area": row["process_area_name"],
+                "dependent_count": dependent_count,
+                "critical_dependents": critical_dependents,
+                "downstream_count": downstream_count,
+                "risk_score": risk_score,
+                "risk_level": _risk_level(risk_score),
+                "recommendation": _spof_recommendation(row, dependent_count, critical_dependents),
+            })
 
     # Sort by risk score descending
     spofs.sort(key=lambda x: x["risk_score"], reverse=True)
@@ -297,73 +319,39 @@ async def get_critical_path(
         Path information including all assets and relationships in the path
     """
     db = await get_db()
-    from collections import deque
 
-    # BFS to find shortest path
-    visited: set[str] = set()
-    queue: deque[tuple[str, list[str]]] = deque([(source_asset_id, [source_asset_id])])
+    # Load the link graph once and search it in memory (links are walked in
+    # either direction), rather than querying the neighbours of every visited node.
+    # Edges are unpacked positionally, so fetch plain tuples instead of Rows
+    neighbours: defaultdict[str, set[str]] = defaultdict(set)
+    async with db.execute("SELECT source_asset_id, target_asset_id FROM relationships") as cursor:
+        cursor.row_factory = None
+        for source_id, target_id in await cursor.fetchall():
+            neighbours[source_id].add(target_id)
+            neighbours[target_id].add(source_id)
+
+    # BFS to find shortest path; ties go to the lowest neighbour ID
+    parents: dict[str, str | None] = {source_asset_id: None}
+    queue: deque[str] = deque([source_asset_id])
 
     while queue:
-        current_id, path = queue.popleft()
+        current_id = queue.popleft()
 
         if current_id == target_asset_id:
-            # Found the path - get details
-            path_details = []
-            for i, asset_id in enumerate(path):
-                async with db.execute(
-                    "SELECT id, name, type, criticality FROM assets WHERE id = ?",
-                    [asset_id],
-                ) as cursor:
-                    row = await cursor.fetchone()
-                    if row:
-                        asset_detail = {
-                            "id": row["id"],
-                            "name": row["name"],
-                            "type": row["type"],
-                            "criticality": row["criticality"],
-                            "position": i,
-                        }
-                        # Get relationship to next asset if not last
-                        if i < len(path) - 1:
-                            next_id = path[i + 1]
-                            async with db.execute(
-                                """
-                                SELECT relationship_type, description
-                                FROM relationships
-                                WHERE source_asset_id = ? AND target_asset_id = ?
-                                """,
-                                [asset_id, next_id],
-                            ) as rel_cursor:
-                                rel_row = await rel_cursor.fetchone()
-                                if rel_row:
-                                    asset_detail["relationship_to_next"] = rel_row["relationship_type"]
-
-                        path_details.append(asset_detail)
-
+            path = [current_id]
+            while (parent := parents[path[-1]]) is not None:
+                path.append(parent)
+            path.reverse()
             return {
                 "found": True,
                 "path_length": len(path),
-                "path": path_details,
+                "path": await _path_details(db, path),
             }
 
-        if current_id in visited:
-            continue
-        visited.add(current_id)
-
-        # Get all connected assets
-        async with db.execute(
-            """
-            SELECT target_asset_id as next_id FROM relationships WHERE source_asset_id = ?
-            UNION
-            SELECT source_asset_id as next_id FROM relationships WHERE target_asset_id = ?
-            """,
-            [current_id, current_id],
-        ) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                next_id = row["next_id"]
-                if next_id not in visited:
-                    queue.append((next_id, path + [next_id]))
+        for next_id in sorted(neighbours.get(current_id, ())):
+            if next_id not in parents:
+                parents[next_id] = current_id
+                queue.append(next_id)
 
     return {
         "found": False,
@@ -371,6 +359,63 @@ async def get_critical_path(
     }
 
 
+async def _path_details(db: aiosqlite.Connection, path: list[str]) -> list[dict[str, Any]]:
+    """Describe each hop of a path, fetching all assets and links in two queries.
+
+    Args:
+        db: Database connection
+        path: Asset IDs from source to target
+
+    Returns:
+        One entry per asset that still exists, with its position in the path and
+        the relationship type leading to the next asset (when that link runs
+        forward along the path)
+    """
+    async with db.execute(
+        f"SELECT id, name, type, criticality FROM assets WHERE id IN ({placeholders(len(path))})",
+        path,
+    ) as cursor:
+        assets_by_id = {row["id"]: row for row in await cursor.fetchall()}
+
+    # First relationship type per forward hop (alphabetical, as the index scan yields)
+    link_types: dict[tuple[str, str], str] = {}
+    hops = list(zip(path, path[1:]))
+    if hops:
+        values = ",".join("(?, ?)" for _ in hops)
+        async with db.execute(
+            f"""
+            SELECT source_asset_id, target_asset_id, relationship_type
+            FROM relationships
+            WHERE (source_asset_id, target_asset_id) IN (VALUES {values})
+            ORDER BY relationship_type
+            """,
+            [asset_id for hop in hops for asset_id in hop],
+        ) as cursor:
+            for row in await cursor.fetchall():
+                link_types.setdefault(
+                    (row["source_asset_id"], row["target_asset_id"]), row["relationship_type"]
+                )
+
+    path_details = []
+    for i, asset_id in enumerate(path):
+        row = assets_by_id.get(asset_id)
+        if row is None:
+            continue
+        asset_detail = {
+            "id": row["id"],
+            "name": row["name"],
+            "type": row["type"],
+            "criticality": row["criticality"],
+            "position": i,
+        }
+        if i < len(path) - 1:
+            link_type = link_types.get((asset_id, path[i + 1]))
+            if link_type is not None:
+                asset_detail["relationship_to_next"] = link_type
+        path_details.append(asset_detail)
+    return path_details
+
+
 def _calculate_spof_risk(
     asset_criticality: str | None,
     dependent_count: int,
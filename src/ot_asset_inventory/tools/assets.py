@@ -1,11 +1,58 @@
 """Asset query tools for OT Asset Inventory MCP Server."""
 
-import json
+import asyncio
+import functools
+from collections.abc import Callable
 from typing import Any
 
 import aiosqlite
 
-from ..db.connection import get_db
+from ..db.connection import get_db, read_db
+from ..models.asset import parse_json_list
+
+
+_LIST_ASSETS_SQL = """
+    SELECT a.*, pa.name as process_area_name, s.name as site_name
+    FROM assets a
+    LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+    LEFT JOIN sites s ON a.site_id = s.id
+    WHERE 1=1{conditions}
+    ORDER BY a.criticality DESC, a.name LIMIT ?
+"""
+
+# Columns search_assets may match against; all are indexed by assets_fts
+_SEARCH_FIELDS = ("name", "manufacturer", "model", "notes", "function", "id", "owner", "ip_address")
+
+# Full-text search ranked by BM25, with name matches weighted well above the
+# other columns. Weights follow the assets_fts column order
+_SEARCH_ASSETS_SQL = """
+    SELECT a.*, pa.name as process_area_name, s.name as site_name
+    FROM assets_fts
+    JOIN assets a ON a.rowid = assets_fts.rowid
+    LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+    LEFT JOIN sites s ON a.site_id = s.id
+    WHERE assets_fts MATCH ?
+    ORDER BY bm25(assets_fts, 1.0, 10.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0), a.criticality DESC, a.name
+    LIMIT ?
+"""
+
+# list_assets filters in clause order: (argument, SQL condition, bound values).
+# The has_gaps condition matches the partial index idx_assets_gaps; keep the two
+# in step
+_LIST_ASSETS_FILTERS: tuple[tuple[str, str, Callable[[Any], list[Any]]], ...] = (
+    ("asset_type", "a.type = ?", lambda v: [v]),
+    ("process_area", "(a.process_area_id = ? OR pa.name LIKE ?)", lambda v: [v, f"%{v}%"]),
+    ("site", "(a.site_id = ? OR s.name LIKE ?)", lambda v: [v, f"%{v}%"]),
+    ("criticality", "a.criticality = ?", lambda v: [v]),
+    ("owner", "a.owner LIKE ?", lambda v: [f"%{v}%"]),
+    (
+        "has_gaps",
+        "(a.owner IS NULL OR NOT a.in_cmms OR NOT a.documented OR NOT a.security_policy_applied)",
+        lambda v: [],
+    ),
+    ("protocol", "a.id IN (SELECT asset_id FROM asset_protocols WHERE protocol = ?)", lambda v: [v]),
+    ("tag", "a.id IN (SELECT asset_id FROM asset_tags WHERE tag = ?)", lambda v: [v]),
+)
 
 
 async def list_assets(
@@ -15,6 +62,8 @@ async def list_assets(
     criticality: str | None = None,
     owner: str | None = None,
     has_gaps: bool | None = None,
+    protocol: str | None = None,
+    tag: str | None = None,
     limit: int = 50,
 ) -> list[dict[str, Any]]:
     """
@@ -27,6 +76,8 @@ async def list_assets(
         criticality: Filter by criticality level (critical, high, medium, low)
         owner: Filter by owner name
         has_gaps: If True, only return assets with compliance gaps
+        protocol: Filter by communication protocol (exact match, e.g. "Modbus TCP")
+        tag: Filter by tag (exact match)
         limit: Maximum results to return (default 50, max 100)
 
     Returns:
@@ -34,43 +85,37 @@ async def list_assets(
     """
     db = await get_db()
 
-    query = """
-        SELECT a.*, pa.name as process_area_name, s.name as site_name
-        FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        LEFT JOIN sites s ON a.site_id = s.id
-        WHERE 1=1
-    """
-    params: list[Any] = []
-
-    if asset_type:
-        query += " AND a.type = ?"
-        params.append(asset_type)
-
-    if process_area:
-        query += " AND (a.process_area_id = ? OR pa.name LIKE ?)"
-        params.extend([process_area, f"%{process_area}%"])
-
-    if site:
-        query += " AND (a.site_id = ? OR s.name LIKE ?)"
-        params.extend([site, f"%{site}%"])
+    filters = {
+        "asset_type": asset_type,
+        "process_area": process_area,
+        "site": site,
+        "criticality": criticality,
+        "owner": owner,
+        "has_gaps": has_gaps,
+        "protocol": protocol,
+        "tag": tag,
+    }
+    active = frozenset(name for name, value in filters.items() if value)
 
-    if criticality:
-        query += " AND a.criticality = ?"
-        params.append(criticality)
+    params: list[Any] = []
+    for name, _, bind in _LIST_ASSETS_FILTERS:
+        if name in active:
+            params.extend(bind(filters[name]))
+    params.append(min(limit, 100))
 
-    if owner:
-        query += " AND a.owner LIKE ?"
-        params.append(f"%{owner}%")
+    async with db.execute(_list_assets_query(active), params) as cursor:
+        return _rows_to_asset_dicts(await cursor.fetchall())
 
-    if has_gaps:
-        query += " AND (a.owner IS NULL OR NOT a.in_cmms OR NOT a.documented OR NOT a.security_policy_applied)"
 
-    query += f" ORDER BY a.criticality DESC, a.name LIMIT {min(limit, 100)}"
-
-    async with db.execute(query, params) as cursor:
-        rows = await cursor.fetchall()
-        return [_row_to_asset_dict(row) for row in rows]
+# Built once per combination of active filters, so repeat calls with the same
+# filter shape reuse one SQL string (and SQLite's cached statement)
+@functools.cache
+def _list_assets_query(active: frozenset[str]) -> str:
+    """Return the list_assets SQL for a set of active filters."""
+    conditions = "".join(
+        f" AND {clause}" for name, clause, _ in _LIST_ASSETS_FILTERS if name in active
+    )
+    return _LIST_ASSETS_SQL.format(conditions=conditions)
 
 
 async def get_asset(asset_id: str) -> dict[str, Any] | None:
@@ -103,10 +148,41 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
 
         asset = _row_to_asset_dict(row)
 
-    # Get relationships where this asset is the source
-    async with db.execute(
+    # Relationships in both directions and open flags are independent of
+    # each other, so fetch them concurrently
+    outgoing, incoming, open_flags = await asyncio.gather(
+        _get_outgoing_relationships(asset_id),
+        _get_incoming_relationships(asset_id),
+        _get_open_flags(asset_id),
+    )
+    asset["outgoing_relationships"] = outgoing
+    asset["incoming_relationships"] = incoming
+    asset["open_flags"] = open_flags
+
+    # Add compliance summary
+    asset["compliance_summary"] = {
+        "has_owner": asset["owner"] is not None,
+        "in_cmms": asset["in_cmms"],
+        "documented": asset["documented"],
+        "security_policy_applied": asset["security_policy_applied"],
+        "verified": asset["last_verified"] is not None,
+        "gap_count": sum([
+            asset["owner"] is None,
+            not asset["in_cmms"],
+            not asset["documented"],
+            not asset["security_policy_applied"],
+        ]),
+    }
+
+    return asset
+
+
+async def _get_outgoing_relationships(asset_id: str) -> list[dict[str, Any]]:
+    """Get relationships where the asset is the source."""
+    async with read_db() as db, db.execute(
         """
-        SELECT r.*, a.name as target_name, a.type as target_type
+        SELECT r.id, r.target_asset_id, r.relationship_type, r.verified, r.inferred,
+               r.description, a.name as target_name, a.type as target_type
         FROM relationships r
         JOIN assets a ON r.target_asset_id = a.id
         WHERE r.source_asset_id = ?
@@ -114,7 +190,7 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
         [asset_id],
     ) as cursor:
         rows = await cursor.fetchall()
-        asset["outgoing_relationships"] = [
+        return [
             {
                 "id": row["id"],
                 "target_id": row["target_asset_id"],
@@ -128,10 +204,13 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
             for row in rows
         ]
 
-    # Get relationships where this asset is the target
-    async with db.execute(
+
+async def _get_incoming_relationships(asset_id: str) -> list[dict[str, Any]]:
+    """Get relationships where the asset is the target."""
+    async with read_db() as db, db.execute(
         """
-        SELECT r.*, a.name as source_name, a.type as source_type
+        SELECT r.id, r.source_asset_id, r.relationship_type, r.verified, r.inferred,
+               r.description, a.name as source_name, a.type as source_type
         FROM relationships r
         JOIN assets a ON r.source_asset_id = a.id
         WHERE r.target_asset_id = ?
@@ -139,7 +218,7 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
         [asset_id],
     ) as cursor:
         rows = await cursor.fetchall()
-        asset["incoming_relationships"] = [
+        return [
             {
                 "id": row["id"],
                 "source_id": row["source_asset_id"],
@@ -153,16 +232,18 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
             for row in rows
         ]
 
-    # Get any review flags for this asset
-    async with db.execute(
+
+async def _get_open_flags(asset_id: str) -> list[dict[str, Any]]:
+    """Get the open review flags raised against the asset."""
+    async with read_db() as db, db.execute(
         """
-        SELECT * FROM review_flags
+        SELECT id, flag_type, description, severity FROM review_flags
         WHERE asset_id = ? AND status = 'open'
         """,
         [asset_id],
     ) as cursor:
         rows = await cursor.fetchall()
-        asset["open_flags"] = [
+        return [
             {
                 "id": row["id"],
                 "flag_type": row["flag_type"],
@@ -172,23 +253,6 @@ async def get_asset(asset_id: str) -> dict[str, Any] | None:
             for row in rows
         ]
 
-    # Add compliance summary
-    asset["compliance_summary"] = {
-        "has_owner": asset["owner"] is not None,
-        "in_cmms": asset["in_cmms"],
-        "documented": asset["documented"],
-        "security_policy_applied": asset["security_policy_applied"],
-        "verified": asset["last_verified"] is not None,
-        "gap_count": sum([
-            asset["owner"] is None,
-            not asset["in_cmms"],
-            not asset["documented"],
-            not asset["security_policy_applied"],
-        ]),
-    }
-
-    return asset
-
 
 async def search_assets(
     query: str,
@@ -212,18 +276,28 @@ async def search_assets(
     if fields is None:
         fields = ["name", "manufacturer", "model", "notes", "function", "id"]
 
-    # Build search conditions
-    conditions = []
-    params: list[Any] = []
-    search_term = f"%{query}%"
+    columns = [field for field in fields if field in _SEARCH_FIELDS]
+    if not columns:
+        return []
 
-    for field in fields:
-        if field in ["name", "manufacturer", "model", "notes", "function", "id", "owner", "ip_address"]:
-            conditions.append(f"a.{field} LIKE ?")
-            params.append(search_term)
+    # The trigram index only matches terms of three or more characters
+    if len(query) < 3:
+        return await _search_assets_like(db, query, columns, limit)
 
-    if not conditions:
-        return []
+    # Column-filtered phrase query; double quotes inside the phrase are doubled
+    phrase = query.replace('"', '""')
+    match = f'{{{" ".join(columns)}}} : "{phrase}"'
+
+    async with db.execute(_SEARCH_ASSETS_SQL, [match, min(limit, 50)]) as cursor:
+        return _rows_to_asset_dicts(await cursor.fetchall())
+
+
+async def _search_assets_like(
+    db: aiosqlite.Connection, query: str, columns: list[str], limit: int
+) -> list[dict[str, Any]]:
+    """Scan-based substring search for terms too short for the trigram index."""
+    search_term = f"%{query}%"
+    conditions = [f"a.{column} LIKE ?" for column in columns]
 
     sql = f"""
         SELECT a.*, pa.name as process_area_name, s.name as site_name
@@ -235,13 +309,12 @@ async def search_assets(
             CASE WHEN a.name LIKE ? THEN 0 ELSE 1 END,
             a.criticality DESC,
             a.name
-        LIMIT {min(limit, 50)}
+        LIMIT ?
     """
-    params.append(search_term)  # For ORDER BY
+    params = [search_term] * (len(conditions) + 1) + [min(limit, 50)]
 
     async with db.execute(sql, params) as cursor:
-        rows = await cursor.fetchall()
-        return [_row_to_asset_dict(row) for row in rows]
+        return _rows_to_asset_dicts(await cursor.fetchall())
 
 
 async def get_asset_count_by_type() -> dict[str, int]:
@@ -286,22 +359,40 @@ async def get_asset_count_by_criticality() -> dict[str, int]:
         return {row["criticality"]: row["count"] for row in rows}
 
 
+# Columns decoded from JSON, and columns coerced to bool, in asset rows
+_JSON_LIST_FIELDS = ("protocols", "tags")
+_BOOL_FIELDS = ("in_cmms", "documented", "security_policy_applied")
+
+
 def _row_to_asset_dict(row: aiosqlite.Row) -> dict[str, Any]:
     """Convert database row to asset dictionary."""
-    data = dict(row)
-
-    # Parse JSON fields
-    for field in ["protocols", "tags"]:
-        if data.get(field):
-            try:
-                data[field] = json.loads(data[field])
-            except (json.JSONDecodeError, TypeError):
-                data[field] = []
-        else:
-            data[field] = []
-
-    # Convert boolean fields
-    for field in ["in_cmms", "documented", "security_policy_applied"]:
-        data[field] = bool(data.get(field, False))
-
-    return data
+    return _rows_to_asset_dicts([row])[0]
+
+
+def _rows_to_asset_dicts(rows: list[aiosqlite.Row]) -> list[dict[str, Any]]:
+    """Convert database rows to asset dictionaries.
+
+    Column positions are resolved once for the whole result set, and each row
+    is fixed up as a plain list before being zipped into a dict, so the per-row
+    work is a few index assignments rather than dict lookups.
+    """
+    if not rows:
+        return []
+
+    keys = list(rows[0].keys())
+    # Fields the row lacks are added with their empty value
+    missing = [field for field in (*_JSON_LIST_FIELDS, *_BOOL_FIELDS) if field not in keys]
+    keys.extend(missing)
+    padding = [None] * len(missing)
+    json_positions = [keys.index(field) for field in _JSON_LIST_FIELDS]
+    bool_positions = [keys.index(field) for field in _BOOL_FIELDS]
+
+    assets = []
+    for row in rows:
+        values = [*row, *padding]
+        for i in json_positions:
+            values[i] = parse_json_list(values[i])
+        for i in bool_positions:
+            values[i] = bool(values[i])
+        assets.append(dict(zip(keys, values)))
+    return assets
@@ -1,11 +1,111 @@
 """Compliance and audit tools for OT Asset Inventory MCP Server."""
 
+import functools
+from collections import Counter
 from typing import Any
 from datetime import date, timedelta
 
 from ..db.connection import get_db
 
 
+# The unary + keeps the planner from walking idx_assets_crit_type just to
+# produce the ORDER BY, so verification-only requests can use a MULTI-INDEX OR
+# over idx_assets_last_verified (IS NULL and < cutoff legs) and sort the few
+# matches instead
+_GAP_SQL = """
+    SELECT a.id, a.name, a.type, a.criticality, a.process_area_id,
+           pa.name as process_area_name, a.last_verified,
+           {flags}
+    FROM assets a
+    LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+    WHERE ({any_gap}){filters}
+    ORDER BY +a.criticality DESC, a.name
+"""
+
+# find_gaps gap types in result order, with the condition that flags each one.
+# The verification cutoffs are bound by name; the filters use named
+# parameters too so the two can share one statement
+_GAP_CONDITIONS = (
+    ("no_owner", "a.owner IS NULL"),
+    ("not_in_cmms", "NOT a.in_cmms"),
+    ("undocumented", "NOT a.documented"),
+    ("no_security_policy", "NOT a.security_policy_applied"),
+    ("unverified", "a.last_verified IS NULL OR a.last_verified < :six_months_ago"),
+    ("stale_verification", "a.last_verified IS NOT NULL AND a.last_verified < :twelve_months_ago"),
+)
+
+# Gap types reported by find_gaps (and counted by audit_summary) by default
+_DEFAULT_GAP_TYPES = ("no_owner", "not_in_cmms", "undocumented", "no_security_policy", "unverified")
+
+# Fixed descriptions for the gap types that do not depend on the asset
+_GAP_DESCRIPTIONS = {
+    "no_owner": "No owner assigned",
+    "not_in_cmms": "Not registered in CMMS",
+    "undocumented": "Missing documentation",
+    "no_security_policy": "Security policy not applied",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _date_window_for(day: int) -> tuple[str, str, str]:
+    """Return the ISO dates for a day (as an ordinal) and its 6/12-month cutoffs."""
+    today = date.fromordinal(day)
+    return (
+        today.isoformat(),
+        (today - timedelta(days=180)).isoformat(),
+        (today - timedelta(days=365)).isoformat(),
+    )
+
+
+def _date_window() -> tuple[str, str, str]:
+    """Return today, six months ago and twelve months ago as ISO date strings.
+
+    The strings are formatted once per day rather than on every call.
+    """
+    return _date_window_for(date.today().toordinal())
+
+
+@functools.cache
+def _gap_query(gap_types: tuple[str, ...], by_process_area: bool, by_criticality: bool) -> str:
+    """Return the find_gaps SELECT flagging the given gap types, for the active filters."""
+    conditions = dict(_GAP_CONDITIONS)
+    filters = ""
+    if by_process_area:
+        filters += " AND (a.process_area_id = :process_area OR pa.name LIKE :process_area_like)"
+    if by_criticality:
+        filters += " AND a.criticality = :criticality"
+    return _GAP_SQL.format(
+        flags=", ".join(f"({conditions[gap]}) AS {gap}" for gap in gap_types),
+        any_gap=" OR ".join(f"({conditions[gap]})" for gap in gap_types),
+        filters=filters,
+    )
+
+
+# audit_summary counters per (type, criticality) group, including a count per
+# default gap type and of assets with any of them, matching find_gaps
+_AUDIT_SQL = """
+    SELECT a.type, a.criticality, COUNT(*) as count,
+        SUM(CASE WHEN a.owner IS NOT NULL THEN 1 ELSE 0 END) as has_owner,
+        SUM(CASE WHEN a.in_cmms THEN 1 ELSE 0 END) as in_cmms,
+        SUM(CASE WHEN a.documented THEN 1 ELSE 0 END) as documented,
+        SUM(CASE WHEN a.security_policy_applied THEN 1 ELSE 0 END) as security_policy,
+        SUM(CASE WHEN a.last_verified IS NOT NULL THEN 1 ELSE 0 END) as verified,
+        SUM(CASE WHEN a.criticality = 'critical' AND a.owner IS NULL THEN 1 ELSE 0 END) as critical_without_owner,
+        {gap_counts},
+        SUM(CASE WHEN {any_gap} THEN 1 ELSE 0 END) as with_gaps
+    FROM assets a
+    LEFT JOIN process_areas pa ON a.process_area_id = pa.id
+    {{filter_sql}}
+    GROUP BY a.type, a.criticality
+""".format(
+    gap_counts=",\n        ".join(
+        f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) as {gap}"
+        for gap, condition in _GAP_CONDITIONS if gap in _DEFAULT_GAP_TYPES
+    ),
+    any_gap=" OR ".join(f"({condition})" for gap, condition in _GAP_CONDITIONS if gap in _DEFAULT_GAP_TYPES),
+)
+
+
 async def find_gaps(
     gap_types: list[str] | None = None,
     process_area: str | None = None,
@@ -36,99 +136,75 @@ async def find_gaps(
 
     # Default to all gap types
     if gap_types is None:
-        gap_types = ["no_owner", "not_in_cmms", "undocumented", "no_security_policy", "unverified"]
+        gap_types = list(_DEFAULT_GAP_TYPES)
 
     results: dict[str, Any] = {}
-    six_months_ago = (date.today() - timedelta(days=180)).isoformat()
-    twelve_months_ago = (date.today() - timedelta(days=365)).isoformat()
-
-    # Build base query parts
-    base_select = """
-        SELECT a.id, a.name, a.type, a.criticality, a.process_area_id,
-               pa.name as process_area_name,
-               a.owner, a.in_cmms, a.documented, a.security_policy_applied, a.last_verified
-        FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        WHERE 1=1
-    """
-    base_params: list[Any] = []
-
-    if process_area:
-        base_select += " AND (a.process_area_id = ? OR pa.name LIKE ?)"
-        base_params.extend([process_area, f"%{process_area}%"])
-
-    if criticality:
-        base_select += " AND a.criticality = ?"
-        base_params.append(criticality)
-
-    # Query each gap type
-    if "no_owner" in gap_types:
-        query = base_select + " AND a.owner IS NULL ORDER BY a.criticality DESC, a.name"
-        async with db.execute(query, base_params) as cursor:
-            rows = await cursor.fetchall()
-            results["no_owner"] = [_format_gap_asset(row, "No owner assigned") for row in rows]
-
-    if "not_in_cmms" in gap_types:
-        query = base_select + " AND NOT a.in_cmms ORDER BY a.criticality DESC, a.name"
-        async with db.execute(query, base_params) as cursor:
-            rows = await cursor.fetchall()
-            results["not_in_cmms"] = [_format_gap_asset(row, "Not registered in CMMS") for row in rows]
-
-    if "undocumented" in gap_types:
-        query = base_select + " AND NOT a.documented ORDER BY a.criticality DESC, a.name"
-        async with db.execute(query, base_params) as cursor:
-            rows = await cursor.fetchall()
-            results["undocumented"] = [_format_gap_asset(row, "Missing documentation") for row in rows]
-
-    if "no_security_policy" in gap_types:
-        query = base_select + " AND NOT a.security_policy_applied ORDER BY a.criticality DESC, a.name"
-        async with db.execute(query, base_params) as cursor:
-            rows = await cursor.fetchall()
-            results["no_security_policy"] = [_format_gap_asset(row, "Security policy not applied") for row in rows]
-
-    if "unverified" in gap_types:
-        query = base_select + " AND (a.last_verified IS NULL OR a.last_verified < ?) ORDER BY a.criticality DESC, a.name"
-        params = base_params + [six_months_ago]
+    _, six_months_ago, twelve_months_ago = _date_window()
+
+    # One pass over the assets, flagging every requested gap type per row
+    # (the query is built once per gap type set and filter combination)
+    requested = tuple(gap for gap, _ in _GAP_CONDITIONS if gap in gap_types)
+    for gap in requested:
+        results[gap] = []
+
+    # Every returned row is a distinct asset with at least one requested gap,
+    # so the per-asset totals are tallied while bucketing
+    assets_with_gaps = 0
+    critical_assets_with_gaps = 0
+
+    if requested:
+        params: dict[str, Any] = {}
+        if "unverified" in requested:
+            params["six_months_ago"] = six_months_ago
+        if "stale_verification" in requested:
+            params["twelve_months_ago"] = twelve_months_ago
+        if process_area:
+            params["process_area"] = process_area
+            params["process_area_like"] = f"%{process_area}%"
+        if criticality:
+            params["criticality"] = criticality
+
+        query = _gap_query(requested, bool(process_area), bool(criticality))
+        stale_rows = []
         async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            results["unverified"] = [
-                _format_gap_asset(
-                    row,
-                    "Never verified" if row["last_verified"] is None else f"Last verified: {row['last_verified']}"
-                )
-                for row in rows
-            ]
-
-    if "stale_verification" in gap_types:
-        query = base_select + " AND a.last_verified IS NOT NULL AND a.last_verified < ? ORDER BY a.last_verified, a.criticality DESC"
-        params = base_params + [twelve_months_ago]
-        async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
+            cursor.row_factory = None
+            async for asset_id, name, asset_type, crit, _, area, last_verified, *flags in cursor:
+                assets_with_gaps += 1
+                if crit == "critical":
+                    critical_assets_with_gaps += 1
+                asset = (asset_id, name, asset_type, crit, area)
+                for gap, flagged in zip(requested, flags):
+                    if not flagged:
+                        continue
+                    if gap == "stale_verification":
+                        stale_rows.append((last_verified, asset))
+                        continue
+                    if gap == "unverified":
+                        description = (
+                            "Never verified" if last_verified is None
+                            else f"Last verified: {last_verified}"
+                        )
+                    else:
+                        description = _GAP_DESCRIPTIONS[gap]
+                    results[gap].append(_format_gap_asset(asset, description))
+
+        # Stale verifications are listed oldest first; the stable sort keeps
+        # criticality order among assets verified on the same day
+        if "stale_verification" in results:
             results["stale_verification"] = [
-                _format_gap_asset(row, f"Verification stale: {row['last_verified']}")
-                for row in rows
+                _format_gap_asset(asset, f"Verification stale: {last_verified}")
+                for last_verified, asset in sorted(stale_rows, key=lambda item: item[0])
             ]
 
     # Calculate summary
     total_gaps = sum(len(v) for v in results.values())
-    unique_assets = set()
-    for gap_list in results.values():
-        for asset in gap_list:
-            unique_assets.add(asset["id"])
-
-    # Critical gaps (critical assets with any gap)
-    critical_gaps = set()
-    for gap_list in results.values():
-        for asset in gap_list:
-            if asset["criticality"] == "critical":
-                critical_gaps.add(asset["id"])
 
     return {
         "gaps": results,
         "summary": {
             "total_gap_instances": total_gaps,
-            "unique_assets_with_gaps": len(unique_assets),
-            "critical_assets_with_gaps": len(critical_gaps),
+            "unique_assets_with_gaps": assets_with_gaps,
+            "critical_assets_with_gaps": critical_assets_with_gaps,
             "gap_counts": {k: len(v) for k, v in results.items()},
         },
     }
@@ -156,13 +232,6 @@ async def compare_to_source(
     """
     db = await get_db()
 
-    # Get all assets from inventory
-    async with db.execute(
-        "SELECT id, name, type, ip_address, manufacturer, model FROM assets"
-    ) as cursor:
-        rows = await cursor.fetchall()
-        inventory_assets = {row["id"]: dict(row) for row in rows}
-
     # Build source asset lookup
     source_assets: dict[str, dict[str, Any]] = {}
     for asset in source_data:
@@ -170,58 +239,63 @@ async def compare_to_source(
         asset_id = asset.get("id")
         if asset_id:
             source_assets[asset_id] = asset
+    source_count = len(source_assets)
 
-    inventory_ids = set(inventory_assets.keys())
-    source_ids = set(source_assets.keys())
-
-    # Find differences
-    in_inventory_only = [
-        {"id": aid, "name": inventory_assets[aid].get("name"), "type": inventory_assets[aid].get("type")}
-        for aid in inventory_ids - source_ids
-    ]
-
-    in_source_only = [
-        source_assets[aid]
-        for aid in source_ids - inventory_ids
-    ]
+    compare_fields = ["name", "type", "ip_address", "manufacturer", "model"]
 
-    # Find mismatches
-    common_ids = inventory_ids & source_ids
+    # Stream the inventory once, popping each asset's source entry as it is
+    # matched; whatever is left in source_assets afterwards is source-only
+    in_inventory_only = []
     mismatched = []
     matched = []
+    inventory_count = 0
 
-    compare_fields = ["name", "type", "ip_address", "manufacturer", "model"]
-
-    for aid in common_ids:
-        inv_asset = inventory_assets[aid]
-        src_asset = source_assets[aid]
-        differences = []
-
-        for field in compare_fields:
-            inv_value = inv_asset.get(field)
-            src_value = src_asset.get(field)
-            if inv_value != src_value and (inv_value or src_value):
-                differences.append({
+    async with db.execute(
+        "SELECT id, name, type, ip_address, manufacturer, model FROM assets"
+    ) as cursor:
+        # Plain tuples: the compared columns are taken positionally
+        cursor.row_factory = None
+        async for aid, *inv_values in cursor:
+            inventory_count += 1
+            name = inv_values[0]
+            src_asset = source_assets.pop(aid, None)
+            if src_asset is None:
+                in_inventory_only.append({"id": aid, "name": name, "type": inv_values[1]})
+                continue
+
+            # Identical records (the common case) skip the per-field diff
+            src_values = [src_asset.get(field) for field in compare_fields]
+            if inv_values == src_values:
+                matched.append({"id": aid, "name": name})
+                continue
+
+            differences = [
+                {
                     "field": field,
                     "inventory_value": inv_value,
                     "source_value": src_value,
+                }
+                for field, inv_value, src_value in zip(compare_fields, inv_values, src_values)
+                if inv_value != src_value and (inv_value or src_value)
+            ]
+
+            if differences:
+                mismatched.append({
+                    "id": aid,
+                    "name": name,
+                    "differences": differences,
                 })
+            else:
+                matched.append({"id": aid, "name": name})
 
-        if differences:
-            mismatched.append({
-                "id": aid,
-                "name": inv_asset.get("name"),
-                "differences": differences,
-            })
-        else:
-            matched.append({"id": aid, "name": inv_asset.get("name")})
+    in_source_only = list(source_assets.values())
 
     return {
         "source_type": source_type,
-        "comparison_timestamp": date.today().isoformat(),
+        "comparison_timestamp": _date_window()[0],
         "summary": {
-            "inventory_count": len(inventory_assets),
-            "source_count": len(source_assets),
+            "inventory_count": inventory_count,
+            "source_count": source_count,
             "in_inventory_only": len(in_inventory_only),
             "in_source_only": len(in_source_only),
             "mismatched": len(mismatched),
@@ -260,94 +334,59 @@ async def audit_summary(
 
     # Build base query filter
     filter_sql = ""
-    filter_params: list[Any] = []
+    today, six_months_ago, _ = _date_window()
+    params: dict[str, Any] = {"six_months_ago": six_months_ago}
     if process_area:
-        filter_sql = " WHERE (a.process_area_id = ? OR pa.name LIKE ?)"
-        filter_params = [process_area, f"%{process_area}%"]
-
-    # Total asset count
-    async with db.execute(
-        f"""
-        SELECT COUNT(*) as total FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        {filter_sql}
-        """,
-        filter_params,
-    ) as cursor:
-        row = await cursor.fetchone()
-        total_assets = row["total"]
-
-    # Count by type
-    async with db.execute(
-        f"""
-        SELECT a.type, COUNT(*) as count FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        {filter_sql}
-        GROUP BY a.type ORDER BY count DESC
-        """,
-        filter_params,
-    ) as cursor:
-        rows = await cursor.fetchall()
-        by_type = {row["type"]: row["count"] for row in rows}
-
-    # Count by criticality
-    async with db.execute(
-        f"""
-        SELECT COALESCE(a.criticality, 'unassigned') as criticality, COUNT(*) as count
-        FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        {filter_sql}
-        GROUP BY a.criticality
-        """,
-        filter_params,
-    ) as cursor:
-        rows = await cursor.fetchall()
-        by_criticality = {row["criticality"]: row["count"] for row in rows}
+        filter_sql = "WHERE (a.process_area_id = :process_area OR pa.name LIKE :process_area_like)"
+        params["process_area"] = process_area
+        params["process_area_like"] = f"%{process_area}%"
+
+    # One scan over the filtered assets, counted per (type, criticality) group;
+    # the totals, breakdowns, compliance and gap counts are rolled up from the groups
+    async with db.execute(_AUDIT_SQL.format(filter_sql=filter_sql), params) as cursor:
+        groups = await cursor.fetchall()
+
+    total_assets = sum(group["count"] for group in groups)
+
+    type_counts: Counter[str] = Counter()
+    criticality_counts: Counter[str | None] = Counter()
+    for group in groups:
+        type_counts[group["type"]] += group["count"]
+        criticality_counts[group["criticality"]] += group["count"]
+
+    # Most common types first (ties by name); criticality levels in SQLite
+    # GROUP BY order, so unassigned assets come first
+    by_type = dict(sorted(sorted(type_counts.items()), key=lambda item: item[1], reverse=True))
+    by_criticality = {
+        level or "unassigned": criticality_counts[level]
+        for level in sorted(criticality_counts, key=lambda level: (level is not None, level or ""))
+    }
 
-    # Compliance statistics
-    async with db.execute(
-        f"""
-        SELECT
-            SUM(CASE WHEN a.owner IS NOT NULL THEN 1 ELSE 0 END) as has_owner,
-            SUM(CASE WHEN a.in_cmms THEN 1 ELSE 0 END) as in_cmms,
-            SUM(CASE WHEN a.documented THEN 1 ELSE 0 END) as documented,
-            SUM(CASE WHEN a.security_policy_applied THEN 1 ELSE 0 END) as security_policy,
-            SUM(CASE WHEN a.last_verified IS NOT NULL THEN 1 ELSE 0 END) as verified
-        FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        {filter_sql}
-        """,
-        filter_params,
-    ) as cursor:
-        row = await cursor.fetchone()
-        compliance_stats = {
-            "has_owner": {"count": row["has_owner"], "percentage": _pct(row["has_owner"], total_assets)},
-            "in_cmms": {"count": row["in_cmms"], "percentage": _pct(row["in_cmms"], total_assets)},
-            "documented": {"count": row["documented"], "percentage": _pct(row["documented"], total_assets)},
-            "security_policy_applied": {"count": row["security_policy"], "percentage": _pct(row["security_policy"], total_assets)},
-            "verified": {"count": row["verified"], "percentage": _pct(row["verified"], total_assets)},
-        }
+    # Compliance statistics; as with SUM() over no rows, counts are None when
+    # nothing matches the filter
+    sums = {
+        column: sum(group[column] for group in groups) if groups else None
+        for column in ("has_owner", "in_cmms", "documented", "security_policy", "verified")
+    }
+    compliance_stats = {
+        "has_owner": {"count": sums["has_owner"], "percentage": _pct(sums["has_owner"], total_assets)},
+        "in_cmms": {"count": sums["in_cmms"], "percentage": _pct(sums["in_cmms"], total_assets)},
+        "documented": {"count": sums["documented"], "percentage": _pct(sums["documented"], total_assets)},
+        "security_policy_applied": {"count": sums["security_policy"], "percentage": _pct(sums["security_policy"], total_assets)},
+        "verified": {"count": sums["verified"], "percentage": _pct(sums["verified"], total_assets)},
+    }
 
     # Gap counts
-    gap_result = await find_gaps(process_area=process_area)
-    gap_counts = gap_result["summary"]["gap_counts"]
+    gap_counts = {gap: sum(group[gap] for group in groups) for gap in _DEFAULT_GAP_TYPES}
+    assets_with_gaps = sum(group["with_gaps"] for group in groups)
+    critical_assets_with_gaps = sum(group["with_gaps"] for group in groups if group["criticality"] == "critical")
 
     # Critical assets without owner
-    async with db.execute(
-        f"""
-        SELECT COUNT(*) as count FROM assets a
-        LEFT JOIN process_areas pa ON a.process_area_id = pa.id
-        WHERE a.criticality = 'critical' AND a.owner IS NULL
-        {filter_sql.replace('WHERE', 'AND') if filter_sql else ''}
-        """,
-        filter_params,
-    ) as cursor:
-        row = await cursor.fetchone()
-        critical_without_owner = row["count"]
+    critical_without_owner = sum(group["critical_without_owner"] for group in groups)
 
     # Build result
     result: dict[str, Any] = {
-        "audit_date": date.today().isoformat(),
+        "audit_date": today,
         "scope": process_area or "All process areas",
         "total_assets": total_assets,
         "assets_by_type": by_type,
@@ -356,8 +395,8 @@ async def audit_summary(
         "gap_counts": gap_counts,
         "critical_issues": {
             "critical_assets_without_owner": critical_without_owner,
-            "unique_assets_with_gaps": gap_result["summary"]["unique_assets_with_gaps"],
-            "critical_assets_with_gaps": gap_result["summary"]["critical_assets_with_gaps"],
+            "unique_assets_with_gaps": assets_with_gaps,
+            "critical_assets_with_gaps": critical_assets_with_gaps,
         },
         "overall_compliance_score": _calculate_compliance_score(compliance_stats),
     }
@@ -373,18 +412,38 @@ async def audit_summary(
     return result
 
 
-def _format_gap_asset(row: Any, gap_description: str) -> dict[str, Any]:
-    """Format asset row for gap reporting."""
+def _format_gap_asset(asset: tuple[Any, ...], gap_description: str) -> dict[str, Any]:
+    """Format an (id, name, type, criticality, process area) tuple for gap reporting."""
+    asset_id, name, asset_type, criticality, process_area = asset
     return {
-        "id": row["id"],
-        "name": row["name"],
-        "type": row["type"],
-        "criticality": row["criticality"],
-        "process_area": row["process_area_name"],
+        "id": asset_id,
+        "name": name,
+        "type": asset_type,
+        "criticality": criticality,
+        "process_area": process_area,
         "gap_description": gap_description,
     }
 
 
+# Compliance score weights, as fractions of the 100-point score
+_SCORE_WEIGHTS = (
+    ("has_owner", 0.25),
+    ("in_cmms", 0.20),
+    ("documented", 0.25),
+    ("security_policy_applied", 0.20),
+    ("verified", 0.10),
+)
+
+# (stat, threshold percentage, recommendation) for under-threshold areas
+_LOW_COMPLIANCE_RECOMMENDATIONS = (
+    ("has_owner", 80, "Assign owners to {count} asset(s) ({missing:.0f}% missing)"),
+    ("in_cmms", 90, "Register {count} asset(s) in CMMS ({missing:.0f}% not registered)"),
+    ("documented", 80, "Create documentation for {count} asset(s) ({missing:.0f}% undocumented)"),
+    ("security_policy_applied", 90, "Apply security policies to {count} asset(s) ({missing:.0f}% without policy)"),
+    ("verified", 70, "Schedule verification for {count} asset(s) ({missing:.0f}% not recently verified)"),
+)
+
+
 def _pct(count: int, total: int) -> float:
     """Calculate percentage."""
     if total == 0:
@@ -394,18 +453,9 @@ def _pct(count: int, total: int) -> float:
 
 def _calculate_compliance_score(stats: dict[str, Any]) -> dict[str, Any]:
     """Calculate overall compliance score."""
-    weights = {
-        "has_owner": 25,
-        "in_cmms": 20,
-        "documented": 25,
-        "security_policy_applied": 20,
-        "verified": 10,
-    }
-
-    weighted_score = sum(
-        stats[key]["percentage"] * (weight / 100)
-        for key, weight in weights.items()
-    )
+    weighted_score = 0.0
+    for key, weight in _SCORE_WEIGHTS:
+        weighted_score += stats[key]["percentage"] * weight
 
     return {
         "score": round(weighted_score, 1),
@@ -443,25 +493,11 @@ def _generate_recommendations(
         )
 
     # Priority 2: Low compliance areas
-    if compliance_stats["has_owner"]["percentage"] < 80:
-        count = total_assets - compliance_stats["has_owner"]["count"]
-        recommendations.append(f"Assign owners to {count} asset(s) ({100 - compliance_stats['has_owner']['percentage']:.0f}% missing)")
-
-    if compliance_stats["in_cmms"]["percentage"] < 90:
-        count = total_assets - compliance_stats["in_cmms"]["count"]
-        recommendations.append(f"Register {count} asset(s) in CMMS ({100 - compliance_stats['in_cmms']['percentage']:.0f}% not registered)")
-
-    if compliance_stats["documented"]["percentage"] < 80:
-        count = total_assets - compliance_stats["documented"]["count"]
-        recommendations.append(f"Create documentation for {count} asset(s) ({100 - compliance_stats['documented']['percentage']:.0f}% undocumented)")
-
-    if compliance_stats["security_policy_applied"]["percentage"] < 90:
-        count = total_assets - compliance_stats["security_policy_applied"]["count"]
-        recommendations.append(f"Apply security policies to {count} asset(s) ({100 - compliance_stats['security_policy_applied']['percentage']:.0f}% without policy)")
-
-    if compliance_stats["verified"]["percentage"] < 70:
-        count = total_assets - compliance_stats["verified"]["count"]
-        recommendations.append(f"Schedule verification for {count} asset(s) ({100 - compliance_stats['verified']['percentage']:.0f}% not recently verified)")
+    for key, threshold, template in _LOW_COMPLIANCE_RECOMMENDATIONS:
+        stat = compliance_stats[key]
+        percentage = stat["percentage"]
+        if percentage < threshold:
+            recommendations.append(template.format(count=total_assets - stat["count"], missing=100 - percentage))
 
     if not recommendations:
         recommendations.append("Good compliance posture - maintain current processes")
@@ -1,8 +1,10 @@
 """Environment and process area tools for OT Asset Inventory MCP Server."""
 
+from collections import Counter, defaultdict
 from typing import Any
 
 from ..db.connection import get_db
+from ..utils.sql import placeholders
 
 
 async def get_environment(environment_id: str) -> dict[str, Any] | None:
@@ -33,41 +35,41 @@ async def get_environment(environment_id: str) -> dict[str, Any] | None:
             "description": row["description"],
         }
 
+    # Get the process areas of every site in one query, grouped by site
+    process_areas_by_site: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    async with db.execute(
+        """
+        SELECT pa.id, pa.site_id, pa.name, pa.description, pa.function
+        FROM process_areas pa
+        JOIN sites s ON pa.site_id = s.id
+        WHERE s.environment_id = ?
+        """,
+        [environment_id],
+    ) as cursor:
+        async for pa in cursor:
+            process_areas_by_site[pa["site_id"]].append({
+                "id": pa["id"],
+                "name": pa["name"],
+                "description": pa["description"],
+                "function": pa["function"],
+            })
+
     # Get sites
     async with db.execute(
-        "SELECT * FROM sites WHERE environment_id = ?",
+        "SELECT id, name, address, timezone FROM sites WHERE environment_id = ?",
         [environment_id],
     ) as cursor:
         rows = await cursor.fetchall()
-        sites = []
-        for site_row in rows:
-            site = {
+        environment["sites"] = [
+            {
                 "id": site_row["id"],
                 "name": site_row["name"],
                 "address": site_row["address"],
                 "timezone": site_row["timezone"],
-                "process_areas": [],
+                "process_areas": process_areas_by_site.get(site_row["id"], []),
             }
-
-            # Get process areas for this site
-            async with db.execute(
-                "SELECT * FROM process_areas WHERE site_id = ?",
-                [site_row["id"]],
-            ) as pa_cursor:
-                pa_rows = await pa_cursor.fetchall()
-                site["process_areas"] = [
-                    {
-                        "id": pa["id"],
-                        "name": pa["name"],
-                        "description": pa["description"],
-                        "function": pa["function"],
-                    }
-                    for pa in pa_rows
-                ]
-
-            sites.append(site)
-
-        environment["sites"] = sites
+            for site_row in rows
+        ]
 
     # Get compliance frameworks
     async with db.execute(
@@ -109,41 +111,40 @@ async def list_environments() -> list[dict[str, Any]]:
     """
     db = await get_db()
 
-    async with db.execute("SELECT * FROM environments ORDER BY name") as cursor:
+    # Site and asset counts come from grouped subqueries joined onto each
+    # environment, rather than two count queries per environment
+    async with db.execute(
+        """
+        SELECT e.id, e.name, e.type, e.description,
+               COALESCE(sc.site_count, 0) as site_count,
+               COALESCE(ac.asset_count, 0) as asset_count
+        FROM environments e
+        LEFT JOIN (
+            SELECT environment_id, COUNT(*) as site_count
+            FROM sites
+            GROUP BY environment_id
+        ) sc ON sc.environment_id = e.id
+        LEFT JOIN (
+            SELECT s.environment_id, COUNT(*) as asset_count
+            FROM assets a
+            JOIN sites s ON a.site_id = s.id
+            GROUP BY s.environment_id
+        ) ac ON ac.environment_id = e.id
+        ORDER BY e.name
+        """
+    ) as cursor:
         rows = await cursor.fetchall()
-        environments = []
-
-        for row in rows:
-            env = {
+        return [
+            {
                 "id": row["id"],
                 "name": row["name"],
                 "type": row["type"],
                 "description": row["description"],
+                "site_count": row["site_count"],
+                "asset_count": row["asset_count"],
             }
-
-            # Count sites
-            async with db.execute(
-                "SELECT COUNT(*) as count FROM sites WHERE environment_id = ?",
-                [row["id"]],
-            ) as site_cursor:
-                site_row = await site_cursor.fetchone()
-                env["site_count"] = site_row["count"]
-
-            # Count assets
-            async with db.execute(
-                """
-                SELECT COUNT(*) as count FROM assets a
-                JOIN sites s ON a.site_id = s.id
-                WHERE s.environment_id = ?
-                """,
-                [row["id"]],
-            ) as asset_cursor:
-                asset_row = await asset_cursor.fetchone()
-                env["asset_count"] = asset_row["count"]
-
-            environments.append(env)
-
-        return environments
+            for row in rows
+        ]
 
 
 async def list_process_areas(
@@ -177,59 +178,48 @@ async def list_process_areas(
 
     async with db.execute(query, params) as cursor:
         rows = await cursor.fetchall()
-        process_areas = []
 
-        for row in rows:
-            pa: dict[str, Any] = {
-                "id": row["id"],
-                "name": row["name"],
-                "description": row["description"],
-                "function": row["function"],
-                "site_id": row["site_id"],
-                "site_name": row["site_name"],
+    process_areas = [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "function": row["function"],
+            "site_id": row["site_id"],
+            "site_name": row["site_name"],
+        }
+        for row in rows
+    ]
+
+    if include_asset_counts and process_areas:
+        # One grouped count for all listed process areas, pivoted into the
+        # per-area total, criticality and type breakdowns
+        counts: dict[str, Counter[str | None]] = {pa["id"]: Counter() for pa in process_areas}
+        type_counts: dict[str, Counter[str]] = {pa["id"]: Counter() for pa in process_areas}
+        async with db.execute(
+            f"""
+            SELECT process_area_id, criticality, type, COUNT(*) as count
+            FROM assets
+            WHERE process_area_id IN ({placeholders(len(counts))})
+            GROUP BY process_area_id, criticality, type
+            """,
+            list(counts),
+        ) as cursor:
+            async for r in cursor:
+                counts[r["process_area_id"]][r["criticality"]] += r["count"]
+                type_counts[r["process_area_id"]][r["type"]] += r["count"]
+
+        for pa in process_areas:
+            criticality_counts = counts[pa["id"]]
+            pa["asset_count"] = criticality_counts.total()
+            # Breakdowns keep the GROUP BY order: unassigned first, then by name
+            pa["criticality_breakdown"] = {
+                level or "unassigned": criticality_counts[level]
+                for level in sorted(criticality_counts, key=lambda level: (level is not None, level or ""))
             }
+            pa["type_breakdown"] = dict(sorted(type_counts[pa["id"]].items()))
 
-            if include_asset_counts:
-                # Get asset count
-                async with db.execute(
-                    "SELECT COUNT(*) as count FROM assets WHERE process_area_id = ?",
-                    [row["id"]],
-                ) as count_cursor:
-                    count_row = await count_cursor.fetchone()
-                    pa["asset_count"] = count_row["count"]
-
-                # Get criticality breakdown
-                async with db.execute(
-                    """
-                    SELECT criticality, COUNT(*) as count
-                    FROM assets
-                    WHERE process_area_id = ?
-                    GROUP BY criticality
-                    """,
-                    [row["id"]],
-                ) as crit_cursor:
-                    crit_rows = await crit_cursor.fetchall()
-                    pa["criticality_breakdown"] = {
-                        r["criticality"] or "unassigned": r["count"]
-                        for r in crit_rows
-                    }
-
-                # Get asset type breakdown
-                async with db.execute(
-                    """
-                    SELECT type, COUNT(*) as count
-                    FROM assets
-                    WHERE process_area_id = ?
-                    GROUP BY type
-                    """,
-                    [row["id"]],
-                ) as type_cursor:
-                    type_rows = await type_cursor.fetchall()
-                    pa["type_breakdown"] = {r["type"]: r["count"] for r in type_rows}
-
-            process_areas.append(pa)
-
-        return process_areas
+    return process_areas
 
 
 async def get_process_area(process_area_id: str) -> dict[str, Any] | None:
@@ -335,7 +325,9 @@ async def get_site(site_id: str) -> dict[str, Any] | None:
 
     async with db.execute(
         """
-        SELECT s.*, e.name as environment_name
+        SELECT s.id, s.name, s.address, s.timezone, s.environment_id,
+               e.name as environment_name,
+               (SELECT COUNT(*) FROM assets a WHERE a.site_id = s.id) as total_assets
         FROM sites s
         JOIN environments e ON s.environment_id = e.id
         WHERE s.id = ?
@@ -355,17 +347,12 @@ async def get_site(site_id: str) -> dict[str, Any] | None:
             "environment_name": row["environment_name"],
         }
 
-    # Get process areas
+        total_assets = row["total_assets"]
+
+    # Get process areas (with their breakdowns, in a fixed number of queries)
     process_areas = await list_process_areas(site_id=site_id)
     site["process_areas"] = process_areas
     site["process_area_count"] = len(process_areas)
-
-    # Get total asset count
-    async with db.execute(
-        "SELECT COUNT(*) as count FROM assets WHERE site_id = ?",
-        [site_id],
-    ) as cursor:
-        row = await cursor.fetchone()
-        site["total_assets"] = row["count"]
+    site["total_assets"] = total_assets
 
     return site
@@ -1,16 +1,33 @@
 """Relationship query tools for OT Asset Inventory MCP Server."""
 
+import asyncio
+from collections import Counter
 from typing import Any
 
-from ..db.connection import get_db
+from ..db.connection import get_db, read_db
 from ..utils.graph import (
     traverse_upstream,
     traverse_downstream,
+    traverse_both,
     find_dependents,
     check_redundancy,
 )
 
 
+# Descriptions reported by get_relationship_types
+_TYPE_DESCRIPTIONS = {
+    "feeds_data_to": "Source sends data to target (sensor to PLC, PLC to HMI)",
+    "controls": "Source controls target (PLC to actuator)",
+    "monitors": "Source monitors target (HMI to PLC)",
+    "safety_interlock_for": "Source is a safety interlock for target",
+    "depends_on": "Source depends on target to function",
+    "redundant_with": "Source and target provide redundancy for each other",
+    "communicates_with": "Bidirectional communication between source and target",
+    "powers": "Source provides power to target",
+    "backs_up": "Source backs up target",
+}
+
+
 async def get_upstream(
     asset_id: str,
     relationship_types: list[str] | None = None,
@@ -30,7 +47,7 @@ async def get_upstream(
     Returns:
         Hierarchical list of upstream assets with relationship details
     """
-    result = await traverse_upstream(asset_id, relationship_types, max_depth)
+    result = await traverse_upstream(asset_id, relationship_types, max_depth, want_depth_map=True)
 
     # Add summary
     result["summary"] = {
@@ -61,7 +78,7 @@ async def get_downstream(
     Returns:
         Hierarchical list of downstream assets with relationship details
     """
-    result = await traverse_downstream(asset_id, relationship_types, max_depth)
+    result = await traverse_downstream(asset_id, relationship_types, max_depth, want_depth_map=True)
 
     # Add summary
     result["summary"] = {
@@ -109,13 +126,38 @@ async def get_dependencies(asset_id: str, max_depth: int = 5) -> dict[str, Any]:
             "criticality": row["criticality"],
         }
 
-    upstream = await traverse_upstream(asset_id, max_depth=max_depth)
-    downstream = await traverse_downstream(asset_id, max_depth=max_depth)
-    dependents = await find_dependents(asset_id, max_depth=max_depth)
-    redundancy = await check_redundancy(asset_id)
+    # Upstream and downstream come from one fused walk; the lookups are
+    # independent of each other and each checks out its own read connection,
+    # so they run concurrently
+    (upstream, downstream), dependents, redundancy, depends_on = await asyncio.gather(
+        traverse_both(asset_id, max_depth=max_depth),
+        find_dependents(asset_id, max_depth=max_depth),
+        check_redundancy(asset_id),
+        _get_depends_on(asset_id),
+    )
 
-    # Get explicit depends_on relationships (what this asset depends on)
-    async with db.execute(
+    return {
+        "asset": asset_info,
+        "upstream": {
+            "count": len(upstream["assets"]),
+            "assets": upstream["assets"],
+        },
+        "downstream": {
+            "count": len(downstream["assets"]),
+            "assets": downstream["assets"],
+        },
+        "depends_on": depends_on,
+        "dependents": {
+            "count": len(dependents["dependents"]),
+            "assets": dependents["dependents"],
+        },
+        "redundancy": redundancy,
+    }
+
+
+async def _get_depends_on(asset_id: str) -> list[dict[str, Any]]:
+    """Get the assets this asset explicitly depends on (depends_on relationships)."""
+    async with read_db() as db, db.execute(
         """
         SELECT a.id, a.name, a.type, a.criticality, r.description
         FROM relationships r
@@ -125,7 +167,7 @@ async def get_dependencies(asset_id: str, max_depth: int = 5) -> dict[str, Any]:
         [asset_id],
     ) as cursor:
         rows = await cursor.fetchall()
-        depends_on = [
+        return [
             {
                 "id": row["id"],
                 "name": row["name"],
@@ -136,24 +178,6 @@ async def get_dependencies(asset_id: str, max_depth: int = 5) -> dict[str, Any]:
             for row in rows
         ]
 
-    return {
-        "asset": asset_info,
-        "upstream": {
-            "count": len(upstream["assets"]),
-            "assets": upstream["assets"],
-        },
-        "downstream": {
-            "count": len(downstream["assets"]),
-            "assets": downstream["assets"],
-        },
-        "depends_on": depends_on,
-        "dependents": {
-            "count": len(dependents["dependents"]),
-            "assets": dependents["dependents"],
-        },
-        "redundancy": redundancy,
-    }
-
 
 async def list_relationships(
     source_asset_id: str | None = None,
@@ -178,9 +202,8 @@ async def list_relationships(
     db = await get_db()
 
     query = """
-        SELECT r.*,
-               s.name as source_name, s.type as source_type,
-               t.name as target_name, t.type as target_type
+        SELECT r.id, r.source_asset_id, s.name, s.type, r.target_asset_id, t.name, t.type,
+               r.relationship_type, r.inferred, r.verified, r.description
         FROM relationships r
         JOIN assets s ON r.source_asset_id = s.id
         JOIN assets t ON r.target_asset_id = t.id
@@ -203,29 +226,26 @@ async def list_relationships(
     if verified_only:
         query += " AND r.verified = 1"
 
-    query += f" ORDER BY r.relationship_type, s.name LIMIT {min(limit, 500)}"
+    query += " ORDER BY r.relationship_type, s.name LIMIT ?"
+    params.append(min(limit, 500))
 
     async with db.execute(query, params) as cursor:
-        rows = await cursor.fetchall()
+        cursor.row_factory = None
         return [
             {
-                "id": row["id"],
-                "source": {
-                    "id": row["source_asset_id"],
-                    "name": row["source_name"],
-                    "type": row["source_type"],
-                },
-                "target": {
-                    "id": row["target_asset_id"],
-                    "name": row["target_name"],
-                    "type": row["target_type"],
-                },
-                "relationship_type": row["relationship_type"],
-                "inferred": bool(row["inferred"]),
-                "verified": bool(row["verified"]),
-                "description": row["description"],
+                "id": relationship_id,
+                "source": {"id": source_id, "name": source_name, "type": source_type},
+                "target": {"id": target_id, "name": target_name, "type": target_type},
+                "relationship_type": relationship_type,
+                "inferred": bool(inferred),
+                "verified": bool(verified),
+                "description": description,
             }
-            for row in rows
+            for (
+                relationship_id, source_id, source_name, source_type,
+                target_id, target_name, target_type,
+                relationship_type, inferred, verified, description,
+            ) in await cursor.fetchall()
         ]
 
 
@@ -238,33 +258,19 @@ async def get_relationship_types() -> list[dict[str, Any]]:
     """
     db = await get_db()
 
-    type_descriptions = {
-        "feeds_data_to": "Source sends data to target (sensor to PLC, PLC to HMI)",
-        "controls": "Source controls target (PLC to actuator)",
-        "monitors": "Source monitors target (HMI to PLC)",
-        "safety_interlock_for": "Source is a safety interlock for target",
-        "depends_on": "Source depends on target to function",
-        "redundant_with": "Source and target provide redundancy for each other",
-        "communicates_with": "Bidirectional communication between source and target",
-        "powers": "Source provides power to target",
-        "backs_up": "Source backs up target",
-    }
-
     async with db.execute(
         """
-        SELECT relationship_type, COUNT(*) as count,
-               SUM(CASE WHEN verified THEN 1 ELSE 0 END) as verified_count,
-               SUM(CASE WHEN inferred THEN 1 ELSE 0 END) as inferred_count
-        FROM relationships
-        GROUP BY relationship_type
-        ORDER BY count DESC
+        SELECT relationship_type, count, verified_count, inferred_count
+        FROM relationship_type_counts
+        WHERE count > 0
+        ORDER BY count DESC, relationship_type
         """
     ) as cursor:
         rows = await cursor.fetchall()
         return [
             {
                 "type": row["relationship_type"],
-                "description": type_descriptions.get(row["relationship_type"], ""),
+                "description": _TYPE_DESCRIPTIONS.get(row["relationship_type"], ""),
                 "count": row["count"],
                 "verified_count": row["verified_count"],
                 "inferred_count": row["inferred_count"],
@@ -275,8 +281,4 @@ async def get_relationship_types() -> list[dict[str, Any]]:
 
 def _count_by_key(items: list[dict[str, Any]], key: str) -> dict[str, int]:
     """Count items by a specific key."""
-    counts: dict[str, int] = {}
-    for item in items:
-        value = item.get(key) or "unassigned"
-        counts[value] = counts.get(value, 0) + 1
-    return counts
+    return dict(Counter(item.get(key) or "unassigned" for item in items))
@@ -1,10 +1,30 @@
 """Review and human-in-the-loop tools for OT Asset Inventory MCP Server."""
 
 from typing import Any
-from datetime import datetime
-import uuid
 
 from ..db.connection import get_db
+from ..utils.ids import uuid7
+
+
+# Flag types accepted by flag_for_review (in error message order) and severities
+_FLAG_TYPES = (
+    "missing_data", "needs_verification", "potential_issue",
+    "suggested_relationship", "compliance_gap", "ownership_unknown",
+)
+_VALID_FLAG_TYPES = frozenset(_FLAG_TYPES)
+_VALID_SEVERITIES = frozenset(("critical", "high", "medium", "low"))
+
+# suggest_relationship's checks in one row: both endpoint assets (NULL when
+# missing) and the id of any identical existing relationship
+_SUGGEST_LOOKUP_SQL = """
+    SELECT s.id, s.name, s.type, t.id, t.name, t.type,
+           (SELECT r.id FROM relationships r
+            WHERE r.source_asset_id = :source AND r.target_asset_id = :target
+            AND r.relationship_type = :relationship_type)
+    FROM (SELECT 1)
+    LEFT JOIN assets s ON s.id = :source
+    LEFT JOIN assets t ON t.id = :target
+"""
 
 
 async def suggest_relationship(
@@ -30,41 +50,30 @@ async def suggest_relationship(
     """
     db = await get_db()
 
-    # Validate assets exist
+    # Validate assets exist and check if the relationship already exists
     async with db.execute(
-        "SELECT id, name, type FROM assets WHERE id = ?",
-        [source_asset_id],
-    ) as cursor:
-        source = await cursor.fetchone()
-        if not source:
-            return {"error": f"Source asset {source_asset_id} not found"}
-
-    async with db.execute(
-        "SELECT id, name, type FROM assets WHERE id = ?",
-        [target_asset_id],
+        _SUGGEST_LOOKUP_SQL,
+        {"source": source_asset_id, "target": target_asset_id, "relationship_type": relationship_type},
     ) as cursor:
-        target = await cursor.fetchone()
-        if not target:
-            return {"error": f"Target asset {target_asset_id} not found"}
-
-    # Check if relationship already exists
-    async with db.execute(
-        """
-        SELECT id FROM relationships
-        WHERE source_asset_id = ? AND target_asset_id = ? AND relationship_type = ?
-        """,
-        [source_asset_id, target_asset_id, relationship_type],
-    ) as cursor:
-        existing = await cursor.fetchone()
-        if existing:
-            return {
-                "status": "already_exists",
-                "message": "This relationship already exists",
-                "relationship_id": existing["id"],
-            }
+        cursor.row_factory = None
+        (
+            source_id, source_name, source_type,
+            target_id, target_name, target_type,
+            existing_id,
+        ) = await cursor.fetchone()
+    if source_id is None:
+        return {"error": f"Source asset {source_asset_id} not found"}
+    if target_id is None:
+        return {"error": f"Target asset {target_asset_id} not found"}
+    if existing_id is not None:
+        return {
+            "status": "already_exists",
+            "message": "This relationship already exists",
+            "relationship_id": existing_id,
+        }
 
     # Create the relationship as inferred/unverified
-    relationship_id = str(uuid.uuid4())
+    relationship_id = uuid7()
     await db.execute(
         """
         INSERT INTO relationships (id, source_asset_id, target_asset_id, relationship_type, inferred, verified, description)
@@ -74,13 +83,13 @@ async def suggest_relationship(
     )
 
     # Create a review flag
-    flag_id = str(uuid.uuid4())
+    flag_id = uuid7()
     await db.execute(
         """
         INSERT INTO review_flags (id, relationship_id, flag_type, description, severity, flagged_by)
         VALUES (?, ?, 'suggested_relationship', ?, 'medium', 'claude')
         """,
-        [flag_id, relationship_id, f"Suggested {relationship_type} relationship: {source['name']} -> {target['name']}. Reasoning: {reasoning}"],
+        [flag_id, relationship_id, f"Suggested {relationship_type} relationship: {source_name} -> {target_name}. Reasoning: {reasoning}"],
     )
 
     await db.commit()
@@ -89,8 +98,8 @@ async def suggest_relationship(
         "status": "suggested",
         "relationship_id": relationship_id,
         "flag_id": flag_id,
-        "source": {"id": source["id"], "name": source["name"], "type": source["type"]},
-        "target": {"id": target["id"], "name": target["name"], "type": target["type"]},
+        "source": {"id": source_id, "name": source_name, "type": source_type},
+        "target": {"id": target_id, "name": target_name, "type": target_type},
         "relationship_type": relationship_type,
         "message": "Relationship suggested and flagged for human review",
     }
@@ -134,20 +143,15 @@ async def flag_for_review(
             return {"error": f"Asset {asset_id} not found"}
 
     # Validate flag type
-    valid_flag_types = [
-        "missing_data", "needs_verification", "potential_issue",
-        "suggested_relationship", "compliance_gap", "ownership_unknown"
-    ]
-    if flag_type not in valid_flag_types:
-        return {"error": f"Invalid flag type. Must be one of: {valid_flag_types}"}
+    if flag_type not in _VALID_FLAG_TYPES:
+        return {"error": f"Invalid flag type. Must be one of: {list(_FLAG_TYPES)}"}
 
     # Validate severity
-    valid_severities = ["critical", "high", "medium", "low"]
-    if severity not in valid_severities:
+    if severity not in _VALID_SEVERITIES:
         severity = "medium"
 
     # Create the flag
-    flag_id = str(uuid.uuid4())
+    flag_id = uuid7()
     await db.execute(
         """
         INSERT INTO review_flags (id, asset_id, flag_type, description, severity, flagged_by)
@@ -192,9 +196,10 @@ async def list_review_flags(
     db = await get_db()
 
     query = """
-        SELECT rf.*,
-               a.name as asset_name, a.type as asset_type,
-               r.source_asset_id, r.target_asset_id, r.relationship_type
+        SELECT rf.id, rf.flag_type, rf.description, rf.severity, rf.status,
+               rf.flagged_by, rf.flagged_at,
+               rf.asset_id, a.name, a.type,
+               rf.relationship_id, r.source_asset_id, r.target_asset_id, r.relationship_type
         FROM review_flags rf
         LEFT JOIN assets a ON rf.asset_id = a.id
         LEFT JOIN relationships r ON rf.relationship_id = r.id
@@ -214,7 +219,8 @@ async def list_review_flags(
         query += " AND rf.severity = ?"
         params.append(severity)
 
-    query += f"""
+    # Matches idx_review_flags_list, so rows come off the index already sorted
+    query += """
         ORDER BY
             CASE rf.severity
                 WHEN 'critical' THEN 1
@@ -223,33 +229,38 @@ async def list_review_flags(
                 WHEN 'low' THEN 4
             END,
             rf.flagged_at DESC
-        LIMIT {min(limit, 200)}
+        LIMIT ?
     """
+    params.append(min(limit, 200))
 
     async with db.execute(query, params) as cursor:
-        rows = await cursor.fetchall()
+        cursor.row_factory = None
         return [
             {
-                "id": row["id"],
-                "flag_type": row["flag_type"],
-                "description": row["description"],
-                "severity": row["severity"],
-                "status": row["status"],
-                "flagged_by": row["flagged_by"],
-                "flagged_at": row["flagged_at"],
+                "id": flag_id,
+                "flag_type": flag_type,
+                "description": description,
+                "severity": severity,
+                "status": status,
+                "flagged_by": flagged_by,
+                "flagged_at": flagged_at,
                 "asset": {
-                    "id": row["asset_id"],
-                    "name": row["asset_name"],
-                    "type": row["asset_type"],
-                } if row["asset_id"] else None,
+                    "id": asset_id,
+                    "name": asset_name,
+                    "type": asset_type,
+                } if asset_id else None,
                 "relationship": {
-                    "id": row["relationship_id"],
-                    "source_id": row["source_asset_id"],
-                    "target_id": row["target_asset_id"],
-                    "type": row["relationship_type"],
-                } if row["relationship_id"] else None,
+                    "id": relationship_id,
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "type": relationship_type,
+                } if relationship_id else None,
             }
-            for row in rows
+            for (
+                flag_id, flag_type, description, severity, status, flagged_by, flagged_at,
+                asset_id, asset_name, asset_type,
+                relationship_id, source_id, target_id, relationship_type,
+            ) in await cursor.fetchall()
         ]
 
 
@@ -273,37 +284,37 @@ async def resolve_flag(
     """
     db = await get_db()
 
-    # Check flag exists
+    # Update the flag if it is still open; the guard is part of the UPDATE so
+    # the pre-check and the write cannot interleave with another resolution
     async with db.execute(
-        "SELECT * FROM review_flags WHERE id = ?",
-        [flag_id],
-    ) as cursor:
-        flag = await cursor.fetchone()
-        if not flag:
-            return {"error": f"Flag {flag_id} not found"}
-
-    if flag["status"] != "open" and flag["status"] != "in_review":
-        return {"error": f"Flag is already {flag['status']}"}
-
-    # Update the flag
-    await db.execute(
         """
         UPDATE review_flags
-        SET status = ?, resolved_by = ?, resolved_at = ?, resolution_notes = ?
-        WHERE id = ?
+        SET status = ?, resolved_by = ?, resolved_at = CURRENT_TIMESTAMP, resolution_notes = ?
+        WHERE id = ? AND status IN ('open', 'in_review')
+        RETURNING flag_type, relationship_id
         """,
-        [resolution, resolved_by, datetime.now().isoformat(), notes, flag_id],
-    )
+        [resolution, resolved_by, notes, flag_id],
+    ) as cursor:
+        flag = await cursor.fetchone()
+
+    if not flag:
+        # Nothing was written, but the UPDATE opened a transaction; end it
+        await db.commit()
+        async with db.execute("SELECT status FROM review_flags WHERE id = ?", [flag_id]) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return {"error": f"Flag {flag_id} not found"}
+        return {"error": f"Flag is already {row['status']}"}
 
     # If this was a relationship suggestion and it's resolved, verify the relationship
     if flag["flag_type"] == "suggested_relationship" and resolution == "resolved" and flag["relationship_id"]:
         await db.execute(
             """
             UPDATE relationships
-            SET verified = 1, verified_by = ?, verified_at = ?
+            SET verified = 1, verified_by = ?, verified_at = CURRENT_TIMESTAMP
             WHERE id = ?
             """,
-            [resolved_by, datetime.now().isoformat(), flag["relationship_id"]],
+            [resolved_by, flag["relationship_id"]],
         )
 
     await db.commit()
@@ -326,40 +337,23 @@ async def get_review_summary() -> dict[str, Any]:
     """
     db = await get_db()
 
-    # Count by status
+    # Status, open severity and open type counts from the trigger-maintained
+    # counters, in key order ('' stands for a NULL key)
+    counts: dict[str, dict[Any, int]] = {"status": {}, "open_severity": {}, "open_type": {}}
     async with db.execute(
         """
-        SELECT status, COUNT(*) as count
-        FROM review_flags
-        GROUP BY status
-        """
-    ) as cursor:
-        rows = await cursor.fetchall()
-        by_status = {row["status"]: row["count"] for row in rows}
-
-    # Count open flags by severity
-    async with db.execute(
-        """
-        SELECT severity, COUNT(*) as count
-        FROM review_flags
-        WHERE status = 'open'
-        GROUP BY severity
-        """
-    ) as cursor:
-        rows = await cursor.fetchall()
-        open_by_severity = {row["severity"]: row["count"] for row in rows}
-
-    # Count open flags by type
-    async with db.execute(
-        """
-        SELECT flag_type, COUNT(*) as count
-        FROM review_flags
-        WHERE status = 'open'
-        GROUP BY flag_type
+        SELECT kind, NULLIF(key, ''), count
+        FROM review_flag_counts
+        WHERE count > 0
+        ORDER BY kind, key
         """
     ) as cursor:
-        rows = await cursor.fetchall()
-        open_by_type = {row["flag_type"]: row["count"] for row in rows}
+        cursor.row_factory = None
+        async for kind, key, count in cursor:
+            counts[kind][key] = count
+    by_status = counts["status"]
+    open_by_severity = counts["open_severity"]
+    open_by_type = counts["open_type"]
 
     # Get oldest open flag
     async with db.execute(
@@ -1,164 +1,261 @@
 """Graph traversal utilities for asset relationships."""
 
-from collections import deque
+import asyncio
+import functools
+from collections import defaultdict
+from collections.abc import Sequence
 from typing import Any
 
 import aiosqlite
 
-from ..db.connection import get_db
-
-
-async def traverse_upstream(
+from ..db.connection import read_db
+from .sql import placeholders
+
+
+# Deepest traversal accepted. The recursive walks dedupe (id, depth) pairs,
+# not ids, so on a cycle they keep expanding until the depth cap; clamping
+# it bounds the work at a small multiple of the edge count
+MAX_TRAVERSAL_DEPTH = 20
+
+# Whole traversal in one recursive query instead of two queries per visited
+# node. The walk carries (id, depth) pairs; UNION drops repeated pairs so
+# cycles cannot multiply rows, and depth is capped so recursion terminates.
+# MIN(depth) per asset is its BFS distance from the root.
+_TRAVERSAL_SQL = """
+WITH RECURSIVE walk(id, depth) AS (
+    SELECT ?, 0
+    UNION
+    SELECT r.{next_column}, w.depth + 1
+    FROM walk w
+    JOIN relationships r ON r.{current_column} = w.id
+    WHERE w.depth < ?{type_filter}
+)
+SELECT a.id, a.name, a.type, a.criticality, a.process_area_id, MIN(w.depth) AS depth
+FROM walk w
+JOIN assets a ON a.id = w.id
+WHERE w.id != ?
+GROUP BY a.id
+ORDER BY depth, a.id
+"""
+
+# Single-type traversals read the trigger-maintained relationship_closure
+# instead of recursing: it already holds every pair reachable through one
+# relationship type with its shortest hop count, which is the BFS depth
+_CLOSURE_TRAVERSAL_SQL = """
+SELECT a.id, a.name, a.type, a.criticality, a.process_area_id, c.depth
+FROM relationship_closure c
+JOIN assets a ON a.id = c.{next_column}
+WHERE c.{current_column} = ? AND c.relationship_type = ? AND c.depth <= ?
+ORDER BY c.depth, a.id
+"""
+
+# Upstream and downstream walks from the same root in one statement, tagged
+# by direction and sharing the final join to assets
+_BOTH_TRAVERSAL_SQL = """
+WITH RECURSIVE up(id, depth) AS (
+    SELECT ?, 0
+    UNION
+    SELECT r.source_asset_id, w.depth + 1
+    FROM up w
+    JOIN relationships r ON r.target_asset_id = w.id
+    WHERE w.depth < ?{type_filter}
+), down(id, depth) AS (
+    SELECT ?, 0
+    UNION
+    SELECT r.target_asset_id, w.depth + 1
+    FROM down w
+    JOIN relationships r ON r.source_asset_id = w.id
+    WHERE w.depth < ?{type_filter}
+), walk(direction, id, depth) AS (
+    SELECT 'upstream', id, depth FROM up
+    UNION ALL
+    SELECT 'downstream', id, depth FROM down
+)
+SELECT w.direction, a.id, a.name, a.type, a.criticality, a.process_area_id, MIN(w.depth) AS depth
+FROM walk w
+JOIN assets a ON a.id = w.id
+WHERE w.id != ?
+GROUP BY w.direction, a.id
+ORDER BY w.direction, depth, a.id
+"""
+
+
+def _type_filter(type_count: int) -> str:
+    """Return the recursive step's relationship type condition for ``type_count`` types."""
+    return f" AND r.relationship_type IN ({placeholders(type_count)})" if type_count else ""
+
+
+# The traversal statements depend only on direction and the number of type
+# filters, so each distinct text is built once and the formatting is skipped
+# on every later call
+@functools.cache
+def _traversal_query(upstream: bool, type_count: int) -> str:
+    """Return the recursive traversal SQL for one direction."""
+    if upstream:
+        current_column, next_column = "target_asset_id", "source_asset_id"
+    else:
+        current_column, next_column = "source_asset_id", "target_asset_id"
+    return _TRAVERSAL_SQL.format(
+        current_column=current_column, next_column=next_column, type_filter=_type_filter(type_count)
+    )
+
+
+@functools.cache
+def _closure_traversal_query(upstream: bool) -> str:
+    """Return the single-type closure lookup SQL for one direction."""
+    if upstream:
+        current_column, next_column = "descendant", "ancestor"
+    else:
+        current_column, next_column = "ancestor", "descendant"
+    return _CLOSURE_TRAVERSAL_SQL.format(current_column=current_column, next_column=next_column)
+
+
+@functools.cache
+def _both_traversal_query(type_count: int) -> str:
+    """Return the combined upstream/downstream traversal SQL."""
+    return _BOTH_TRAVERSAL_SQL.format(type_filter=_type_filter(type_count))
+
+
+async def traverse(
     asset_id: str,
+    direction: str,
     relationship_types: list[str] | None = None,
     max_depth: int = 5,
+    want_depth_map: bool = False,
 ) -> dict[str, Any]:
     """
-    BFS traversal to find all upstream assets (assets that feed into this one).
+    Find all assets reachable from an asset in one direction, with BFS depth.
 
     Args:
         asset_id: Starting asset ID
+        direction: "upstream" (follow relationships into the asset) or
+            "downstream" (follow relationships out of it)
         relationship_types: Filter by specific relationship types
-        max_depth: Maximum traversal depth
+        max_depth: Maximum traversal depth, capped at MAX_TRAVERSAL_DEPTH
+        want_depth_map: Also return a depth_map of asset ID to depth
 
     Returns:
-        Dictionary containing root asset ID, upstream assets with depth info
+        Dictionary containing root asset ID, reachable assets with depth info
     """
-    db = await get_db()
+    max_depth = min(max_depth, MAX_TRAVERSAL_DEPTH)
+    if relationship_types and len(set(relationship_types)) == 1:
+        query = _closure_traversal_query(direction == "upstream")
+        params = [asset_id, relationship_types[0], max_depth]
+    else:
+        type_filters = relationship_types or []
+        query = _traversal_query(direction == "upstream", len(type_filters))
+        params = [asset_id, max_depth, *type_filters, asset_id]
 
-    visited: set[str] = set()
-    result: dict[str, Any] = {
-        "root": asset_id,
-        "assets": [],
-        "depth_map": {},
-        "max_depth_reached": max_depth,
-    }
-    queue: deque[tuple[str, int]] = deque([(asset_id, 0)])
+    async with read_db() as db:
+        rows = await db.execute_fetchall(query, params)
 
-    while queue:
-        current_id, depth = queue.popleft()
+    return _traversal_result(
+        asset_id, max_depth, [_traversal_asset(row) for row in rows], want_depth_map
+    )
 
-        if current_id in visited or depth > max_depth:
-            continue
-        visited.add(current_id)
-
-        # Skip root asset in results but continue traversal
-        if current_id == asset_id:
-            pass  # Don't add root to results
-        else:
-            # Get asset details
-            async with db.execute(
-                "SELECT id, name, type, criticality, process_area_id FROM assets WHERE id = ?",
-                [current_id],
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    result["assets"].append({
-                        "id": row["id"],
-                        "name": row["name"],
-                        "type": row["type"],
-                        "criticality": row["criticality"],
-                        "process_area_id": row["process_area_id"],
-                        "depth": depth,
-                    })
-                    result["depth_map"][current_id] = depth
-
-        # Find assets that feed into the current one (source -> current)
-        query = """
-            SELECT r.source_asset_id, r.relationship_type, r.description
-            FROM relationships r
-            WHERE r.target_asset_id = ?
-        """
-        params: list[Any] = [current_id]
-
-        if relationship_types:
-            placeholders = ",".join("?" * len(relationship_types))
-            query += f" AND r.relationship_type IN ({placeholders})"
-            params.extend(relationship_types)
-
-        async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                source_id = row["source_asset_id"]
-                if source_id not in visited:
-                    queue.append((source_id, depth + 1))
 
+async def traverse_both(
+    asset_id: str,
+    relationship_types: list[str] | None = None,
+    max_depth: int = 5,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Find the upstream and downstream assets of an asset with one query.
+
+    Args:
+        asset_id: Starting asset ID
+        relationship_types: Filter by specific relationship types
+        max_depth: Maximum traversal depth, capped at MAX_TRAVERSAL_DEPTH
+
+    Returns:
+        (upstream, downstream) results, each shaped like traverse()'s
+    """
+    max_depth = min(max_depth, MAX_TRAVERSAL_DEPTH)
+    type_filters = relationship_types or []
+    walk_params: list[Any] = [asset_id, max_depth, *type_filters]
+
+    assets: dict[str, list[dict[str, Any]]] = {"upstream": [], "downstream": []}
+    async with read_db() as db:
+        rows = await db.execute_fetchall(
+            _both_traversal_query(len(type_filters)),
+            [*walk_params, *walk_params, asset_id],
+        )
+    for direction, *row in rows:
+        assets[direction].append(_traversal_asset(row))
+
+    return (
+        _traversal_result(asset_id, max_depth, assets["upstream"]),
+        _traversal_result(asset_id, max_depth, assets["downstream"]),
+    )
+
+
+def _traversal_result(
+    asset_id: str,
+    max_depth: int,
+    assets: list[dict[str, Any]],
+    want_depth_map: bool = False,
+) -> dict[str, Any]:
+    """Return the traversal result for a root asset and its reachable assets."""
+    result: dict[str, Any] = {"root": asset_id, "assets": assets}
+    if want_depth_map:
+        result["depth_map"] = {asset["id"]: asset["depth"] for asset in assets}
+    result["max_depth_reached"] = max_depth
     return result
 
 
-async def traverse_downstream(
+def _traversal_asset(row: Sequence[Any]) -> dict[str, Any]:
+    """Convert an (id, name, type, criticality, process_area_id, depth) row to an asset dict."""
+    asset_id, name, asset_type, criticality, process_area_id, depth = row
+    return {
+        "id": asset_id,
+        "name": name,
+        "type": asset_type,
+        "criticality": criticality,
+        "process_area_id": process_area_id,
+        "depth": depth,
+    }
+
+
+async def traverse_upstream(
     asset_id: str,
     relationship_types: list[str] | None = None,
     max_depth: int = 5,
+    want_depth_map: bool = False,
 ) -> dict[str, Any]:
     """
-    BFS traversal to find all downstream assets (assets that this one feeds).
+    Find all upstream assets (assets that feed into this one).
 
     Args:
         asset_id: Starting asset ID
         relationship_types: Filter by specific relationship types
-        max_depth: Maximum traversal depth
+        max_depth: Maximum traversal depth, capped at MAX_TRAVERSAL_DEPTH
+        want_depth_map: Also return a depth_map of asset ID to depth
 
     Returns:
-        Dictionary containing root asset ID, downstream assets with depth info
+        Dictionary containing root asset ID, upstream assets with depth info
     """
-    db = await get_db()
+    return await traverse(asset_id, "upstream", relationship_types, max_depth, want_depth_map)
 
-    visited: set[str] = set()
-    result: dict[str, Any] = {
-        "root": asset_id,
-        "assets": [],
-        "depth_map": {},
-        "max_depth_reached": max_depth,
-    }
-    queue: deque[tuple[str, int]] = deque([(asset_id, 0)])
 
-    while queue:
-        current_id, depth = queue.popleft()
+async def traverse_downstream(
+    asset_id: str,
+    relationship_types: list[str] | None = None,
+    max_depth: int = 5,
+    want_depth_map: bool = False,
+) -> dict[str, Any]:
+    """
+    Find all downstream assets (assets that this one feeds).
 
-        if current_id in visited or depth > max_depth:
-            continue
-        visited.add(current_id)
-
-        # Skip root asset in results
-        if current_id != asset_id:
-            async with db.execute(
-                "SELECT id, name, type, criticality, process_area_id FROM assets WHERE id = ?",
-                [current_id],
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    result["assets"].append({
-                        "id": row["id"],
-                        "name": row["name"],
-                        "type": row["type"],
-                        "criticality": row["criticality"],
-                        "process_area_id": row["process_area_id"],
-                        "depth": depth,
-                    })
-                    result["depth_map"][current_id] = depth
-
-        # Find assets that this one feeds (current -> target)
-        query = """
-            SELECT r.target_asset_id, r.relationship_type, r.description
-            FROM relationships r
-            WHERE r.source_asset_id = ?
-        """
-        params: list[Any] = [current_id]
-
-        if relationship_types:
-            placeholders = ",".join("?" * len(relationship_types))
-            query += f" AND r.relationship_type IN ({placeholders})"
-            params.extend(relationship_types)
-
-        async with db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                target_id = row["target_asset_id"]
-                if target_id not in visited:
-                    queue.append((target_id, depth + 1))
+    Args:
+        asset_id: Starting asset ID
+        relationship_types: Filter by specific relationship types
+        max_depth: Maximum traversal depth, capped at MAX_TRAVERSAL_DEPTH
+        want_depth_map: Also return a depth_map of asset ID to depth
 
-    return result
+    Returns:
+        Dictionary containing root asset ID, downstream assets with depth info
+    """
+    return await traverse(asset_id, "downstream", relationship_types, max_depth, want_depth_map)
 
 
 async def find_dependents(
@@ -178,58 +275,69 @@ async def find_dependents(
     Returns:
         Dictionary with dependent assets and impact chain
     """
-    db = await get_db()
+    # Load the depends_on edges once and expand the dependents breadth-first
+    # in memory, rather than issuing two queries per visited asset
+    async with read_db() as db:
+        rows = await db.execute_fetchall(
+            """
+            SELECT target_asset_id, source_asset_id FROM relationships
+            WHERE relationship_type = 'depends_on'
+            ORDER BY target_asset_id, source_asset_id
+            """
+        )
+    dependents_of: defaultdict[str, list[str]] = defaultdict(list)
+    for target_id, source_id in rows:
+        dependents_of[target_id].append(source_id)
+
+    # Each asset is reached first from the earliest asset in BFS order, which
+    # becomes its parent on the dependency path
+    parents: dict[str, str | None] = {asset_id: None}
+    depths: dict[str, int] = {}
+    frontier = [asset_id]
+    depth = 0
+    while frontier and depth < max_depth:
+        depth += 1
+        next_frontier = []
+        for current_id in frontier:
+            for source_id in dependents_of.get(current_id, ()):
+                if source_id not in parents:
+                    parents[source_id] = current_id
+                    depths[source_id] = depth
+                    next_frontier.append(source_id)
+        frontier = next_frontier
+
+    rows_by_id: dict[str, Any] = {}
+    if depths:
+        async with read_db() as db:
+            rows = await db.execute_fetchall(
+                f"SELECT id, name, type, criticality FROM assets WHERE id IN ({placeholders(len(depths))})",
+                list(depths),
+            )
+        rows_by_id = {row["id"]: row for row in rows}
+
+    dependents = []
+    for dependent_id, dependent_depth in depths.items():
+        row = rows_by_id.get(dependent_id)
+        if row is None:
+            continue
+        path = [dependent_id]
+        while (parent := parents[path[-1]]) is not None:
+            path.append(parent)
+        path.reverse()
+        dependents.append({
+            "id": row["id"],
+            "name": row["name"],
+            "type": row["type"],
+            "criticality": row["criticality"],
+            "depth": dependent_depth,
+            "dependency_path": path,
+        })
 
-    visited: set[str] = set()
-    result: dict[str, Any] = {
+    return {
         "root": asset_id,
-        "dependents": [],
+        "dependents": dependents,
         "impact_chain": [],
     }
-    queue: deque[tuple[str, int, list[str]]] = deque([(asset_id, 0, [])])
-
-    while queue:
-        current_id, depth, path = queue.popleft()
-
-        if current_id in visited or depth > max_depth:
-            continue
-        visited.add(current_id)
-
-        current_path = path + [current_id]
-
-        # Skip root
-        if current_id != asset_id:
-            async with db.execute(
-                "SELECT id, name, type, criticality FROM assets WHERE id = ?",
-                [current_id],
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    result["dependents"].append({
-                        "id": row["id"],
-                        "name": row["name"],
-                        "type": row["type"],
-                        "criticality": row["criticality"],
-                        "depth": depth,
-                        "dependency_path": current_path,
-                    })
-
-        # Find assets that depend on current (source depends_on current)
-        async with db.execute(
-            """
-            SELECT r.source_asset_id
-            FROM relationships r
-            WHERE r.target_asset_id = ? AND r.relationship_type = 'depends_on'
-            """,
-            [current_id],
-        ) as cursor:
-            rows = await cursor.fetchall()
-            for row in rows:
-                source_id = row["source_asset_id"]
-                if source_id not in visited:
-                    queue.append((source_id, depth + 1, current_path))
-
-    return result
 
 
 async def check_redundancy(asset_id: str) -> dict[str, Any]:
@@ -242,47 +350,48 @@ async def check_redundancy(asset_id: str) -> dict[str, Any]:
     Returns:
         Dictionary with redundancy status and details
     """
-    db = await get_db()
+    async with read_db() as db:
+        # Find redundant_with relationships in either direction; each branch
+        # joins the other endpoint, so both can use an endpoint index. An asset
+        # marked redundant with itself has no backup, so self-loops are skipped
+        # (as in asset_link_stats.redundancy_count)
+        redundant_rows = await db.execute_fetchall(
+            """
+            SELECT a.id, a.name, a.type, r.verified
+            FROM relationships r
+            JOIN assets a ON a.id = r.target_asset_id
+            WHERE r.source_asset_id = ? AND r.relationship_type = 'redundant_with'
+            AND r.target_asset_id != r.source_asset_id
+            UNION ALL
+            SELECT a.id, a.name, a.type, r.verified
+            FROM relationships r
+            JOIN assets a ON a.id = r.source_asset_id
+            WHERE r.target_asset_id = ? AND r.relationship_type = 'redundant_with'
+            AND r.source_asset_id != r.target_asset_id
+            """,
+            [asset_id, asset_id],
+        )
 
-    # Find redundant_with relationships
-    async with db.execute(
-        """
-        SELECT r.*, a.id as redundant_id, a.name as redundant_name, a.type as redundant_type
-        FROM relationships r
-        JOIN assets a ON (
-            (r.source_asset_id = ? AND r.target_asset_id = a.id) OR
-            (r.target_asset_id = ? AND r.source_asset_id = a.id)
+        # Also check for backs_up relationships
+        backup_rows = await db.execute_fetchall(
+            """
+            SELECT a.id, a.name, a.type
+            FROM relationships r
+            JOIN assets a ON r.source_asset_id = a.id
+            WHERE r.target_asset_id = ? AND r.relationship_type = 'backs_up'
+            """,
+            [asset_id],
         )
-        WHERE r.relationship_type = 'redundant_with'
-        AND (r.source_asset_id = ? OR r.target_asset_id = ?)
-        """,
-        [asset_id, asset_id, asset_id, asset_id],
-    ) as cursor:
-        rows = await cursor.fetchall()
-        redundant_assets = []
-        for row in rows:
-            # Get the other asset in the relationship
-            other_id = row["target_asset_id"] if row["source_asset_id"] == asset_id else row["source_asset_id"]
-            if other_id != asset_id:
-                redundant_assets.append({
-                    "id": other_id,
-                    "name": row["redundant_name"],
-                    "type": row["redundant_type"],
-                    "verified": bool(row["verified"]),
-                })
-
-    # Also check for backs_up relationships
-    async with db.execute(
-        """
-        SELECT a.id, a.name, a.type
-        FROM relationships r
-        JOIN assets a ON r.source_asset_id = a.id
-        WHERE r.target_asset_id = ? AND r.relationship_type = 'backs_up'
-        """,
-        [asset_id],
-    ) as cursor:
-        rows = await cursor.fetchall()
-        backup_assets = [{"id": row["id"], "name": row["name"], "type": row["type"]} for row in rows]
+
+    redundant_assets = [
+        {"id": other_id, "name": name, "type": other_type, "verified": bool(verified)}
+        for other_id, name, other_type, verified in redundant_rows
+    ]
+
+    backup_assets = [
+        {"id": backup_id, "name": name, "type": backup_type}
+        for backup_id, name, backup_type in backup_rows
+    ]
 
     return {
         "asset_id": asset_id,
@@ -292,6 +401,32 @@ async def check_redundancy(asset_id: str) -> dict[str, Any]:
     }
 
 
+async def _fetch_nodes(query: str, params: list[Any]) -> list[dict[str, Any]]:
+    """Run a graph node query and return node dicts."""
+    async with read_db() as db:
+        rows = await db.execute_fetchall(query, params)
+    return [
+        {"id": node_id, "name": name, "type": asset_type, "criticality": criticality}
+        for node_id, name, asset_type, criticality, _ in rows
+    ]
+
+
+async def _fetch_edges(query: str, params: list[Any]) -> list[dict[str, Any]]:
+    """Run a graph edge query and return edge dicts."""
+    async with read_db() as db:
+        rows = await db.execute_fetchall(query, params)
+    return [
+        {
+            "id": edge_id,
+            "source": source_id,
+            "target": target_id,
+            "type": relationship_type,
+            "verified": bool(verified),
+        }
+        for edge_id, source_id, target_id, relationship_type, verified in rows
+    ]
+
+
 async def get_relationship_graph(
     process_area_id: str | None = None,
     include_types: list[str] | None = None,
@@ -306,8 +441,6 @@ async def get_relationship_graph(
     Returns:
         Graph structure with nodes (assets) and edges (relationships)
     """
-    db = await get_db()
-
     # Build asset query
     asset_query = "SELECT id, name, type, criticality, process_area_id FROM assets"
     asset_params: list[Any] = []
@@ -315,54 +448,33 @@ async def get_relationship_graph(
         asset_query += " WHERE process_area_id = ?"
         asset_params.append(process_area_id)
 
-    async with db.execute(asset_query, asset_params) as cursor:
-        rows = await cursor.fetchall()
-        nodes = [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "type": row["type"],
-                "criticality": row["criticality"],
-            }
-            for row in rows
-        ]
-        node_ids = {row["id"] for row in rows}
-
-    # Build relationship query
+    # Build relationship query; the joins keep only edges between listed nodes
     rel_query = """
-        SELECT id, source_asset_id, target_asset_id, relationship_type, verified
-        FROM relationships
+        SELECT r.id, r.source_asset_id, r.target_asset_id, r.relationship_type, r.verified
+        FROM relationships r
+        JOIN assets s ON s.id = r.source_asset_id
+        JOIN assets t ON t.id = r.target_asset_id
     """
     rel_params: list[Any] = []
     conditions = []
 
     if process_area_id:
         # Only include relationships between assets in the process area
-        conditions.append("source_asset_id IN (SELECT id FROM assets WHERE process_area_id = ?)")
-        conditions.append("target_asset_id IN (SELECT id FROM assets WHERE process_area_id = ?)")
+        conditions.append("s.process_area_id = ? AND t.process_area_id = ?")
         rel_params.extend([process_area_id, process_area_id])
 
     if include_types:
-        placeholders = ",".join("?" * len(include_types))
-        conditions.append(f"relationship_type IN ({placeholders})")
+        conditions.append(f"r.relationship_type IN ({placeholders(len(include_types))})")
         rel_params.extend(include_types)
 
     if conditions:
         rel_query += " WHERE " + " AND ".join(conditions)
 
-    async with db.execute(rel_query, rel_params) as cursor:
-        rows = await cursor.fetchall()
-        edges = [
-            {
-                "id": row["id"],
-                "source": row["source_asset_id"],
-                "target": row["target_asset_id"],
-                "type": row["relationship_type"],
-                "verified": bool(row["verified"]),
-            }
-            for row in rows
-            if row["source_asset_id"] in node_ids and row["target_asset_id"] in node_ids
-        ]
+    # Independent reads, so run them on separate pooled connections
+    nodes, edges = await asyncio.gather(
+        _fetch_nodes(asset_query, asset_params),
+        _fetch_edges(rel_query, rel_params),
+    )
 
     return {
         "nodes": nodes,
@@ -0,0 +1,22 @@
+"""Identifier helpers for OT Asset Inventory."""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> str:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562) as a string.
+
+    The leading 48 bits are the Unix time in milliseconds, so ids created
+    later sort later and new rows land at the right edge of the primary key
+    index instead of at random positions.
+
+    Returns:
+        Canonical hyphenated UUID string
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 9562 variant
+    return str(uuid.UUID(int=value))
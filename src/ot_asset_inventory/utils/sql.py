@@ -0,0 +1,17 @@
+"""SQL building helpers for OT Asset Inventory."""
+
+import functools
+
+
+@functools.lru_cache(maxsize=64)
+def placeholders(count: int) -> str:
+    """
+    Get a comma-separated list of ``count`` bind placeholders for an IN clause.
+
+    Args:
+        count: Number of placeholders
+
+    Returns:
+        String such as "?,?,?"
+    """
+    return ",".join("?" * count)
@@ -1,16 +1,26 @@
 """Basic tests for OT Asset Inventory."""
 
 import asyncio
+import contextlib
+import dataclasses
+import importlib.util
+import json
+import logging
 import sys
+import threading
 from pathlib import Path
 
-# Add src to path for imports
+import pytest
+import pytest_asyncio
+
+# Add src to path for imports when run directly (pytest uses its pythonpath)
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from ot_asset_inventory.db.connection import DatabaseManager, set_db_manager
-from ot_asset_inventory.db.schema import create_tables
-from ot_asset_inventory.db.seed import seed_sample_data
-from ot_asset_inventory.tools import assets, relationships, analysis, compliance, environment
+from ot_asset_inventory.db.connection import DatabaseManager, get_db_manager, set_db_manager
+from ot_asset_inventory.db.schema import create_indexes, create_tables, rebuild_relationship_closure
+from ot_asset_inventory.db.seed import clear_all_data, seed_sample_data
+from ot_asset_inventory.tools import assets, relationships, analysis, compliance, environment, review
+from ot_asset_inventory.utils.graph import MAX_TRAVERSAL_DEPTH, check_redundancy
 
 
 async def setup_test_db():
@@ -23,10 +33,35 @@ async def setup_test_db():
     # Seed from sample data file
     sample_data_path = Path(__file__).parent.parent / "data" / "sample_data.json"
     await seed_sample_data(db_manager.connection, sample_data_path)
+    await create_indexes(db_manager.connection)
 
     return db_manager
 
 
+@contextlib.asynccontextmanager
+async def isolated_db():
+    """Run a block against its own freshly seeded database, for tests that write."""
+    previous = get_db_manager()
+    db_manager = await setup_test_db()
+    try:
+        yield db_manager
+    finally:
+        await db_manager.disconnect()
+        set_db_manager(previous)
+
+
+# Under pytest, every test shares one seeded database on the session loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def db_manager():
+    """Seed the test database once for the whole pytest session."""
+    db_manager = await setup_test_db()
+    yield db_manager
+    await db_manager.disconnect()
+
+
 async def test_list_assets():
     """Test listing assets."""
     print("\n=== Test: list_assets ===")
@@ -83,6 +118,31 @@ async def test_search_assets():
     print("✓ search_assets tests passed")
 
 
+async def test_search_short_query():
+    """Test that short queries fall back to LIKE and agree with the trigram index."""
+    print("\n=== Test: search_assets short query ===")
+    db = get_db_manager().connection
+    columns = ["name", "manufacturer", "model", "notes", "function", "id"]
+
+    short = await assets.search_assets("TP")
+    print(f"Search 'TP': {len(short)} results")
+    assert short, "Two-character queries should still match via LIKE"
+    assert all(
+        any("tp" in str(asset.get(column) or "").lower() for column in columns) for asset in short
+    ), "Every LIKE match should contain the term"
+
+    # At three characters the trigram index takes over; it must find the same assets
+    for query in ("HMI", "chiller", "Allen"):
+        indexed = await assets.search_assets(query, limit=50)
+        scanned = await assets._search_assets_like(db, query, columns, 50)
+        print(f"Search '{query}': {len(indexed)} indexed, {len(scanned)} scanned")
+        assert {a["id"] for a in indexed} == {a["id"] for a in scanned}, (
+            f"FTS and LIKE should match the same assets for '{query}'"
+        )
+
+    print("✓ search_assets short query tests passed")
+
+
 async def test_upstream_downstream():
     """Test upstream/downstream queries."""
     print("\n=== Test: upstream/downstream ===")
@@ -102,6 +162,112 @@ async def test_upstream_downstream():
     print("✓ upstream/downstream tests passed")
 
 
+async def test_traversal_depth_cap():
+    """Test that oversized traversal depths are clamped."""
+    print("\n=== Test: traversal depth cap ===")
+
+    capped = await relationships.get_downstream("PLC-101", max_depth=100000)
+    full = await relationships.get_downstream("PLC-101", max_depth=MAX_TRAVERSAL_DEPTH)
+    print(f"max_depth_reached: {capped['max_depth_reached']}")
+    assert capped["max_depth_reached"] == MAX_TRAVERSAL_DEPTH, "Depth should be clamped"
+    assert capped["assets"] == full["assets"], "Clamped traversal should match the cap"
+
+    from ot_asset_inventory.server import VALIDATORS
+    for tool in ("get_upstream", "get_downstream", "get_dependencies"):
+        assert not VALIDATORS[tool].is_valid({"asset_id": "PLC-101", "max_depth": 100000}), (
+            f"{tool} schema should reject oversized max_depth"
+        )
+
+    print("✓ traversal depth cap tests passed")
+
+
+async def test_relationship_closure_matches_rebuild():
+    """Test that the trigger-maintained closure matches a fresh rebuild."""
+    print("\n=== Test: relationship closure ===")
+
+    # A depends_on cycle (PLC-101 -> GW-001 -> SW-010 -> PLC-101), a chain
+    # into it, and a shortcut added last that shortens existing closure paths
+    edges = [
+        ("PLC-101", "GW-001"),
+        ("GW-001", "SW-010"),
+        ("SW-010", "PLC-101"),
+        ("HMI-101", "SRV-HIST01"),
+        ("SRV-HIST01", "SW-020"),
+        ("SW-020", "GW-001"),
+        ("HMI-101", "GW-001"),
+    ]
+
+    async def snapshot(db):
+        async with db.execute(
+            "SELECT ancestor, descendant, relationship_type, depth FROM relationship_closure ORDER BY 1, 2, 3"
+        ) as cursor:
+            closure = [tuple(row) for row in await cursor.fetchall()]
+        downstream = {
+            asset_id: (await relationships.get_downstream(asset_id, ["depends_on"]))["assets"]
+            for asset_id in ("HMI-101", "PLC-101", "SW-010")
+        }
+        spof = await analysis.find_single_points_of_failure(criticality_threshold="low")
+        return closure, downstream, spof
+
+    async with isolated_db() as db_manager:
+        db = db_manager.connection
+        await db.executemany(
+            "INSERT INTO relationships (id, source_asset_id, target_asset_id, relationship_type) "
+            "VALUES (?, ?, ?, 'depends_on')",
+            [(f"test-cycle-{i}", source, target) for i, (source, target) in enumerate(edges)],
+        )
+        await db.commit()
+
+        maintained = await snapshot(db)
+        # A second, unused type forces the recursive walk instead of the closure
+        walked = (await relationships.get_downstream("HMI-101", ["depends_on", "depends_on_walk"]))["assets"]
+        assert maintained[1]["HMI-101"] == walked, "Closure lookup should match a recursive walk"
+        print(f"HMI-101 depends on: {[(a['id'], a['depth']) for a in walked]}")
+
+        await rebuild_relationship_closure(db)
+        await db.commit()
+        rebuilt = await snapshot(db)
+
+    print(f"Closure rows: {len(maintained[0])}")
+    assert maintained[0] == rebuilt[0], "Closure rows should match a rebuild"
+    assert maintained[1] == rebuilt[1], "Traversals should match after a rebuild"
+    assert maintained[2] == rebuilt[2], "SPOF results should match after a rebuild"
+
+    print("✓ relationship closure tests passed")
+
+
+async def test_clear_and_reseed():
+    """Test that clearing and reseeding leaves the trigger-maintained tables consistent."""
+    print("\n=== Test: clear and reseed ===")
+    sample_data_path = Path(__file__).parent.parent / "data" / "sample_data.json"
+
+    async with isolated_db() as db_manager:
+        db = db_manager.connection
+        stats_sql = "SELECT * FROM asset_link_stats WHERE downstream_count OR redundancy_count ORDER BY asset_id"
+        stats = [tuple(row) for row in await db.execute_fetchall(stats_sql)]
+        spofs = await analysis.find_single_points_of_failure()
+        types = await relationships.get_relationship_types()
+        summary = await review.get_review_summary()
+        await review.flag_for_review("PLC-101", "missing_data", "Flag raised before a reseed", severity="high")
+
+        await clear_all_data(db)
+        for table in ("asset_link_stats", "relationship_type_counts", "review_flag_counts"):
+            leftover = await db.execute_fetchall(f"SELECT COUNT(*) FROM {table}")
+            assert leftover[0][0] == 0, f"Clearing should not leave counts behind in {table}"
+
+        await seed_sample_data(db, sample_data_path)
+        print(f"Link stats rows: {len(stats)} -> {len(await db.execute_fetchall(stats_sql))}")
+        assert [tuple(row) for row in await db.execute_fetchall(stats_sql)] == stats
+        assert await analysis.find_single_points_of_failure() == spofs
+        reseeded_types = await relationships.get_relationship_types()
+        print(f"Relationship types after reseed: {[(t['type'], t['count']) for t in reseeded_types]}")
+        assert reseeded_types, "Relationship type counts should come back with the seed"
+        assert reseeded_types == types
+        assert await review.get_review_summary() == summary, "Cleared flags should not linger in the counts"
+
+    print("✓ clear and reseed tests passed")
+
+
 async def test_analyze_impact():
     """Test impact analysis."""
     print("\n=== Test: analyze_impact ===")
@@ -142,6 +308,26 @@ async def test_find_spof():
     print("✓ find_single_points_of_failure tests passed")
 
 
+async def test_redundancy_self_loop():
+    """Test that an asset marked redundant with itself does not count as redundant."""
+    print("\n=== Test: redundancy self-loop ===")
+    async with isolated_db() as db_manager:
+        db = db_manager.connection
+        await db.execute(
+            "INSERT INTO relationships (id, source_asset_id, target_asset_id, relationship_type) "
+            "VALUES ('test-self-loop', 'PLC-101', 'PLC-101', 'redundant_with')"
+        )
+        await db.commit()
+
+        redundancy = await check_redundancy("PLC-101")
+        print(f"PLC-101 redundancy: {redundancy}")
+        assert not redundancy["has_redundancy"] and not redundancy["redundant_assets"]
+        spofs = await analysis.find_single_points_of_failure()
+        assert "PLC-101" in {spof["id"] for spof in spofs}, "A self-loop should not clear the SPOF"
+
+    print("✓ redundancy self-loop tests passed")
+
+
 async def test_find_gaps():
     """Test finding compliance gaps."""
     print("\n=== Test: find_gaps ===")
@@ -193,6 +379,241 @@ async def test_process_areas():
     print("✓ list_process_areas tests passed")
 
 
+async def test_memo_lock_cleanup():
+    """Test that memo locks are released after both failed and successful calls."""
+    print("\n=== Test: memo lock cleanup ===")
+    from ot_asset_inventory import server
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError("handler failed")
+
+    async def succeeding():
+        await asyncio.sleep(0)
+        return "ok"
+
+    failed = await asyncio.gather(
+        *[server._memo("memo_test", {"case": "fail"}, failing) for _ in range(3)],
+        return_exceptions=True,
+    )
+    assert all(isinstance(error, ValueError) for error in failed), "Each caller should see the failure"
+    results = await asyncio.gather(
+        *[server._memo("memo_test", {"case": "ok"}, succeeding) for _ in range(3)]
+    )
+    assert results == ["ok"] * 3, "Concurrent callers should share the result"
+    print(f"Locks left: {len(server._traversal_locks)}")
+    assert not server._traversal_locks, "No lock entries should outlive their callers"
+
+    print("✓ memo lock cleanup tests passed")
+
+
+async def test_review_counters():
+    """Test that review and relationship type counters follow writes."""
+    print("\n=== Test: review counters ===")
+    async with isolated_db():
+        before = await review.get_review_summary()
+        types_before = {t["type"]: t for t in await relationships.get_relationship_types()}
+
+        flagged = await review.flag_for_review(
+            "PLC-101", "missing_data", "Firmware version unknown", severity="high"
+        )
+        suggested = await review.suggest_relationship(
+            "HMI-101", "SRV-HIST01", "feeds_data_to", "Trends shown on the HMI come from the historian"
+        )
+        assert flagged["status"] == "flagged" and suggested["status"] == "suggested"
+
+        summary = await review.get_review_summary()
+        print(f"Open flags: {before['open_flags']['total']} -> {summary['open_flags']['total']}")
+        assert summary["open_flags"]["total"] == before["open_flags"]["total"] + 2
+        assert summary["requires_attention"] == before["requires_attention"] + 1
+
+        types = {t["type"]: t for t in await relationships.get_relationship_types()}
+        feeds_before = types_before.get("feeds_data_to", {"count": 0, "inferred_count": 0, "verified_count": 0})
+        assert types["feeds_data_to"]["count"] == feeds_before["count"] + 1
+        assert types["feeds_data_to"]["inferred_count"] == feeds_before["inferred_count"] + 1
+
+        # Resolving the suggestion verifies its relationship
+        await review.resolve_flag(suggested["flag_id"], "resolved", resolved_by="tester")
+        await review.resolve_flag(flagged["flag_id"], "dismissed", resolved_by="tester")
+        summary = await review.get_review_summary()
+        types = {t["type"]: t for t in await relationships.get_relationship_types()}
+        print(f"After resolving: {summary['by_status']}")
+        assert summary["open_flags"] == before["open_flags"], "Open counts should return to where they were"
+        assert summary["by_status"]["resolved"] == before["by_status"].get("resolved", 0) + 1
+        assert summary["by_status"]["dismissed"] == before["by_status"].get("dismissed", 0) + 1
+        assert types["feeds_data_to"]["verified_count"] == feeds_before["verified_count"] + 1
+
+    print("✓ review counters tests passed")
+
+
+async def test_resolve_flag_twice():
+    """Test that resolving an already-resolved flag is rejected without changes."""
+    print("\n=== Test: resolve_flag twice ===")
+    async with isolated_db():
+        flagged = await review.flag_for_review("PLC-101", "needs_verification", "Check the rack layout")
+        first = await review.resolve_flag(flagged["flag_id"], "resolved")
+        assert first["status"] == "success"
+        summary = await review.get_review_summary()
+
+        second = await review.resolve_flag(flagged["flag_id"], "dismissed")
+        print(f"Second resolution: {second}")
+        assert second == {"error": "Flag is already resolved"}
+        assert await review.get_review_summary() == summary, "A rejected resolution should not move counters"
+
+        missing = await review.resolve_flag("no-such-flag", "resolved")
+        assert missing == {"error": "Flag no-such-flag not found"}
+
+    print("✓ resolve_flag twice tests passed")
+
+
+async def test_memo_invalidated_by_write():
+    """Test that a write through the server drops memoized traversals."""
+    print("\n=== Test: memo invalidation ===")
+    from ot_asset_inventory import server
+
+    calls = []
+    original = server.REGISTRY["get_downstream"]
+
+    async def counted(**kwargs):
+        calls.append(kwargs)
+        return await original.handler(**kwargs)
+
+    async def downstream_ids():
+        blocks = await server.call_tool("get_downstream", {"asset_id": "SENS-T101"})
+        return {asset["id"] for asset in json.loads(blocks[0].text)["assets"]}
+
+    async with isolated_db():
+        # Nothing memoized against the shared database may answer here
+        server._invalidate_traversals()
+        server.REGISTRY["get_downstream"] = dataclasses.replace(original, handler=counted)
+        try:
+            before = await downstream_ids()
+            assert await downstream_ids() == before
+            assert len(calls) == 1, "A repeated call should be served from the memo"
+            assert "ACT-C301" not in before
+
+            await server.call_tool(
+                "suggest_relationship",
+                {
+                    "source_asset_id": "SENS-T101",
+                    "target_asset_id": "ACT-C301",
+                    "relationship_type": "feeds_data_to",
+                    "reasoning": "Temperature drives the valve loop",
+                },
+            )
+            after = await downstream_ids()
+        finally:
+            server.REGISTRY["get_downstream"] = original
+            server._invalidate_traversals()
+        print(f"Downstream of SENS-T101: {len(before)} -> {len(after)}, {len(calls)} handler calls")
+        assert len(calls) == 2, "The write should force a recompute"
+        assert before < after and "ACT-C301" in after, "The new edge should show up after the write"
+
+    print("✓ memo invalidation tests passed")
+
+
+async def test_tool_error_handling():
+    """Test that bad arguments are input errors and handler bugs are logged faults."""
+    print("\n=== Test: tool error handling ===")
+    from ot_asset_inventory import server
+
+    invalid = await server.call_tool("get_asset", {})
+    print(f"Missing argument: {invalid[0].text.strip()}")
+    assert json.loads(invalid[0].text)["error"].startswith("Invalid arguments for get_asset"), (
+        "Schema violations should be reported as input errors"
+    )
+
+    # Arguments the schema accepts but the args dataclass rejects
+    @dataclasses.dataclass(slots=True)
+    class StrictArgs:
+        asset_id: str
+        revision: int
+
+    original = server.REGISTRY["get_asset"]
+    server.REGISTRY["get_asset"] = dataclasses.replace(original, args_type=StrictArgs)
+    try:
+        rejected = await server.call_tool("get_asset", {"asset_id": "PLC-101"})
+    finally:
+        server.REGISTRY["get_asset"] = original
+    assert json.loads(rejected[0].text)["error"].startswith("Invalid arguments for get_asset"), (
+        "Arguments the dataclass cannot take should be reported as input errors"
+    )
+
+    logged = []
+    handler = logging.Handler()
+    handler.emit = logged.append
+    server.logger.addHandler(handler)
+    try:
+        for error_type in (KeyError, ValueError):
+            async def broken_handler(asset_id):
+                raise error_type("handler bug")
+
+            server.REGISTRY["get_asset"] = dataclasses.replace(original, handler=broken_handler)
+            faulted = await server.call_tool("get_asset", {"asset_id": "PLC-101"})
+            message = json.loads(faulted[0].text)["error"]
+            assert not message.startswith("Invalid arguments"), (
+                f"A {error_type.__name__} inside a handler is not an input error"
+            )
+            assert any(record.exc_info and record.exc_info[0] is error_type for record in logged), (
+                f"A {error_type.__name__} inside a handler should be logged as a server fault"
+            )
+    finally:
+        server.REGISTRY["get_asset"] = original
+        server.logger.removeHandler(handler)
+
+    print("✓ tool error handling tests passed")
+
+
+def load_web_app():
+    """Import the FastAPI app in api/index.py, which is not an installed package."""
+    path = Path(__file__).parent.parent / "api" / "index.py"
+    spec = importlib.util.spec_from_file_location("api_index", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def test_api_upload_rollback():
+    """Test that a rolled-back write leaves no stale or phantom cached reads."""
+    print("\n=== Test: web upload rollback ===")
+    from fastapi.testclient import TestClient
+
+    web = load_web_app()
+    client = TestClient(web.app, raise_server_exceptions=False)
+    client.post("/load-sample-data")
+    committed = client.get("/audit").json()["total_assets"]
+
+    # A read issued mid-write waits for the write to end and never sees its rows
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(client.get("/audit").json()["total_assets"]))
+    try:
+        with web.write_db() as db, db:
+            db.execute("INSERT INTO assets (id, name, type) VALUES ('TMP-1', 'Phantom', 'PLC')")
+            reader.start()
+            raise RuntimeError("abort upload")
+    except RuntimeError:
+        pass
+    reader.join()
+    print(f"Committed: {committed}, read during write: {seen[0]}")
+    assert seen == [committed], "Reader should only see committed assets"
+
+    # Valid rows, then bytes that are not UTF-8: the first batch is inserted
+    # before decoding fails and the whole upload rolls back
+    rows = "".join(f"UP-{i},Uploaded {i},Sensor\n" for i in range(web.CSV_BATCH_SIZE + 500))
+    body = b"id,name,type\n" + rows.encode() + b"\xff\xfe\n"
+    version = web._data_version
+    response = client.post("/upload-csv", files={"file": ("bad.csv", body, "text/csv")})
+    print(f"Bad upload status: {response.status_code}")
+    assert response.status_code == 500, "Undecodable upload should fail"
+    assert web._data_version > version, "A failed write should still invalidate the cache"
+
+    total = web.get_db().execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+    assert total == committed, "Failed upload should roll back"
+    assert client.get("/audit").json()["total_assets"] == total, "Audit should match the table"
+
+    print("✓ web upload rollback tests passed")
+
+
 async def main():
     """Run all tests."""
     print("=" * 60)
@@ -207,12 +628,23 @@ async def main():
         await test_list_assets()
         await test_get_asset()
         await test_search_assets()
+        await test_search_short_query()
         await test_upstream_downstream()
+        await test_traversal_depth_cap()
+        await test_relationship_closure_matches_rebuild()
+        await test_clear_and_reseed()
         await test_analyze_impact()
         await test_find_spof()
+        await test_redundancy_self_loop()
         await test_find_gaps()
         await test_audit_summary()
         await test_process_areas()
+        await test_memo_lock_cleanup()
+        await test_review_counters()
+        await test_resolve_flag_twice()
+        await test_memo_invalidated_by_write()
+        await test_tool_error_handling()
+        await test_api_upload_rollback()
 
         print("\n" + "=" * 60)
         print("All tests passed! ✓")